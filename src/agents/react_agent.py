@@ -144,6 +144,76 @@ async def analyze_image(image_path: str, experiment_context: str = "") -> str:
         logger.error(f"Error analyzing image: {e}")
         return f"Error analyzing image: {str(e)}"
 
+
+@tool
+async def analyze_image_folder(folder_path: str = ".", experiment_context: str = "") -> str:
+    """Analyze all images in a folder with vision AI in one step.
+
+    Use this instead of calling analyze_image once per file when users ask
+    about several images, e.g. all gels or blots of an experiment. Images
+    are analyzed in shared batches and previously analyzed images come from
+    the cache.
+
+    Args:
+        folder_path: Folder relative to project root (not searched recursively)
+        experiment_context: Optional context about the experiment
+
+    Returns:
+        A short analysis of each image
+    """
+    try:
+        from src.components.image_analyzer import SUPPORTED_IMAGE_FORMATS, analyze_lab_images
+        from src.config.config import config
+
+        session = require_session()
+        folder = session.resolve_path(folder_path)
+        if not folder.is_dir():
+            return f"Folder not found: {folder_path}"
+
+        images = sorted(p for p in folder.iterdir()
+                        if p.is_file() and p.suffix.lower() in SUPPORTED_IMAGE_FORMATS)
+        if not images:
+            return f"No images in {folder_path}"
+        max_images = int(config.get("analysis.image.batch.max_images", 24))
+        skipped = images[max_images:]
+        images = images[:max_images]
+
+        # Experiment ID from the nearest folder with a README.md
+        experiment_id = None
+        current_path = folder
+        while current_path != session.project_path and session.project_path in current_path.parents:
+            if (current_path / "README.md").exists():
+                experiment_id = str(current_path.relative_to(session.project_path))
+                break
+            current_path = current_path.parent
+
+        results = await analyze_lab_images(
+            [str(p) for p in images],
+            context=experiment_context,
+            experiment_id=experiment_id
+        )
+
+        lines = [f"Image analysis of {len(images)} images in {folder_path}:"]
+        for result in results:
+            if not result.success:
+                lines.append(f"\n**{result.file_name}**: analysis failed ({result.error_message})")
+                continue
+            lines.append(f"\n**{result.file_name}** ({result.image_size[0]}×{result.image_size[1]}): "
+                         f"{result.content_description}")
+            if result.key_features:
+                lines.append("Key observations: " + "; ".join(result.key_features))
+            if result.suggested_tags:
+                lines.append("Tags: " + ", ".join(result.suggested_tags))
+        if skipped:
+            lines.append(f"\n{len(skipped)} more images not analyzed: {', '.join(p.name for p in skipped)}")
+        return "\n".join(lines)
+
+    except RuntimeError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error analyzing image folder: {e}")
+        return f"Error analyzing image folder: {str(e)}"
+
 @tool
 async def scan_project() -> str:
     """Scan the entire project to get an overview of all experiments, folders, and main data.
@@ -440,6 +510,52 @@ async def analyze_data(file_path: str) -> str:
         return f"Error analyzing file: {str(e)}"
 
 
+@tool
+async def compare_data_files(pattern: str, columns: str = "", baseline: str = "") -> str:
+    """Compare all matching data files across experiments in one step.
+
+    Use this instead of calling analyze_data file by file, e.g. to compare
+    all PCR experiments. Loads every CSV/TSV/Excel file matching the pattern,
+    aligns them on their shared numeric columns and returns one table of
+    per-file mean ± std (n) and the % difference from the baseline file.
+
+    Args:
+        pattern: File name or path pattern, e.g. "pcr", "*qpcr*.csv" or "exp_*/results.xlsx"
+        columns: Optional comma-separated columns to compare (default: all shared numeric columns)
+        baseline: Optional project-relative path of the reference file (default: the first match)
+    """
+    try:
+        from src.components.data_compare import compare_files, format_comparison
+        from src.config.config import config
+
+        session = require_session()
+        result = await compare_files(
+            str(session.project_path),
+            pattern,
+            columns=[c.strip() for c in columns.split(",") if c.strip()] or None,
+            baseline=baseline or None,
+            max_files=int(config.get("analysis.compare.max_files", 50)),
+            max_concurrent=int(config.get("analysis.compare.max_concurrent", 4)),
+        )
+        if not result["files"]:
+            return f"No CSV/TSV/Excel files in this project match: {pattern}"
+
+        compared = len(result["delta"])
+        output = f"Compared {compared} of {len(result['files'])} files matching \"{pattern}\""
+        if result["columns"]:
+            output += f" on {len(result['columns'])} shared columns"
+        output += ":\n" + format_comparison(result)
+        for label, reason in {**result["skipped"], **result["errors"]}.items():
+            output += f"\n- Not compared: {label} ({reason})"
+        return output
+
+    except RuntimeError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error comparing data files: {e}")
+        return f"Error comparing data files: {str(e)}"
+
+
 @tool
 async def diagnose_issue(problem: str) -> str:
     """Diagnose experimental issues using scientific reasoning.
@@ -455,7 +571,7 @@ async def diagnose_issue(problem: str) -> str:
         # Get project-wide insights automatically
         insights = ""
         try:
-            insights = await get_project_insights.ainvoke({})
+            insights = await get_project_insights.ainvoke({"focus": problem})
             insights = f"\n\nRelevant patterns from other experiments:\n{insights}\n"
         except:
             pass
@@ -485,7 +601,7 @@ async def suggest_optimization(aspect: str) -> str:
     """
     try:
         # Get project insights automatically
-        insights = await get_project_insights.ainvoke({})
+        insights = await get_project_insights.ainvoke({"focus": aspect})
         
         # Use LLM to suggest optimizations
         llm = get_llm_instance()
@@ -511,42 +627,40 @@ Be specific with parameters and conditions."""
 async def run_deep_research(query: str) -> str:
     """Search scientific literature and web for relevant information.
     
+    A report this project already has for the same question is reused
+    without new web searches. Use find_past_research first to check for
+    related earlier research.
+    
     Args:
         query: Research query
     """
     try:
-        from src.tools.deep_research import run_deep_research as deep_research
+        from src.tools.deep_research import arun_deep_research, describe_stop_reason
         from src.config.config import config
         
+        session = get_current_session()
+        project_root = str(session.project_path) if session else None
+        
         # Read settings from config.yaml
         initial_search_query_count = config.get("deep_research.initial_search_query_count", 3)
         max_research_loops = config.get("deep_research.max_research_loops", 1)
         verbose = config.get("deep_research.verbose", True)
         response_language = config.get("deep_research.response_language", None)
         
-        # Call with configurable parameters
-        # Note: deep_research is synchronous, so we run it in executor to avoid blocking
-        import asyncio
-        from functools import partial
-        
-        # Create a partial function with named arguments
-        deep_research_func = partial(
-            deep_research,
+        # Runs on the event loop; concurrent runs are capped inside
+        result = await arun_deep_research(
+            query,
             initial_search_query_count=initial_search_query_count,
             max_research_loops=max_research_loops,
             verbose=verbose,
-            response_language=response_language
-        )
-        
-        result = await asyncio.get_event_loop().run_in_executor(
-            None,
-            deep_research_func,
-            query
+            response_language=response_language,
+            project_root=project_root
         )
         
         # Extract the final text from the result
         if isinstance(result, dict):
-            return f"Research Results:\n{result.get('final_text', str(result))}"
+            stopped = describe_stop_reason(result.get("stop_reason"))
+            return f"Research Results (stopped because {stopped}):\n{result.get('final_text', str(result))}"
         else:
             return f"Research Results:\n{result}"
     except Exception as e:
@@ -554,6 +668,77 @@ async def run_deep_research(query: str) -> str:
         return f"Research unavailable: {str(e)}"
 
 
+@tool
+async def find_past_research(query: str) -> str:
+    """Look up deep research reports saved earlier in this project.
+    
+    Use this before run_deep_research: it is instant and makes no web calls.
+    Returns the most related earlier reports with their sources, and the
+    full text of the best match.
+    
+    Args:
+        query: Research question or topic
+    """
+    try:
+        from src.tools.deep_research.report_store import ReportStore
+        
+        session = require_session()
+        store = ReportStore(str(session.project_path))
+        matches = await asyncio.to_thread(store.find_related, query)
+        if not matches:
+            return f"No earlier research in this project matches: {query}"
+        
+        lines = [f"Found {len(matches)} related earlier report(s):"]
+        for match in matches:
+            lines.append(
+                f"• {match['title']} ({match['created_at'][:10]}, {len(match['sources'])} sources) "
+                f"- asked as \"{match['query']}\" - {match['path']}"
+            )
+        
+        best = await asyncio.to_thread(store.read, matches[0]["id"])
+        if best:
+            lines.append(f"\n=== {matches[0]['title']} ===\n{best}")
+        return "\n".join(lines)
+    except Exception as e:
+        logger.error(f"Past research lookup failed: {e}")
+        return f"Past research unavailable: {str(e)}"
+
+
+@tool
+async def search_project_docs(query: str, folder: str = "") -> str:
+    """Full-text search over the project's READMEs, converted documents and text data files.
+    
+    Much cheaper than reading whole files: use it to find where a fact,
+    sample, protocol step or value is mentioned, then read_file only the
+    files that matter.
+    
+    Args:
+        query: Words to search for
+        folder: Optional project-relative folder to limit the search to
+    
+    Returns:
+        Ranked snippets with file:line references
+    """
+    try:
+        from src.memory.doc_index import get_doc_index
+        
+        session = require_session()
+        index = get_doc_index(str(session.project_path))
+        # Pick up files changed outside the app; unchanged files are skipped
+        await asyncio.to_thread(index.refresh)
+        results = await asyncio.to_thread(index.search, query, 10, folder or None)
+        if not results:
+            return f"No documents in this project mention: {query}"
+        
+        lines = [f"Top {len(results)} matches for \"{query}\":"]
+        for result in results:
+            lines.append(f"• {result['path']}:{result['start_line']}-{result['end_line']} - {result['snippet']}")
+        return "\n".join(lines)
+    except Exception as e:
+        logger.error(f"Document search failed: {e}")
+        return f"Document search unavailable: {str(e)}"
+
+
 @tool
 async def create_new_experiment(name: str, motivation: str, key_question: str) -> str:
     """Create a new experiment with initial README memory.
@@ -605,11 +790,15 @@ def create_memory_agent():
         scan_project,
         list_folder_contents,
         read_file,
+        search_project_docs,
         analyze_data,
+        compare_data_files,
         analyze_image,  # Vision AI for images
+        analyze_image_folder,
         diagnose_issue,
         suggest_optimization,
         run_deep_research,
+        find_past_research,
         create_new_experiment
     ]
     
@@ -8,6 +8,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Set, Optional
+import asyncio
 import json
 import logging
 
@@ -85,6 +86,35 @@ class ConnectionManager:
                 self.active_connections[session_id].discard(ws)
         else:
             logger.warning(f"No active WebSocket connections for session {session_id} to send agent message")
+    
+    async def send_job_update(self, job: dict):
+        """Push background job progress to the session that queued it"""
+        session_id = job.get("session_id")
+        if not session_id or session_id not in self.active_connections:
+            return
+        
+        message = json.dumps({
+            "type": "job_update",
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": job["progress"],
+            "message": job.get("message"),
+            "error": job.get("error"),
+            "result": job.get("result")
+        })
+        
+        disconnected = set()
+        for websocket in self.active_connections[session_id]:
+            try:
+                await websocket.send_text(message)
+            except Exception as e:
+                logger.warning(f"Failed to send job update to WebSocket: {e}")
+                disconnected.add(websocket)
+        
+        # Clean up disconnected websockets
+        for ws in disconnected:
+            self.active_connections[session_id].discard(ws)
 
 # Create global connection manager
 manager = ConnectionManager()
@@ -126,6 +156,32 @@ from src.api.auth_routes import router as auth_router
 
 app.include_router(auth_router)
 
+# Mount background job status routes
+from src.api.job_routes import router as job_router
+
+app.include_router(job_router)
+
+# Background job workers for upload conversion and analysis
+from src.api.job_queue import get_job_queue
+from src.api.upload_jobs import register_upload_jobs
+
+@app.on_event("startup")
+async def start_job_queue():
+    """Start job workers; jobs interrupted by a restart are resumed"""
+    queue = get_job_queue()
+    register_upload_jobs(queue)
+    queue.add_listener(manager.send_job_update)
+    await queue.start()
+    
+    # Drop cached conversions no experiment refers to any more
+    from src.api.conversion_store import get_conversion_store
+    asyncio.create_task(asyncio.to_thread(get_conversion_store().collect_garbage))
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    """Stop job workers"""
+    await get_job_queue().stop()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
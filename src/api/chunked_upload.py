@@ -0,0 +1,295 @@
+"""Resumable, chunked upload staging for large instrument files.
+
+Clients initialise an upload, PUT chunks in any order (and in parallel),
+then commit with a SHA-256 checksum. Chunks are staged under
+``.labacc/uploads/<upload_id>/`` inside the project and only assembled into
+the experiment folder on commit, so an interrupted multi-GB upload can resume
+from the chunks that already arrived.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upload IDs are uuid4 hex strings - anything else is rejected before touching disk
+_UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB
+MIN_CHUNK_SIZE = 256 * 1024  # Smaller chunks only for files that fit in one chunk
+MAX_CHUNKS = 10_000  # Bounds staged files per upload and per-commit work
+MANIFEST_NAME = "manifest.json"
+
+
+class ChunkedUploadManager:
+    """Stages chunked uploads for a project and assembles them on commit."""
+
+    def __init__(
+        self,
+        project_root: str,
+        default_chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunks: int = MAX_CHUNKS
+    ):
+        """Initialize the upload manager.
+
+        Args:
+            project_root: Root directory of the current project
+            default_chunk_size: Chunk size used when the client does not pick one
+            min_chunk_size: Smallest chunk size a multi-chunk upload may use
+            max_chunks: Most chunks a single upload may be split into
+        """
+        self.project_root = Path(project_root)
+        self.staging_root = self.project_root / ".labacc" / "uploads"
+        self.default_chunk_size = default_chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunks = max_chunks
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        """Get the staging directory for an upload, validating the ID."""
+        if not _UPLOAD_ID_PATTERN.match(upload_id or ""):
+            raise ValueError(f"Invalid upload id: {upload_id}")
+        return self.staging_root / upload_id
+
+    def _chunk_path(self, upload_id: str, index: int) -> Path:
+        return self._upload_dir(upload_id) / f"chunk_{index:06d}.part"
+
+    def _load_manifest(self, upload_id: str) -> Dict:
+        manifest_path = self._upload_dir(upload_id) / MANIFEST_NAME
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Upload not found: {upload_id}")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def expected_chunk_size(self, manifest: Dict, index: int) -> int:
+        """Get the exact byte size chunk ``index`` must have."""
+        if index < manifest["total_chunks"] - 1:
+            return manifest["chunk_size"]
+        return manifest["total_size"] - manifest["chunk_size"] * (manifest["total_chunks"] - 1)
+
+    def create_upload(
+        self,
+        filename: str,
+        dest_path: str,
+        total_size: int,
+        chunk_size: Optional[int] = None,
+        sha256: Optional[str] = None
+    ) -> Dict:
+        """Start a new chunked upload.
+
+        Args:
+            filename: Name of the file being uploaded
+            dest_path: Destination folder relative to the project root
+            total_size: Total size of the file in bytes
+            chunk_size: Size of every chunk except the last one
+            sha256: Optional expected checksum, can also be given on commit
+
+        Returns:
+            Upload manifest
+        """
+        if total_size <= 0:
+            raise ValueError("total_size must be positive")
+
+        chunk_size = chunk_size or self.default_chunk_size
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        total_chunks = math.ceil(total_size / chunk_size)
+        if total_chunks > 1 and chunk_size < self.min_chunk_size:
+            raise ValueError(f"chunk_size must be at least {self.min_chunk_size} bytes")
+        if total_chunks > self.max_chunks:
+            raise ValueError(f"Upload would need {total_chunks} chunks, the limit is {self.max_chunks}; "
+                             f"use a larger chunk_size")
+
+        upload_id = uuid.uuid4().hex
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {
+            "upload_id": upload_id,
+            "filename": Path(filename).name,
+            "dest_path": dest_path,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "total_chunks": total_chunks,
+            "sha256": sha256.lower() if sha256 else None,
+            "created_at": datetime.now().isoformat()
+        }
+
+        with open(upload_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        logger.info(f"Created chunked upload {upload_id} for {manifest['filename']} "
+                    f"({total_size} bytes, {manifest['total_chunks']} chunks)")
+        return manifest
+
+    def received_chunks(self, upload_id: str) -> List[int]:
+        """List chunk indices that have been fully received."""
+        upload_dir = self._upload_dir(upload_id)
+        received = []
+        for part in upload_dir.glob("chunk_*.part"):
+            try:
+                received.append(int(part.stem.split("_")[1]))
+            except (IndexError, ValueError):
+                continue
+        return sorted(received)
+
+    def get_status(self, upload_id: str) -> Dict:
+        """Get upload manifest together with received and missing chunks.
+
+        Clients call this after a dropped connection to find out which
+        chunks still need to be sent.
+        """
+        manifest = self._load_manifest(upload_id)
+        received = self.received_chunks(upload_id)
+        received_set = set(received)
+        missing = [i for i in range(manifest["total_chunks"]) if i not in received_set]
+
+        return {
+            **manifest,
+            "received_chunks": received,
+            "missing_chunks": missing,
+            "complete": not missing
+        }
+
+    async def write_chunk(self, upload_id: str, index: int, stream: AsyncIterator[bytes]) -> Dict:
+        """Stream one chunk to the staging area.
+
+        The chunk is written to a temporary file and renamed into place only
+        once its size matches, so a half-written chunk never counts as received.
+        Chunks are independent files, which makes parallel PUTs safe.
+
+        Args:
+            upload_id: ID of the upload
+            index: Zero-based chunk index
+            stream: Async iterator yielding the chunk bytes
+
+        Returns:
+            Dictionary with the chunk index and its size
+        """
+        import aiofiles
+
+        manifest = self._load_manifest(upload_id)
+        if index < 0 or index >= manifest["total_chunks"]:
+            raise ValueError(f"Chunk index {index} out of range (0-{manifest['total_chunks'] - 1})")
+
+        expected = self.expected_chunk_size(manifest, index)
+        chunk_path = self._chunk_path(upload_id, index)
+        tmp_path = chunk_path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+
+        written = 0
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                async for data in stream:
+                    written += len(data)
+                    if written > expected:
+                        raise ValueError(f"Chunk {index} exceeds expected size of {expected} bytes")
+                    await f.write(data)
+
+            if written != expected:
+                raise ValueError(f"Chunk {index} has {written} bytes, expected {expected}")
+
+            os.replace(tmp_path, chunk_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        return {"upload_id": upload_id, "index": index, "size": written}
+
+    def assemble(self, upload_id: str, target_path: Path, sha256: Optional[str] = None) -> Tuple[int, str]:
+        """Assemble all chunks into ``target_path`` and verify the checksum.
+
+        This is blocking file I/O - call it via ``asyncio.to_thread``.
+
+        Args:
+            upload_id: ID of the upload
+            target_path: Final location of the assembled file
+            sha256: Expected checksum (falls back to the one given at init)
+
+        Returns:
+            Tuple of (file size, hex digest)
+        """
+        status = self.get_status(upload_id)
+        if not status["complete"]:
+            raise ValueError(f"Upload incomplete, missing chunks: {status['missing_chunks'][:20]}")
+
+        expected_sha = (sha256 or status.get("sha256") or "").lower()
+        if not expected_sha:
+            raise ValueError("A SHA-256 checksum is required to commit an upload")
+
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per attempt: a retried commit may overlap one still assembling
+        tmp_target = target_path.with_name(f".{target_path.name}.{upload_id[:8]}.{uuid.uuid4().hex[:8]}.assembling")
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_target, 'wb') as out:
+                for index in range(status["total_chunks"]):
+                    with open(self._chunk_path(upload_id, index), 'rb') as part:
+                        while True:
+                            block = part.read(1024 * 1024)
+                            if not block:
+                                break
+                            digest.update(block)
+                            out.write(block)
+                            size += len(block)
+
+            if digest.hexdigest() != expected_sha:
+                raise ValueError(
+                    f"Checksum mismatch: expected {expected_sha}, got {digest.hexdigest()}"
+                )
+
+            os.replace(tmp_target, target_path)
+        finally:
+            if tmp_target.exists():
+                tmp_target.unlink()
+
+        logger.info(f"Assembled upload {upload_id} into {target_path} ({size} bytes)")
+        return size, digest.hexdigest()
+
+    def discard(self, upload_id: str) -> bool:
+        """Remove the staging area of an upload."""
+        upload_dir = self._upload_dir(upload_id)
+        if upload_dir.exists():
+            shutil.rmtree(upload_dir)
+            return True
+        return False
+
+    def cleanup_stale(self, max_age_hours: float = 24) -> int:
+        """Discard staged uploads that have not been touched for a while.
+
+        Args:
+            max_age_hours: Uploads older than this are removed
+
+        Returns:
+            Number of uploads removed
+        """
+        if not self.staging_root.exists():
+            return 0
+
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for upload_dir in self.staging_root.iterdir():
+            if not upload_dir.is_dir() or not _UPLOAD_ID_PATTERN.match(upload_dir.name):
+                continue
+            last_activity = max(
+                (p.stat().st_mtime for p in upload_dir.iterdir()),
+                default=upload_dir.stat().st_mtime
+            )
+            if last_activity < cutoff:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            logger.info(f"Removed {removed} stale chunked uploads from {self.staging_root}")
+        return removed
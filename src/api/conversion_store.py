@@ -0,0 +1,239 @@
+"""Content-addressed store of converted Markdown.
+
+Conversions are keyed by the SHA-256 of the original file plus the converter
+name and version, so re-uploading a document or importing the same protocol
+into another project reuses the earlier MinerU/MarkItDown output instead of
+converting again. The store lives under the projects root and is shared by
+all projects.
+
+Cached Markdown is copied into the experiment folder, so each project can
+edit its own copy. In "hardlink" mode the linked file is made read-only,
+because an in-place edit would otherwise reach every project sharing the
+object; editors must replace the file instead. Each entry keeps the list of paths it was
+materialized to; ``collect_garbage`` drops references whose files are gone
+and removes entries nobody refers to any more.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+
+
+def hash_file(path: Path, block_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 of a file without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ConversionStore:
+    """Shared cache of converted Markdown keyed by content hash and converter."""
+
+    def __init__(self, store_root: str, link_mode: str = "copy"):
+        """Initialize the conversion store.
+
+        Args:
+            store_root: Directory holding cached objects and the index
+            link_mode: "copy" to copy cached files into experiments, "hardlink" to
+                link them read-only
+        """
+        self.store_root = Path(store_root)
+        self.objects_dir = self.store_root / "objects"
+        self.index_path = self.store_root / INDEX_NAME
+        self.link_mode = link_mode
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(sha256: str, converter: str, version: str) -> str:
+        """Build the store key for a file hash and converter."""
+        return f"{sha256}:{converter.lower()}:{version or 'unknown'}"
+
+    def _object_path(self, key: str) -> Path:
+        sha256, converter, version = key.split(":", 2)
+        safe_version = "".join(c if c.isalnum() or c in ".-_" else "_" for c in version)
+        return self.objects_dir / sha256[:2] / f"{sha256}__{converter}__{safe_version}.md"
+
+    def _load_index(self) -> Dict:
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Conversion store index unreadable, starting fresh: {e}")
+        return {"version": "1.0", "entries": {}}
+
+    def _save_index(self, index: Dict):
+        self.store_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _link_or_copy(self, source: Path, target: Path) -> str:
+        """Place ``source`` at ``target``, returning the method used."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+
+        if self.link_mode == "hardlink":
+            try:
+                os.link(source, target)
+                # The inode is shared with every other project that reused it - no writing through
+                mode = os.stat(target).st_mode
+                os.chmod(target, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+                return "hardlink"
+            except OSError:
+                # Different filesystem or links unsupported - copy instead
+                pass
+        shutil.copyfile(source, target)
+        return "copy"
+
+    def materialize(self, sha256: str, converter: str, version: str, target: Path) -> bool:
+        """Place cached Markdown for a file at ``target`` if the store has it.
+
+        Blocking file I/O - call via ``asyncio.to_thread``.
+
+        Returns:
+            True on a cache hit, False if the file must be converted
+        """
+        key = self.make_key(sha256, converter, version)
+        with self._lock:
+            index = self._load_index()
+            entry = index["entries"].get(key)
+            if not entry:
+                return False
+
+            object_path = self._object_path(key)
+            # A hardlinked copy edited in place changes the object - never serve it
+            if not object_path.exists() or hash_file(object_path) != entry.get("markdown_sha256"):
+                logger.warning(f"Conversion store entry {key} missing or modified, dropping it")
+                if object_path.exists():
+                    object_path.unlink()
+                del index["entries"][key]
+                self._save_index(index)
+                return False
+
+            method = self._link_or_copy(object_path, target)
+            refs = set(entry.get("refs", []))
+            refs.add(str(target.resolve()))
+            entry["refs"] = sorted(refs)
+            entry["hits"] = entry.get("hits", 0) + 1
+            entry["last_used"] = datetime.now().isoformat()
+            self._save_index(index)
+
+        logger.info(f"Reused cached {converter} conversion for {target.name} ({method})")
+        return True
+
+    def put(self, sha256: str, converter: str, version: str, markdown_path: Path) -> Path:
+        """Add freshly converted Markdown to the store.
+
+        Blocking file I/O - call via ``asyncio.to_thread``.
+
+        Args:
+            sha256: SHA-256 of the original file
+            converter: Converter name, e.g. "MinerU"
+            version: Converter version
+            markdown_path: Converted Markdown to store (stays referenced)
+
+        Returns:
+            Path of the stored object
+        """
+        key = self.make_key(sha256, converter, version)
+        object_path = self._object_path(key)
+
+        with self._lock:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            # Copy, never link: the experiment copy is user-visible and may be edited
+            tmp_path = object_path.with_suffix(".tmp")
+            shutil.copyfile(markdown_path, tmp_path)
+            os.replace(tmp_path, object_path)
+
+            index = self._load_index()
+            index["entries"][key] = {
+                "sha256": sha256,
+                "converter": converter,
+                "version": version,
+                "markdown_sha256": hash_file(object_path),
+                "size": object_path.stat().st_size,
+                "created_at": datetime.now().isoformat(),
+                "last_used": datetime.now().isoformat(),
+                "hits": 0,
+                "refs": [str(markdown_path.resolve())]
+            }
+            self._save_index(index)
+
+        logger.info(f"Stored {converter} conversion of {sha256[:12]} in conversion store")
+        return object_path
+
+    def collect_garbage(self) -> int:
+        """Drop dangling references and remove entries with no references left.
+
+        Returns:
+            Number of store entries removed
+        """
+        removed = 0
+        with self._lock:
+            index = self._load_index()
+            for key in list(index["entries"].keys()):
+                entry = index["entries"][key]
+                entry["refs"] = [ref for ref in entry.get("refs", []) if Path(ref).exists()]
+                if entry["refs"]:
+                    continue
+
+                object_path = self._object_path(key)
+                if object_path.exists():
+                    object_path.unlink()
+                del index["entries"][key]
+                removed += 1
+            self._save_index(index)
+
+        if removed:
+            logger.info(f"Removed {removed} unreferenced conversions from {self.store_root}")
+        return removed
+
+    def stats(self) -> Dict:
+        """Get entry count, total size and hit count of the store."""
+        index = self._load_index()
+        entries = index["entries"].values()
+        return {
+            "entries": len(index["entries"]),
+            "total_bytes": sum(e.get("size", 0) for e in entries),
+            "hits": sum(e.get("hits", 0) for e in entries)
+        }
+
+
+# Global conversion store instance (singleton pattern)
+_global_store = None
+
+
+def get_conversion_store() -> ConversionStore:
+    """Get global conversion store instance.
+
+    Returns:
+        ConversionStore shared by all projects under ``projects.root_path``
+    """
+    global _global_store
+    if _global_store is None:
+        from src.config.config import config
+
+        store_path = config.get("conversion.store_path") or str(
+            config.get_project_root() / ".labacc" / "conversion_store"
+        )
+        _global_store = ConversionStore(store_path, link_mode=config.get("conversion.store_link_mode", "copy"))
+    return _global_store
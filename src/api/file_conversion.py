@@ -5,14 +5,18 @@ to Markdown format for easier processing by the AI agent.
 """
 
 import asyncio
-import json
 import logging
 import os
 import shutil
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+from src.api.conversion_store import get_conversion_store, hash_file
+from src.api.file_registry import FileRegistry
+from src.config.config import config
+from src.memory.doc_index import index_changed_files
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +36,11 @@ class FileConversionPipeline:
         self._markitdown = None
         self._mineru_available = False
         self._mineru_cmd = "mineru"  # Default, will be updated in check
+        self._mineru_version = "unknown"
+        # Outputs with failed page ranges - never cached in the conversion store
+        self._incomplete_outputs = set()
+        # PDF outputs MarkItDown produced after MinerU failed - cached under MarkItDown's key
+        self._fallback_outputs = set()
         self._check_mineru_availability()
     
     def _resolve_experiment_path(self, experiment_id: str) -> Path:
@@ -91,6 +100,7 @@ class FileConversionPipeline:
             )
             if result.returncode == 0 and "mineru" in result.stdout.lower():
                 self._mineru_available = True
+                self._mineru_version = result.stdout.strip().split()[-1]
                 logger.info(f"MinerU v2 is available at {self._mineru_cmd}")
             else:
                 self._mineru_available = False
@@ -111,6 +121,28 @@ class FileConversionPipeline:
                 raise RuntimeError("MarkItDown not available. Install with: pip install markitdown")
         return self._markitdown
     
+    def _converter_for(self, ext: str) -> Tuple[str, str]:
+        """Get name and version of the converter used for an extension.
+        
+        Args:
+            ext: Lower-case file extension including the dot
+            
+        Returns:
+            Tuple of (converter name, version) used as part of the conversion cache key
+        """
+        if ext == '.pdf' and self._mineru_available:
+            return "MinerU", self._mineru_version
+        return self._markitdown_converter()
+    
+    @staticmethod
+    def _markitdown_converter() -> Tuple[str, str]:
+        """Get name and version of MarkItDown for the conversion cache key."""
+        try:
+            from importlib.metadata import version
+            return "MarkItDown", version("markitdown")
+        except Exception:
+            return "MarkItDown", "unknown"
+    
     def needs_conversion(self, filename: str) -> bool:
         """Check if a file needs conversion based on its extension.
         
@@ -165,9 +197,203 @@ class FileConversionPipeline:
             logger.error(f"Failed to convert Office file {file_path}: {e}")
             return False
     
+    def _count_pdf_pages(self, file_path: Path) -> Optional[int]:
+        """Count PDF pages with whichever PDF library is installed.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Number of pages, or None if no PDF library is available
+        """
+        try:
+            import pypdfium2
+            pdf = pypdfium2.PdfDocument(str(file_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.warning(f"pypdfium2 could not read {file_path.name}: {e}")
+            return None
+        
+        try:
+            from pypdf import PdfReader
+            return len(PdfReader(str(file_path)).pages)
+        except ImportError:
+            logger.info("No PDF library installed, converting PDF as a single range")
+        except Exception as e:
+            logger.warning(f"pypdf could not read {file_path.name}: {e}")
+        return None
+    
+    def _run_mineru(
+        self,
+        file_path: Path,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None
+    ) -> str:
+        """Run the MinerU CLI on a whole PDF or a page range.
+        
+        Blocking - call via ``asyncio.to_thread``.
+        
+        Args:
+            file_path: Path to the PDF file
+            start_page: First page (0-based) to convert
+            end_page: Last page (0-based, inclusive) to convert
+            
+        Returns:
+            Markdown content produced by MinerU
+        """
+        import subprocess
+        
+        # Create temporary directory for MinerU output
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir_path = Path(temp_dir)
+            output_dir = temp_dir_path / "mineru_output"
+            output_dir.mkdir()
+            
+            # Run MinerU CLI command
+            cmd = [
+                self._mineru_cmd,
+                "-p", str(file_path),
+                "-o", str(output_dir),
+                "-m", "auto",  # Auto-detect method
+                "-b", "pipeline"  # Use pipeline backend
+            ]
+            if start_page is not None:
+                cmd += ["-s", str(start_page), "-e", str(end_page)]
+            
+            logger.info(f"Running MinerU v2: {' '.join(cmd)}")
+            
+            # Timeout applies per page range, not per document
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=config.get_conversion_timeout()
+            )
+            
+            if result.returncode != 0:
+                error_msg = result.stderr if result.stderr else "Unknown error"
+                raise RuntimeError(f"MinerU failed with code {result.returncode}: {error_msg[:500]}")
+            
+            # Find the generated markdown file
+            # MinerU v2 creates: output_dir/pdf_name/auto/pdf_name.md
+            pdf_name_no_ext = file_path.stem
+            expected_md = output_dir / pdf_name_no_ext / "auto" / f"{pdf_name_no_ext}.md"
+            
+            # Check the expected location first
+            if expected_md.exists():
+                return expected_md.read_text(encoding='utf-8', errors='ignore')
+            
+            # Fallback to searching for any markdown file
+            md_files = list(output_dir.glob("**/*.md"))
+            if not md_files:
+                # List all files for debugging
+                all_files = list(output_dir.rglob("*"))
+                logger.warning(f"MinerU output files: {[str(f.relative_to(output_dir)) for f in all_files if f.is_file()]}")
+                raise ValueError("MinerU did not generate markdown output")
+            
+            # Use the first markdown file found
+            logger.info(f"Found markdown at: {md_files[0].relative_to(output_dir)}")
+            return md_files[0].read_text(encoding='utf-8', errors='ignore')
+    
+    @staticmethod
+    def _write_stitched(output_path: Path, ranges: list, parts: Dict[int, str], total_pages: int):
+        """Write the completed leading page ranges, in order, to ``output_path``.
+        
+        Called after every finished range so readers can use the first pages
+        while later ranges are still converting. The file is replaced
+        atomically so readers never see a half-written file. Blocking -
+        call via ``asyncio.to_thread``.
+        """
+        sections = []
+        converted_until = 0
+        for idx, (start, end) in enumerate(ranges):
+            if idx not in parts:
+                break
+            sections.append(parts[idx])
+            converted_until = end + 1
+        
+        pending = [r for i, r in enumerate(ranges) if i not in parts]
+        if pending:
+            sections.append(
+                f"> **Conversion in progress:** pages 1-{converted_until} of {total_pages} are available; "
+                f"the remaining pages are still being converted."
+            )
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f".{output_path.name}.partial")
+        tmp_path.write_text("\n\n".join(sections), encoding='utf-8')
+        os.replace(tmp_path, output_path)
+    
+    async def _convert_pdf_ranges(self, file_path: Path, output_path: Path, total_pages: int) -> bool:
+        """Convert a large PDF as parallel MinerU page ranges.
+        
+        Args:
+            file_path: Path to the PDF file
+            output_path: Path where to save the stitched Markdown
+            total_pages: Number of pages in the PDF
+            
+        Returns:
+            True if at least one range converted, False if all failed
+        """
+        pages_per_range = max(1, config.get("conversion.pdf_pages_per_range", 20))
+        ranges = [
+            (start, min(start + pages_per_range, total_pages) - 1)
+            for start in range(0, total_pages, pages_per_range)
+        ]
+        semaphore = asyncio.Semaphore(max(1, config.get("conversion.pdf_parallel_ranges", 2)))
+        parts: Dict[int, str] = {}
+        # Writes run in threads; one at a time so they share the temp file safely and land in order
+        write_lock = asyncio.Lock()
+        
+        async def write_stitched(done: Dict[int, str]):
+            async with write_lock:
+                await asyncio.to_thread(self._write_stitched, output_path, ranges, done, total_pages)
+        
+        logger.info(f"Converting {file_path.name} ({total_pages} pages) as {len(ranges)} page ranges")
+        
+        async def convert_range(idx: int, start: int, end: int):
+            async with semaphore:
+                try:
+                    parts[idx] = await asyncio.to_thread(self._run_mineru, file_path, start, end)
+                    logger.info(f"Converted pages {start + 1}-{end + 1} of {file_path.name}")
+                except Exception as e:
+                    # Keep the gap visible instead of silently dropping pages
+                    logger.error(f"MinerU FAILED for pages {start + 1}-{end + 1} of {file_path}: {e}")
+                    parts[idx] = None
+                    return
+            if parts[idx] is not None:
+                await write_stitched({i: p for i, p in parts.items() if p is not None})
+        
+        await asyncio.gather(*(convert_range(i, start, end) for i, (start, end) in enumerate(ranges)))
+        
+        failed = [ranges[i] for i, part in parts.items() if part is None]
+        if len(failed) == len(ranges):
+            return False
+        
+        for i, (start, end) in enumerate(ranges):
+            if parts[i] is None:
+                parts[i] = (f"> **Conversion failed for pages {start + 1}-{end + 1}.** "
+                            f"Open the original PDF for this section.")
+        await write_stitched(parts)
+        
+        if failed:
+            self._incomplete_outputs.add(output_path)
+            logger.warning(f"MinerU failed for {len(failed)} of {len(ranges)} page ranges of {file_path.name}; "
+                           f"the Markdown marks the missing pages")
+        logger.info(f"Successfully converted {file_path.name} to Markdown using MinerU v2 page ranges")
+        return True
+    
     async def convert_pdf_to_markdown(self, file_path: Path, output_path: Path) -> bool:
         """Convert PDF to Markdown using MinerU or fallback to MarkItDown.
         
+        Large PDFs are split into page ranges converted in parallel; the
+        Markdown is written incrementally as ranges finish.
+        
         Args:
             file_path: Path to the PDF file
             output_path: Path where to save the Markdown
@@ -177,66 +403,25 @@ class FileConversionPipeline:
         """
         # Try MinerU v2 first if available (better quality for complex PDFs)
         if self._mineru_available:
+            import subprocess
+            
             try:
-                import subprocess
+                total_pages = await asyncio.to_thread(self._count_pdf_pages, file_path)
+                pages_per_range = config.get("conversion.pdf_pages_per_range", 20)
                 
-                # Create temporary directory for MinerU output
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_dir_path = Path(temp_dir)
-                    output_dir = temp_dir_path / "mineru_output"
-                    output_dir.mkdir()
-                    
-                    # Run MinerU CLI command
-                    cmd = [
-                        self._mineru_cmd,
-                        "-p", str(file_path),
-                        "-o", str(output_dir),
-                        "-m", "auto",  # Auto-detect method
-                        "-b", "pipeline"  # Use pipeline backend
-                    ]
-                    
-                    logger.info(f"Running MinerU v2: {' '.join(cmd)}")
-                    
-                    # Run with timeout (synchronous for now since we're not in async context)
-                    result = await asyncio.to_thread(
-                        subprocess.run,
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=120  # 2 minutes timeout for large PDFs
-                    )
-                    
-                    if result.returncode != 0:
-                        error_msg = result.stderr if result.stderr else "Unknown error"
-                        raise RuntimeError(f"MinerU failed with code {result.returncode}: {error_msg[:500]}")
-                    
-                    # Find the generated markdown file
-                    # MinerU v2 creates: output_dir/pdf_name/auto/pdf_name.md
-                    pdf_name_no_ext = file_path.stem
-                    expected_md = output_dir / pdf_name_no_ext / "auto" / f"{pdf_name_no_ext}.md"
-                    
-                    # Check the expected location first
-                    if expected_md.exists():
-                        md_content = expected_md.read_text(encoding='utf-8', errors='ignore')
-                    else:
-                        # Fallback to searching for any markdown file
-                        md_files = list(output_dir.glob("**/*.md"))
-                        if not md_files:
-                            # List all files for debugging
-                            all_files = list(output_dir.rglob("*"))
-                            logger.warning(f"MinerU output files: {[str(f.relative_to(output_dir)) for f in all_files if f.is_file()]}")
-                            raise ValueError("MinerU did not generate markdown output")
-                        else:
-                            # Use the first markdown file found
-                            md_content = md_files[0].read_text(encoding='utf-8', errors='ignore')
-                            logger.info(f"Found markdown at: {md_files[0].relative_to(output_dir)}")
-                    
-                    # Save to target location
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-                    output_path.write_text(md_content, encoding='utf-8')
-                    
-                    logger.info(f"Successfully converted {file_path.name} to Markdown using MinerU v2")
-                    return True
+                if total_pages and total_pages > pages_per_range:
+                    if await self._convert_pdf_ranges(file_path, output_path, total_pages):
+                        return True
+                    raise RuntimeError("all page ranges failed")
+                
+                md_content = await asyncio.to_thread(self._run_mineru, file_path)
+                
+                # Save to target location
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_text(md_content, encoding='utf-8')
+                
+                logger.info(f"Successfully converted {file_path.name} to Markdown using MinerU v2")
+                return True
                     
             except subprocess.TimeoutExpired:
                 logger.error(f"MinerU conversion TIMED OUT for {file_path}")
@@ -260,6 +445,8 @@ class FileConversionPipeline:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(result.text_content)
             
+            if self._mineru_available:
+                self._fallback_outputs.add(output_path)
             logger.info(f"Successfully converted {file_path.name} to Markdown using MarkItDown (MinerU was unavailable or failed)")
             return True
             
@@ -269,12 +456,16 @@ class FileConversionPipeline:
             # FAIL LOUDLY
             raise RuntimeError(f"PDF conversion completely failed: {e}")
     
-    async def process_upload(self, file_path: Path, experiment_id: str) -> Dict:
+    async def process_upload(self, file_path: Path, experiment_id: str, file_size: Optional[int] = None) -> Dict:
         """Process an uploaded file, converting if necessary.
         
+        This is the single place uploads and imports are recorded in the
+        experiment's file registry; callers must not write it again.
+        
         Args:
             file_path: Path to the uploaded file
             experiment_id: ID of the experiment
+            file_size: Size of the file in bytes (read from disk if not given)
             
         Returns:
             Dictionary with conversion results
@@ -285,6 +476,7 @@ class FileConversionPipeline:
             "converted_path": None,
             "conversion_status": "not_needed",
             "conversion_method": None,
+            "file_size": file_size if file_size is not None else file_path.stat().st_size,
             "timestamp": datetime.now().isoformat()
         }
         
@@ -311,18 +503,44 @@ class FileConversionPipeline:
         ext = file_path.suffix.lower()
         conversion_success = False
         
-        if ext == '.pdf':
-            conversion_success = await self.convert_pdf_to_markdown(file_path, converted_path)
-            result["conversion_method"] = "MinerU" if self._mineru_available else "MarkItDown"
-        elif ext in ['.docx', '.doc', '.pptx', '.ppt', '.xlsx', '.xls', '.html', '.htm', '.rtf', '.odt', '.odp', '.ods']:
-            conversion_success = await self.convert_office_to_markdown(file_path, converted_path)
-            result["conversion_method"] = "MarkItDown"
-        else:
+        if ext not in ['.pdf', '.docx', '.doc', '.pptx', '.ppt', '.xlsx', '.xls', '.html', '.htm', '.rtf', '.odt', '.odp', '.ods']:
             logger.warning(f"Unsupported file type for conversion: {ext}")
             result["conversion_status"] = "unsupported"
             await self.update_registry(experiment_id, result)
             return result
         
+        # Reuse an earlier conversion of identical bytes with the same converter
+        converter, converter_version = self._converter_for(ext)
+        store = get_conversion_store()
+        content_hash = await asyncio.to_thread(hash_file, file_path)
+        result["content_sha256"] = content_hash
+        result["conversion_method"] = converter
+        
+        if await asyncio.to_thread(store.materialize, content_hash, converter, converter_version, converted_path):
+            conversion_success = True
+            result["conversion_cached"] = True
+        else:
+            # Never write a new conversion through a (read-only) store hardlink shared with other projects
+            if converted_path.exists() and converted_path.stat().st_nlink > 1:
+                converted_path.unlink()
+            if ext == '.pdf':
+                conversion_success = await self.convert_pdf_to_markdown(file_path, converted_path)
+            else:
+                conversion_success = await self.convert_office_to_markdown(file_path, converted_path)
+            
+            if converted_path in self._fallback_outputs:
+                # File the output under the converter that actually produced it
+                self._fallback_outputs.discard(converted_path)
+                converter, converter_version = self._markitdown_converter()
+                result["conversion_method"] = converter
+            
+            if conversion_success and converted_path.exists() and converted_path not in self._incomplete_outputs:
+                try:
+                    await asyncio.to_thread(store.put, content_hash, converter, converter_version, converted_path)
+                except OSError as e:
+                    # Caching is an optimisation - never fail the upload over it
+                    logger.warning(f"Could not add {file_path.name} to conversion store: {e}")
+        
         # Update result based on conversion outcome
         if conversion_success:
             # Verify the file was actually created
@@ -347,49 +565,50 @@ class FileConversionPipeline:
         
         return result
     
+    def _registry_for(self, experiment_id: str) -> Tuple[FileRegistry, str]:
+        """Get the FileRegistry and registry key for an experiment.
+        
+        ``experiment_id`` may be a folder name or a full path, so the registry
+        is rooted at the resolved experiment folder's parent.
+        """
+        exp_dir = self._resolve_experiment_path(experiment_id)
+        return FileRegistry(str(exp_dir.parent)), exp_dir.name
+    
     async def update_registry(self, experiment_id: str, file_info: Dict):
-        """Update the file registry with conversion information.
+        """Record a processed file in the experiment's file registry.
         
         Args:
             experiment_id: ID of the experiment
             file_info: File information including conversion details
         """
-        # Use helper method to resolve path properly
-        exp_dir = self._resolve_experiment_path(experiment_id)
-        registry_path = exp_dir / ".labacc" / "file_registry.json"
+        registry, registry_id = self._registry_for(experiment_id)
         
-        # Load existing registry or create new
-        if registry_path.exists():
-            with open(registry_path, 'r') as f:
-                registry = json.load(f)
-        else:
-            registry = {
-                "version": "3.0",
-                "experiment_id": experiment_id,
-                "files": {},
-                "last_updated": None
-            }
-            registry_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Update registry with new file info
-        filename = file_info["filename"]
-        registry["files"][filename] = {
-            "original_path": file_info["original_path"],
-            "converted_path": file_info.get("converted_path"),
-            "upload_time": file_info["timestamp"],
-            "conversion": {
-                "status": file_info["conversion_status"],
-                "method": file_info.get("conversion_method"),
-                "timestamp": file_info["timestamp"] if file_info["conversion_status"] == "success" else None
-            }
+        metadata = {
+            key: file_info[key]
+            for key in ("content_sha256", "conversion_cached")
+            if file_info.get(key) is not None
         }
-        registry["last_updated"] = datetime.now().isoformat()
+        # One complete record, written once - readers may load the file right away
+        with registry.batch():
+            registry.add_file(
+                experiment_id=registry_id,
+                filename=file_info["filename"],
+                original_path=file_info["original_path"],
+                converted_path=file_info.get("converted_path"),
+                file_size=file_info.get("file_size"),
+                conversion_status=file_info["conversion_status"],
+                conversion_method=file_info.get("conversion_method"),
+                metadata=metadata or None
+            )
         
-        # Save registry
-        with open(registry_path, 'w') as f:
-            json.dump(registry, f, indent=2)
+        logger.info(f"Updated file registry for {experiment_id}/{file_info['filename']}")
         
-        logger.info(f"Updated file registry for {experiment_id}/{filename}")
+        # Keep the project's full-text index current for the new text
+        await asyncio.to_thread(
+            index_changed_files,
+            self.project_root,
+            [self.project_root / p for p in (file_info["original_path"], file_info.get("converted_path")) if p],
+        )
     
     async def get_file_info(self, experiment_id: str, filename: str) -> Optional[Dict]:
         """Get file information from registry.
@@ -401,17 +620,8 @@ class FileConversionPipeline:
         Returns:
             File information from registry, or None if not found
         """
-        # Use helper method to resolve path properly
-        exp_dir = self._resolve_experiment_path(experiment_id)
-        registry_path = exp_dir / ".labacc" / "file_registry.json"
-        
-        if not registry_path.exists():
-            return None
-        
-        with open(registry_path, 'r') as f:
-            registry = json.load(f)
-        
-        return registry.get("files", {}).get(filename)
+        registry, registry_id = self._registry_for(experiment_id)
+        return registry.get_file(registry_id, filename)
     
     async def notify_agent_for_analysis(self, experiment_id: str, filename: str):
         """Notify the agent that a new file has been uploaded and converted.
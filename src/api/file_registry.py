@@ -2,27 +2,168 @@
 
 This module manages the file registry that tracks all uploaded files,
 their conversion status, and metadata.
+
+Registries are cached in memory per experiment, shared by all FileRegistry
+instances in the process. A cached registry is re-read only when the JSON
+file's mtime/size changes, lookups by path use a reverse index, and
+mutations are written back in one batch: either at the end of a
+``batch()`` block or after ``registry.flush_delay_seconds`` when called
+from the event loop.
 """
 
+import asyncio
+import atexit
 import json
 import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class CachedRegistry:
+    """In-memory copy of one experiment's registry file."""
+    path: Path
+    data: Dict
+    stamp: Optional[Tuple[int, int]]  # (mtime_ns, size) of the file when last read/written
+    path_index: Dict[str, str] = field(default_factory=dict)  # original/converted path -> filename
+    dirty_files: Set[str] = field(default_factory=set)
+    full_rewrite: bool = False
+
+    @property
+    def dirty(self) -> bool:
+        return self.full_rewrite or bool(self.dirty_files)
+
+    def index_entry(self, filename: str, file_info: Optional[Dict]):
+        """Add a file's paths to the reverse index."""
+        if not file_info:
+            return
+        for key in ("original_path", "converted_path"):
+            if file_info.get(key):
+                self.path_index[file_info[key]] = filename
+
+    def unindex_entry(self, filename: str):
+        """Remove a file's paths from the reverse index."""
+        file_info = self.data.get("files", {}).get(filename)
+        if not file_info:
+            return
+        for key in ("original_path", "converted_path"):
+            if self.path_index.get(file_info.get(key)) == filename:
+                del self.path_index[file_info[key]]
+
+    def rebuild_index(self):
+        self.path_index = {}
+        for filename, file_info in self.data.get("files", {}).items():
+            self.index_entry(filename, file_info)
+
+
+# Process-wide cache keyed by absolute registry path
+_registry_cache: Dict[str, CachedRegistry] = {}
+_cache_lock = threading.RLock()
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _write_cached(cached: CachedRegistry, create_dirs: bool = True):
+    """Write a dirty cached registry to disk, merging concurrent external edits.
+    
+    Args:
+        cached: Cached registry to write
+        create_dirs: Create the experiment folder if missing; deferred writes
+            pass False so they never resurrect a folder deleted meanwhile
+    """
+    with _cache_lock:
+        if not cached.dirty:
+            return
+        
+        experiment_dir = cached.path.parent.parent
+        if not create_dirs and not experiment_dir.exists():
+            dropped = "all entries" if cached.full_rewrite else ", ".join(sorted(cached.dirty_files))
+            logger.warning(f"Dropping pending registry changes ({dropped}), {experiment_dir} no longer exists")
+            cached.dirty_files.clear()
+            cached.full_rewrite = False
+            # Forget the unsaved entries too, so reads match what is on disk
+            _registry_cache.pop(os.path.abspath(cached.path), None)
+            return
+
+        data = cached.data
+        disk_stamp = _file_stamp(cached.path)
+        if not cached.full_rewrite and disk_stamp is not None and disk_stamp != cached.stamp:
+            # Someone else wrote the file since we read it - keep their entries
+            # and apply only the files we changed
+            with open(cached.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data.setdefault("files", {})
+            for filename in cached.dirty_files:
+                if filename in cached.data.get("files", {}):
+                    data["files"][filename] = cached.data["files"][filename]
+                else:
+                    data["files"].pop(filename, None)
+            cached.data = data
+            cached.rebuild_index()
+
+        data["last_updated"] = datetime.now().isoformat()
+        data["total_files"] = len(data.get("files", {}))
+
+        cached.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached.path.with_name(f".{cached.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, cached.path)
+
+        cached.stamp = _file_stamp(cached.path)
+        cached.dirty_files.clear()
+        cached.full_rewrite = False
+
+    logger.info(f"Saved registry {cached.path} with {data['total_files']} files")
+
+
+def flush_all_registries():
+    """Write every dirty cached registry to disk."""
+    with _cache_lock:
+        pending = [cached for cached in _registry_cache.values() if cached.dirty]
+    for cached in pending:
+        try:
+            _write_cached(cached, create_dirs=False)
+        except Exception as e:
+            logger.error(f"Failed to flush registry {cached.path}: {e}")
+
+
+# Never lose write-behind updates on a clean shutdown
+atexit.register(flush_all_registries)
+
+
 class FileRegistry:
     """Manages file registry for experiments."""
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, flush_delay: Optional[float] = None):
         """Initialize file registry.
         
         Args:
             project_root: Root directory for all projects
+            flush_delay: Seconds to defer writes when running in an event loop
+                (defaults to ``registry.flush_delay_seconds``; 0 writes through)
         """
         self.project_root = Path(project_root)
+        if flush_delay is None:
+            from src.config.config import config
+            flush_delay = config.get("registry.flush_delay_seconds", 1.0)
+        self.flush_delay = flush_delay
+        self._batch_depth = 0
+        self._pending: Set[str] = set()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
     
     def get_registry_path(self, experiment_id: str) -> Path:
         """Get path to registry file for an experiment.
@@ -35,29 +176,111 @@ class FileRegistry:
         """
         return self.project_root / experiment_id / ".labacc" / "file_registry.json"
     
+    def _get_cached(self, experiment_id: str) -> CachedRegistry:
+        """Get the cached registry, re-reading the file if it changed on disk."""
+        registry_path = self.get_registry_path(experiment_id)
+        key = os.path.abspath(registry_path)
+        stamp = _file_stamp(registry_path)
+        
+        with _cache_lock:
+            cached = _registry_cache.get(key)
+            # Pending local changes win; they are merged with disk on flush
+            if cached is not None and (cached.dirty or cached.stamp == stamp):
+                return cached
+            
+            if stamp is not None:
+                with open(registry_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            else:
+                # Default registry structure
+                data = {
+                    "version": "3.0",
+                    "experiment_id": experiment_id,
+                    "files": {},
+                    "last_updated": None,
+                    "total_files": 0
+                }
+            data.setdefault("files", {})
+            
+            cached = CachedRegistry(path=registry_path, data=data, stamp=stamp)
+            cached.rebuild_index()
+            _registry_cache[key] = cached
+            return cached
+    
+    def _schedule_flush(self, experiment_id: str):
+        """Write now, at the end of the current batch, or after the write-behind delay."""
+        key = os.path.abspath(self.get_registry_path(experiment_id))
+        self._pending.add(key)
+        
+        if self._batch_depth > 0:
+            return
+        
+        if self.flush_delay and self.flush_delay > 0:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                if self._flush_handle is None:
+                    self._flush_handle = loop.call_later(self.flush_delay, self._flush_deferred)
+                return
+        
+        self.flush()
+    
+    def flush(self, create_dirs: bool = True):
+        """Write all registries changed through this instance to disk.
+        
+        Args:
+            create_dirs: Create missing experiment folders (False for deferred writes)
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        pending, self._pending = self._pending, set()
+        for key in pending:
+            cached = _registry_cache.get(key)
+            if cached is not None:
+                _write_cached(cached, create_dirs)
+    
+    def _flush_deferred(self):
+        """Write-behind timer callback: flush without recreating deleted folders, logging failures."""
+        try:
+            self.flush(create_dirs=False)
+        except Exception as e:
+            # Raised from a loop callback this would only reach asyncio's default handler
+            logger.error(f"Deferred registry flush failed: {e}")
+    
+    @contextmanager
+    def batch(self):
+        """Group several mutations into a single write per registry.
+        
+        Example:
+            with registry.batch():
+                for upload in uploads:
+                    registry.add_file(...)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
     def load_registry(self, experiment_id: str) -> Dict:
         """Load registry for an experiment.
         
+        The returned dictionary is the cached copy; pass it back to
+        ``save_registry`` after modifying it.
+        
         Args:
             experiment_id: ID of the experiment
             
         Returns:
             Registry dictionary
         """
-        registry_path = self.get_registry_path(experiment_id)
-        
-        if registry_path.exists():
-            with open(registry_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        
-        # Return default registry structure
-        return {
-            "version": "3.0",
-            "experiment_id": experiment_id,
-            "files": {},
-            "last_updated": None,
-            "total_files": 0
-        }
+        return self._get_cached(experiment_id).data
     
     def save_registry(self, experiment_id: str, registry: Dict):
         """Save registry for an experiment.
@@ -66,17 +289,27 @@ class FileRegistry:
             experiment_id: ID of the experiment
             registry: Registry dictionary to save
         """
-        registry_path = self.get_registry_path(experiment_id)
-        registry_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Update metadata
-        registry["last_updated"] = datetime.now().isoformat()
-        registry["total_files"] = len(registry.get("files", {}))
-        
-        with open(registry_path, 'w', encoding='utf-8') as f:
-            json.dump(registry, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Saved registry for {experiment_id} with {registry['total_files']} files")
+        cached = self._get_cached(experiment_id)
+        with _cache_lock:
+            registry.setdefault("files", {})
+            cached.data = registry
+            cached.rebuild_index()
+            cached.full_rewrite = True
+        self._schedule_flush(experiment_id)
+    
+    def _set_file(self, experiment_id: str, filename: str, file_entry: Optional[Dict]):
+        """Set (or with ``None`` remove) one file entry and schedule the write."""
+        cached = self._get_cached(experiment_id)
+        with _cache_lock:
+            cached.unindex_entry(filename)
+            if file_entry is None:
+                cached.data["files"].pop(filename, None)
+            else:
+                cached.data["files"][filename] = file_entry
+                cached.index_entry(filename, file_entry)
+            cached.data["total_files"] = len(cached.data["files"])
+            cached.dirty_files.add(filename)
+        self._schedule_flush(experiment_id)
     
     def add_file(
         self,
@@ -104,8 +337,6 @@ class FileRegistry:
         Returns:
             Updated file entry
         """
-        registry = self.load_registry(experiment_id)
-        
         # Create file entry
         file_entry = {
             "original_path": original_path,
@@ -129,8 +360,7 @@ class FileRegistry:
             file_entry["metadata"] = metadata
         
         # Update registry
-        registry["files"][filename] = file_entry
-        self.save_registry(experiment_id, registry)
+        self._set_file(experiment_id, filename, file_entry)
         
         return file_entry
     
@@ -157,14 +387,13 @@ class FileRegistry:
         Returns:
             File entry with filename, or None if not found
         """
-        registry = self.load_registry(experiment_id)
+        cached = self._get_cached(experiment_id)
         
-        for filename, file_info in registry.get("files", {}).items():
-            if (file_info.get("original_path") == file_path or 
-                file_info.get("converted_path") == file_path):
-                return {"filename": filename, **file_info}
+        filename = cached.path_index.get(file_path)
+        if filename is None or filename not in cached.data["files"]:
+            return None
         
-        return None
+        return {"filename": filename, **cached.data["files"][filename]}
     
     def update_analysis(
         self,
@@ -184,13 +413,14 @@ class FileRegistry:
         registry = self.load_registry(experiment_id)
         
         if filename in registry.get("files", {}):
-            registry["files"][filename]["analysis"] = {
+            file_entry = dict(registry["files"][filename])
+            file_entry["analysis"] = {
                 "analyzed": True,
                 "summary": summary,
                 "context": context,
                 "timestamp": datetime.now().isoformat()
             }
-            self.save_registry(experiment_id, registry)
+            self._set_file(experiment_id, filename, file_entry)
             logger.info(f"Updated analysis for {experiment_id}/{filename}")
         else:
             logger.warning(f"File {filename} not found in registry for {experiment_id}")
@@ -255,27 +485,24 @@ class FileRegistry:
         """
         registry = self.load_registry(experiment_id)
         exp_dir = self.project_root / experiment_id
-        updated = False
         
-        for filename in list(registry.get("files", {}).keys()):
-            file_info = registry["files"][filename]
-            original_path = exp_dir / file_info.get("original_path", "")
-            
-            # If original doesn't exist, remove from registry
-            if not original_path.exists():
-                # Also remove converted file if it exists
-                if file_info.get("converted_path"):
-                    converted_path = exp_dir / file_info["converted_path"]
-                    if converted_path.exists():
-                        converted_path.unlink()
-                        logger.info(f"Removed orphaned conversion: {converted_path}")
+        # All removals go to disk in one write
+        with self.batch():
+            for filename in list(registry.get("files", {}).keys()):
+                file_info = registry["files"][filename]
+                original_path = exp_dir / file_info.get("original_path", "")
                 
-                del registry["files"][filename]
-                updated = True
-                logger.info(f"Removed orphaned entry from registry: {filename}")
-        
-        if updated:
-            self.save_registry(experiment_id, registry)
+                # If original doesn't exist, remove from registry
+                if not original_path.exists():
+                    # Also remove converted file if it exists
+                    if file_info.get("converted_path"):
+                        converted_path = exp_dir / file_info["converted_path"]
+                        if converted_path.exists():
+                            converted_path.unlink()
+                            logger.info(f"Removed orphaned conversion: {converted_path}")
+                    
+                    self._set_file(experiment_id, filename, None)
+                    logger.info(f"Removed orphaned entry from registry: {filename}")
 
 
 # Global registry instance (singleton pattern)
@@ -8,24 +8,22 @@ import os
 import shutil
 import mimetypes
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 from typing import Any
 import asyncio
 import logging
 
 import aiofiles
-import aiohttp
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
-# Import memory tools for auto-updating README
-from src.memory.memory_tools import update_file_registry, append_insight
-from src.memory.file_summarizer import summarize_uploaded_file
-
 # Import file conversion and registry
 from src.api.file_conversion import FileConversionPipeline
-from src.api.file_registry import FileRegistry
+from src.api.chunked_upload import ChunkedUploadManager
+from src.api.upload_jobs import enqueue_thumbnail, enqueue_upload_processing
+from src.components.thumbnails import get_thumbnail_cache, is_thumbnailable
 from src.config.config import config
 
 logger = logging.getLogger(__name__)
@@ -70,6 +68,20 @@ class DeleteFilesRequest(BaseModel):
     paths: list[str]
 
 
+class InitChunkedUploadRequest(BaseModel):
+    """Request to start a resumable chunked upload"""
+    filename: str
+    total_size: int
+    path: str = "/"
+    chunk_size: int | None = None
+    sha256: str | None = None
+
+
+class CommitChunkedUploadRequest(BaseModel):
+    """Request to assemble a chunked upload"""
+    sha256: str | None = None
+
+
 # Security utilities
 def validate_path(path: str, project_root: str) -> Path:
     """Validate and sanitize file paths to prevent directory traversal"""
@@ -113,6 +125,61 @@ def get_project_root(request: Request) -> str:
     return str(project_path)
 
 
+def detect_experiment_id(dest_dir: Path, project_root: str) -> str | None:
+    """Find the experiment folder (starts with exp_) a destination belongs to"""
+    relative_path = str(dest_dir.relative_to(project_root))
+    experiment_id = None
+    for part in relative_path.split('/'):
+        if part.startswith('exp_'):
+            experiment_id = part
+            break
+
+    # Log the detected experiment_id for debugging
+    if experiment_id:
+        logger.info(f"Detected experiment_id: {experiment_id} from path: {relative_path}")
+    else:
+        logger.warning(f"No experiment_id detected from path: {relative_path}")
+
+    return experiment_id
+
+
+def upload_destination(
+    dest_dir: Path,
+    filename: str,
+    experiment_id: str | None,
+    conversion_pipeline: FileConversionPipeline
+) -> Path:
+    """Decide where an uploaded file is saved"""
+    if experiment_id and conversion_pipeline.needs_conversion(filename):
+        # For convertible files in experiments, save to originals/
+        # FIXED: Use dest_dir instead of reconstructing path from experiment_id
+        originals_dir = dest_dir / "originals"
+        originals_dir.mkdir(parents=True, exist_ok=True)
+        return originals_dir / filename
+
+    # For other files, save to requested location
+    return dest_dir / filename
+
+
+async def convert_and_register_upload(
+    file_path: Path,
+    filename: str,
+    file_size: int,
+    experiment_id: str | None,
+    project_root: str,
+    conversion_pipeline: FileConversionPipeline
+) -> dict[str, Any] | None:
+    """Run conversion for a saved upload; the pipeline records it in the registry"""
+    if not experiment_id:
+        return None
+
+    return await conversion_pipeline.process_upload(
+        file_path,
+        experiment_id,
+        file_size=file_size
+    )
+
+
 # File operation endpoints
 @router.get("/list", response_model=ListFilesResponse)
 async def list_files(
@@ -160,7 +227,7 @@ async def list_files(
                 )
 
                 # Add thumbnail URL for images
-                if item.is_file() and item.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif']:
+                if item.is_file() and is_thumbnailable(item.name):
                     file_info.thumbnail_url = f"/api/files/thumbnail/{relative_path}"
 
                 files.append(file_info)
@@ -193,7 +260,12 @@ async def upload_files(
     path: str = Form("/"),
     project_root: str = Depends(get_project_root)
 ) -> dict[str, Any]:
-    """Upload one or more files to the specified path"""
+    """Upload one or more files to the specified path
+
+    Returns as soon as the bytes are on disk. Conversion, registry updates,
+    README summaries and agent analysis run as background jobs; poll
+    /api/jobs/{job_id} or listen on the session WebSocket for progress.
+    """
     try:
         # Validate destination path
         dest_dir = validate_path(path, project_root)
@@ -205,257 +277,57 @@ async def upload_files(
             raise HTTPException(status_code=400, detail="Destination is not a directory")
 
         uploaded_files = []
+        session_id = request.headers.get("X-Session-ID")
         
-        # Initialize conversion pipeline and registry
+        # Conversion pipeline is only needed to decide where files go
         conversion_pipeline = FileConversionPipeline(project_root)
-        file_registry = FileRegistry(project_root)
+
+        # Determine if this is an experiment folder
+        experiment_id = detect_experiment_id(dest_dir, project_root)
 
         for file in files:
             # Sanitize filename
             filename = Path(file.filename).name
             
-            # Determine if this is an experiment folder
-            relative_path = str(dest_dir.relative_to(project_root))
-            path_parts = relative_path.split('/')
-            experiment_id = None
-            for part in path_parts:
-                if part.startswith('exp_'):
-                    experiment_id = part
-                    break
-            
-            # Log the detected experiment_id for debugging
-            if experiment_id:
-                logger.info(f"Detected experiment_id: {experiment_id} from path: {relative_path}")
-            else:
-                logger.warning(f"No experiment_id detected from path: {relative_path}")
-            
             # Determine where to save the file
-            if experiment_id and conversion_pipeline.needs_conversion(filename):
-                # For convertible files in experiments, save to originals/
-                # FIXED: Use dest_dir instead of reconstructing path from experiment_id
-                originals_dir = dest_dir / "originals"
-                originals_dir.mkdir(parents=True, exist_ok=True)
-                file_path = originals_dir / filename
-            else:
-                # For other files, save to requested location
-                file_path = dest_dir / filename
+            file_path = upload_destination(dest_dir, filename, experiment_id, conversion_pipeline)
 
-            # Save file
+            # Save file in blocks so large files are not held in memory
+            file_size = 0
             async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+                while content := await file.read(1024 * 1024):
+                    await f.write(content)
+                    file_size += len(content)
             
-            file_size = len(content)
             relative_file_path = str(file_path.relative_to(project_root))
 
-            # Process conversion if needed and in experiment
-            conversion_result = None
+            # Queue conversion and analysis for files in experiments
+            job_id = None
             if experiment_id:
-                conversion_result = await conversion_pipeline.process_upload(
-                    file_path, 
-                    experiment_id
-                )
-                
-                # Update registry with full information
-                file_registry.add_file(
-                    experiment_id=experiment_id,
-                    filename=filename,
-                    original_path=relative_file_path,
-                    converted_path=conversion_result.get("converted_path"),
-                    file_size=file_size,
-                    conversion_status=conversion_result.get("conversion_status", "not_needed"),
-                    conversion_method=conversion_result.get("conversion_method")
+                job = enqueue_upload_processing(
+                    file_path,
+                    filename,
+                    file_size,
+                    experiment_id,
+                    project_root,
+                    session_id
                 )
+                job_id = job["id"]
+
+            # Render the file browser thumbnail ahead of the first listing
+            enqueue_thumbnail(file_path, project_root, session_id)
 
             uploaded_files.append({
                 "name": filename,
                 "path": relative_file_path,
                 "size": file_size,
-                "converted": conversion_result.get("converted_path") if conversion_result else None,
-                "conversion_status": conversion_result.get("conversion_status") if conversion_result else "not_needed"
+                "converted": None,
+                "conversion_status": "queued" if job_id else "not_needed",
+                "job_id": job_id
             })
-        
-        # Notify agent about uploaded files for proactive analysis
-        try:
-            # Get session ID from request headers
-            session_id = request.headers.get("X-Session-ID")
-            
-            if session_id and experiment_id:
-                from src.api.react_bridge import notify_agent_of_upload
-                
-                # Notify agent about each uploaded file and trigger analysis
-                for file_info in uploaded_files:
-                    if file_info.get("conversion_status") in ["success", "not_needed"]:
-                        # Use converted path if available, otherwise original
-                        analysis_path = file_info.get("converted") or file_info["path"]
-                        
-                        # Create task for background analysis
-                        async def trigger_analysis(file_data, exp_id, sess_id):
-                            try:
-                                # First send a notification that file was uploaded
-                                notification = f"📎 File uploaded: **{file_data['name']}**"
-                                if file_data["conversion_status"] == "success":
-                                    notification += f"\n✅ Successfully converted to Markdown and saved to {exp_id}/{file_data['name'].rsplit('.', 1)[0]}.md"
-                                else:
-                                    notification += f"\n📁 Saved to {exp_id}/originals/"
-                                
-                                # Send notification via HTTP endpoint
-                                async with aiohttp.ClientSession() as session:
-                                    url = "http://localhost:8002/api/agent-message"
-                                    data = {
-                                        "session_id": sess_id,
-                                        "content": notification,
-                                        "author": "System"
-                                    }
-                                    async with session.post(url, json=data) as resp:
-                                        if resp.status != 200:
-                                            logger.warning(f"Failed to send notification: {resp.status}")
-                                
-                                # Now trigger actual agent analysis
-                                logger.info(f"Triggering agent analysis for {file_data['name']}")
-                                analysis_response = await notify_agent_of_upload(
-                                    session_id=sess_id,
-                                    file_path=file_data["analysis_path"],
-                                    experiment_id=exp_id,
-                                    original_name=file_data["name"],
-                                    conversion_status=file_data["conversion_status"]
-                                )
-                                
-                                # Send the analysis as a message to the chat
-                                async with aiohttp.ClientSession() as session:
-                                    url = "http://localhost:8002/api/agent-message"
-                                    data = {
-                                        "session_id": sess_id,
-                                        "content": analysis_response,
-                                        "author": "Assistant"
-                                    }
-                                    async with session.post(url, json=data) as resp:
-                                        if resp.status != 200:
-                                            logger.warning(f"Failed to send analysis: {resp.status}")
-                                        else:
-                                            logger.info(f"Analysis sent to chat for {file_data['name']}")
-                                
-                            except Exception as e:
-                                logger.error(f"Failed to trigger analysis: {e}")
-                        
-                        # Create task for background analysis
-                        file_data = {
-                            "name": file_info["name"],
-                            "analysis_path": analysis_path,
-                            "conversion_status": file_info["conversion_status"]
-                        }
-                        asyncio.create_task(trigger_analysis(file_data, experiment_id, session_id))
-                        logger.info(f"Started analysis task for {file_info['name']}")
-        except Exception as e:
-            logger.error(f"Error notifying agent about upload: {e}")
-            # Don't fail the upload if notification fails
-        
-        # Auto-update README if uploading to an experiment folder
-        try:
-            # Check if this is an experiment folder
-            relative_path = str(dest_dir.relative_to(project_root))
-            path_parts = relative_path.split('/')
-            
-            # Find experiment folder (starts with exp_)
-            experiment_id = None
-            for part in path_parts:
-                if part.startswith('exp_'):
-                    experiment_id = part
-                    break
-            
-            # FAIL if no valid experiment_id found
-            if not experiment_id:
-                logger.warning(f"Upload to non-experiment folder: {relative_path}")
-                # Skip README update for non-experiment folders but still return success
-                return {
-                    "success": True,
-                    "uploaded_count": len(uploaded_files),
-                    "files": uploaded_files
-                }
-                
-            if experiment_id:
-                # Update README in background
-                async def update_readme_background():
-                    try:
-                        for file_info in uploaded_files:
-                            filename = file_info["name"]
-                            size = file_info["size"]
-                            
-                            # Determine file type
-                            file_ext = Path(filename).suffix.lower()
-                            if file_ext in ['.csv', '.tsv', '.txt']:
-                                file_type = "Data"
-                            elif file_ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg']:
-                                file_type = "Image"
-                            elif file_ext in ['.pdf', '.doc', '.docx', '.md']:
-                                file_type = "Document"
-                            elif file_ext in ['.py', '.ipynb']:
-                                file_type = "Code"
-                            elif file_ext in ['.json', '.yaml', '.yml']:
-                                file_type = "Config"
-                            else:
-                                file_type = "File"
-                            
-                            # Use LLM to generate context-aware summary
-                            # Use converted file if available for better analysis
-                            file_full_path = Path(project_root) / file_info["path"]
-                            
-                            # Check if we have a converted version
-                            if file_info.get("converted"):
-                                # Use converted markdown for analysis
-                                analysis_path = Path(project_root) / file_info["converted"]
-                                if analysis_path.exists():
-                                    file_full_path = analysis_path
-                                    logger.info(f"Using converted file for analysis: {analysis_path}")
-                            
-                            # Get intelligent summary with experiment context
-                            try:
-                                summary = await summarize_uploaded_file(
-                                    str(file_full_path),
-                                    experiment_id
-                                )
-                                logger.info(f"Generated LLM summary for {filename}: {summary[:50]}...")
-                            except Exception as e:
-                                logger.error(f"Failed to generate LLM summary: {e}")
-                                # Fallback to simple summary
-                                summary = f"Uploaded {file_type.lower()} file"
-                            
-                            # Update file registry - FAIL if invalid experiment_id
-                            if not experiment_id:
-                                raise ValueError(f"No experiment_id for file upload to {relative_path}")
-                                
-                            await update_file_registry.ainvoke({
-                                "experiment_id": experiment_id,
-                                "file_name": filename,
-                                "file_type": file_type,
-                                "file_size": f"{size} bytes",
-                                "summary": summary
-                            })
-                        
-                        # Add insight about new files
-                        if len(uploaded_files) == 1:
-                            await append_insight.ainvoke({
-                                "experiment_id": experiment_id,
-                                "insight": f"Added {uploaded_files[0]['name']} to experiment",
-                                "source": "file_upload"
-                            })
-                        else:
-                            await append_insight.ainvoke({
-                                "experiment_id": experiment_id,
-                                "insight": f"Added {len(uploaded_files)} new files to experiment",
-                                "source": "file_upload"
-                            })
-                        
-                        logger.info(f"Updated README for {experiment_id} after file upload")
-                    except Exception as e:
-                        logger.error(f"Failed to update README for {experiment_id}: {e}")
-                
-                # Run the update in background (don't wait for it)
-                asyncio.create_task(update_readme_background())
-                
-        except Exception as e:
-            # Don't fail the upload if README update fails
-            logger.error(f"Error in README auto-update: {e}")
+
+        if not experiment_id:
+            logger.warning(f"Upload to non-experiment folder: {dest_dir.relative_to(project_root)}")
 
         return {
             "success": True,
@@ -469,6 +341,163 @@ async def upload_files(
         raise HTTPException(status_code=500, detail=f"Failed to upload files: {str(e)}")
 
 
+def get_upload_manager(project_root: str = Depends(get_project_root)) -> ChunkedUploadManager:
+    """Get the chunked upload manager for the session's project"""
+    chunk_size_mb = config.get("uploads.chunk_size_mb", 8)
+    return ChunkedUploadManager(
+        project_root,
+        default_chunk_size=int(chunk_size_mb * 1024 * 1024),
+        min_chunk_size=int(config.get("uploads.min_chunk_size_kb", 256) * 1024),
+        max_chunks=int(config.get("uploads.max_chunks", 10000))
+    )
+
+
+@router.post("/uploads")
+async def init_chunked_upload(
+    request: InitChunkedUploadRequest,
+    project_root: str = Depends(get_project_root),
+    manager: ChunkedUploadManager = Depends(get_upload_manager)
+) -> dict[str, Any]:
+    """Start a resumable upload; chunks are then sent with PUT"""
+    try:
+        # Validate destination early so clients don't upload gigabytes for nothing
+        validate_path(request.path, project_root)
+
+        max_size_mb = config.get("uploads.max_file_size_mb", 10240)
+        if request.total_size > max_size_mb * 1024 * 1024:
+            raise HTTPException(status_code=413, detail=f"File exceeds {max_size_mb} MB limit")
+
+        # Opportunistically drop abandoned uploads
+        manager.cleanup_stale(config.get("uploads.stale_after_hours", 24))
+
+        manifest = manager.create_upload(
+            filename=request.filename,
+            dest_path=request.path,
+            total_size=request.total_size,
+            chunk_size=request.chunk_size,
+            sha256=request.sha256
+        )
+        return {"success": True, **manifest}
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start upload: {str(e)}")
+
+
+@router.get("/uploads/{upload_id}")
+async def get_chunked_upload(
+    upload_id: str,
+    manager: ChunkedUploadManager = Depends(get_upload_manager)
+) -> dict[str, Any]:
+    """Get received and missing chunks so an interrupted upload can resume"""
+    try:
+        return manager.get_status(upload_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}")
+async def put_upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    manager: ChunkedUploadManager = Depends(get_upload_manager)
+) -> dict[str, Any]:
+    """Receive one chunk as the raw request body; chunks may arrive in parallel"""
+    try:
+        result = await manager.write_chunk(upload_id, index, request.stream())
+        return {"success": True, **result}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to store chunk: {str(e)}")
+
+
+@router.post("/uploads/{upload_id}/commit")
+async def commit_chunked_upload(
+    upload_id: str,
+    body: CommitChunkedUploadRequest,
+    request: Request,
+    project_root: str = Depends(get_project_root),
+    manager: ChunkedUploadManager = Depends(get_upload_manager)
+) -> dict[str, Any]:
+    """Assemble chunks, verify the checksum and queue the normal upload processing"""
+    try:
+        status = manager.get_status(upload_id)
+
+        dest_dir = validate_path(status["dest_path"], project_root)
+        if not dest_dir.exists():
+            dest_dir.mkdir(parents=True, exist_ok=True)
+        if not dest_dir.is_dir():
+            raise HTTPException(status_code=400, detail="Destination is not a directory")
+
+        conversion_pipeline = FileConversionPipeline(project_root)
+
+        filename = status["filename"]
+        experiment_id = detect_experiment_id(dest_dir, project_root)
+        file_path = upload_destination(dest_dir, filename, experiment_id, conversion_pipeline)
+
+        # Assembly and hashing of multi-GB files must not block the event loop
+        file_size, digest = await asyncio.to_thread(
+            manager.assemble, upload_id, file_path, body.sha256
+        )
+        manager.discard(upload_id)
+
+        job_id = None
+        if experiment_id:
+            job = enqueue_upload_processing(
+                file_path,
+                filename,
+                file_size,
+                experiment_id,
+                project_root,
+                request.headers.get("X-Session-ID")
+            )
+            job_id = job["id"]
+
+        enqueue_thumbnail(file_path, project_root, request.headers.get("X-Session-ID"))
+
+        return {
+            "success": True,
+            "name": filename,
+            "path": str(file_path.relative_to(project_root)),
+            "size": file_size,
+            "sha256": digest,
+            "converted": None,
+            "conversion_status": "queued" if job_id else "not_needed",
+            "job_id": job_id
+        }
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # Incomplete upload or checksum mismatch - chunks are kept so the client can retry
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to commit upload: {str(e)}")
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_chunked_upload(
+    upload_id: str,
+    manager: ChunkedUploadManager = Depends(get_upload_manager)
+) -> dict[str, Any]:
+    """Abort an upload and remove its staged chunks"""
+    try:
+        return {"success": manager.discard(upload_id)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/folder")
 async def create_folder(
     request: CreateFolderRequest,
@@ -655,6 +684,65 @@ async def download_file(
         raise HTTPException(status_code=500, detail=f"Failed to download file: {str(e)}")
 
 
+@router.get("/thumbnail/{file_path:path}")
+async def get_thumbnail(
+    file_path: str,
+    request: Request,
+    project_root: str = Depends(get_project_root)
+) -> Response:
+    """Serve a small JPEG preview of an image, rendering it on first request
+
+    Thumbnails are cached under .labacc/thumbs/ and revalidated with
+    ETag/Last-Modified, so listings only transfer changed previews.
+    """
+    try:
+        file = validate_path(file_path, project_root)
+
+        if not file.is_file():
+            raise HTTPException(status_code=404, detail="File not found")
+        if not is_thumbnailable(file.name):
+            raise HTTPException(status_code=400, detail="No thumbnail for this file type")
+
+        cache = get_thumbnail_cache(project_root)
+        etag = f'"{cache.key(file)}"'
+        last_modified = formatdate(file.stat().st_mtime, usegmt=True)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": "private, max-age=0, must-revalidate",
+        }
+
+        # The key changes with the image, so a matching ETag means the browser's copy is current
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+                return Response(status_code=304, headers=headers)
+        elif _not_modified_since(request.headers.get("if-modified-since"), file.stat().st_mtime):
+            return Response(status_code=304, headers=headers)
+
+        thumbnail = await cache.ensure(file)
+        return FileResponse(path=str(thumbnail), media_type="image/jpeg", headers=headers)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create thumbnail: {str(e)}")
+
+
+def _not_modified_since(if_modified_since: str | None, mtime: float) -> bool:
+    """Whether a file is unchanged since an If-Modified-Since date (whole seconds, as in HTTP dates)"""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        # Not a valid HTTP date; ignore rather than guess the zone
+        return False
+    return int(mtime) <= since.timestamp()
+
+
 @router.get("/metadata/{file_path:path}")
 async def get_file_metadata(
     file_path: str,
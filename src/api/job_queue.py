@@ -0,0 +1,353 @@
+"""Persistent background job queue for conversion and analysis work.
+
+Jobs are stored in a local SQLite database so they survive restarts. Worker
+coroutines run inside the API server's event loop, with a separate
+concurrency limit per job kind so a burst of uploads cannot overload the
+converter or the LLM provider. Failed jobs are retried with exponential
+backoff; higher priority jobs are picked first. Handlers with side effects
+record finished steps (``mark_step_done``) so a retry does not repeat them.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+JobListener = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Job statuses
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after REAL NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    session_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (kind, status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs (session_id, created_at);
+"""
+
+
+def completed_steps(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Steps earlier attempts of a job recorded with ``JobQueue.mark_step_done``, with their values."""
+    return (job.get("result") or {}).get("completed_steps", {})
+
+
+class JobQueue:
+    """SQLite-backed job queue with per-kind worker pools."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_attempts: int = 3,
+        backoff_seconds: float = 5.0,
+        poll_interval: float = 1.0
+    ):
+        """Initialize the job queue.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_attempts: Default number of attempts before a job fails
+            backoff_seconds: Base delay for exponential retry backoff
+            poll_interval: Max seconds an idle worker waits before re-checking
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_interval = poll_interval
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._concurrency: Dict[str, int] = {}
+        self._listeners: List[JobListener] = []
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # One connection shared across coroutines; statements are short
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+    def register(self, kind: str, handler: JobHandler, concurrency: int = 1):
+        """Register the coroutine that processes jobs of ``kind``.
+
+        Args:
+            kind: Job kind, e.g. "convert_upload"
+            handler: Async function receiving the job dict, returning an optional result dict
+            concurrency: Max number of jobs of this kind running at once
+        """
+        self._handlers[kind] = handler
+        self._concurrency[kind] = max(1, concurrency)
+
+    def add_listener(self, listener: JobListener):
+        """Register an async callback invoked whenever a job changes state."""
+        self._listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    # Job records
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"]) if job["payload"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(
+        self,
+        session_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List most recent jobs, optionally filtered by session and status."""
+        query = "SELECT * FROM jobs WHERE 1=1"
+        params: List[Any] = []
+        if session_id:
+            query += " AND session_id = ?"
+            params.append(session_id)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        session_id: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Add a job to the queue.
+
+        Args:
+            kind: Job kind, must have a registered handler to be processed
+            payload: JSON-serialisable job arguments
+            priority: Higher values run first
+            session_id: Session to push progress updates to
+            max_attempts: Override the default number of attempts
+
+        Returns:
+            The created job
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, priority, payload, max_attempts, run_after, "
+                "session_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, PENDING, priority, json.dumps(payload),
+                 max_attempts or self.max_attempts, now, session_id, now, now)
+            )
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+        logger.info(f"Enqueued {kind} job {job_id} (priority {priority})")
+        return self.get(job_id)
+
+    def mark_step_done(self, job: Dict[str, Any], step: str, value: Any = None):
+        """Record that a step of a running job is done, so a retry can skip it.
+
+        Completed steps are kept in the job's result until the job finishes;
+        ``value`` (JSON-serialisable) is handed back to the retry by ``completed_steps``.
+        """
+        steps = {**completed_steps(job), step: value}
+        job["result"] = {**(job.get("result") or {}), "completed_steps": steps}
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET result = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(job["result"]), time.time(), job["id"])
+            )
+
+    async def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        """Record progress (0-1) for a running job and notify listeners."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, updated_at = ? WHERE id = ?",
+                (progress, message, time.time(), job_id)
+            )
+        await self._notify(job_id)
+
+    # ------------------------------------------------------------------
+    # State transitions
+    # ------------------------------------------------------------------
+    def _claim(self, kind: str) -> Optional[Dict[str, Any]]:
+        """Atomically mark the next runnable job of ``kind`` as running."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND status = ? AND run_after <= ? "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (kind, PENDING, now)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, error = NULL, "
+                        "updated_at = ? WHERE id = ?",
+                        (RUNNING, now, row["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row else None
+
+    def _finish(self, job: Dict[str, Any], result: Optional[Dict[str, Any]]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, progress = 1, updated_at = ? WHERE id = ?",
+                (SUCCEEDED, json.dumps(result) if result is not None else None, time.time(), job["id"])
+            )
+
+    def _fail(self, job: Dict[str, Any], error: str):
+        """Schedule a retry with exponential backoff, or mark the job failed."""
+        now = time.time()
+        if job["attempts"] < job["max_attempts"]:
+            delay = self.backoff_seconds * (2 ** (job["attempts"] - 1))
+            status, run_after = PENDING, now + delay
+            logger.warning(f"Job {job['id']} ({job['kind']}) failed, retrying in {delay:.0f}s: {error}")
+        else:
+            status, run_after = FAILED, job["run_after"]
+            logger.error(f"Job {job['id']} ({job['kind']}) failed after {job['attempts']} attempts: {error}")
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ?, updated_at = ? WHERE id = ?",
+                (status, error, run_after, now, job["id"])
+            )
+
+    async def _notify(self, job_id: str):
+        if not self._listeners:
+            return
+        job = self.get(job_id)
+        if not job:
+            return
+        for listener in self._listeners:
+            try:
+                await listener(job)
+            except Exception as e:
+                logger.warning(f"Job listener failed for {job_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    async def run_job(self, job: Dict[str, Any]):
+        """Run a claimed job through its handler and record the outcome."""
+        await self._notify(job["id"])
+        try:
+            result = await self._handlers[job["kind"]](job)
+            self._finish(job, result)
+        except Exception as e:
+            self._fail(job, f"{type(e).__name__}: {e}")
+        await self._notify(job["id"])
+
+    async def _worker(self, kind: str):
+        while True:
+            try:
+                job = self._claim(kind)
+            except Exception as e:
+                logger.error(f"Failed to claim {kind} job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self.run_job(job)
+
+    async def start(self):
+        """Recover interrupted jobs and start worker coroutines."""
+        if self._workers:
+            return
+
+        # Jobs still marked running were interrupted by a restart
+        with self._lock:
+            recovered = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (PENDING, time.time(), RUNNING)
+            ).rowcount
+        if recovered:
+            logger.info(f"Re-queued {recovered} jobs interrupted by restart")
+
+        self._wakeup = asyncio.Event()
+        for kind, concurrency in self._concurrency.items():
+            for _ in range(concurrency):
+                self._workers.append(asyncio.create_task(self._worker(kind)))
+        logger.info(f"Job queue started with {len(self._workers)} workers: {self._concurrency}")
+
+    async def stop(self):
+        """Stop all workers; running jobs are re-queued on next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+# Global job queue instance (singleton pattern)
+_global_job_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get global job queue instance.
+
+    Returns:
+        JobQueue instance backed by the database configured in ``jobs.db_path``
+    """
+    global _global_job_queue
+    if _global_job_queue is None:
+        from src.config.config import config
+
+        db_path = config.get("jobs.db_path") or str(config.get_project_root() / ".labacc" / "jobs.db")
+        _global_job_queue = JobQueue(
+            db_path,
+            max_attempts=config.get("jobs.max_attempts", 3),
+            backoff_seconds=config.get("jobs.retry_backoff_seconds", 5)
+        )
+    return _global_job_queue
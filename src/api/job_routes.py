@@ -0,0 +1,43 @@
+"""Background job status API routes
+
+Uploads return before conversion and analysis finish; these endpoints let the
+frontend poll job state. Live progress is also pushed over the session
+WebSocket as ``job_update`` messages.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
+
+from src.api.job_queue import get_job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("")
+async def list_jobs(
+    request: Request,
+    status: str | None = None,
+    limit: int = 50
+) -> dict[str, Any]:
+    """List recent jobs for the requesting session"""
+    session_id = request.headers.get("X-Session-ID")
+    if not session_id:
+        raise HTTPException(status_code=401, detail="No session ID provided")
+
+    jobs = get_job_queue().list_jobs(session_id=session_id, status=status, limit=min(limit, 500))
+    return {"jobs": jobs, "count": len(jobs)}
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, request: Request) -> dict[str, Any]:
+    """Get status, progress and result of one of the requesting session's jobs"""
+    session_id = request.headers.get("X-Session-ID")
+    if not session_id:
+        raise HTTPException(status_code=401, detail="No session ID provided")
+
+    job = get_job_queue().get(job_id)
+    # Other sessions' jobs are reported as missing rather than forbidden
+    if not job or job.get("session_id") != session_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
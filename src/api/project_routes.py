@@ -328,12 +328,13 @@ async def import_existing_data(
         experiments_path = base_path / "experiments"
         experiments_path.mkdir(exist_ok=True)
         
-        # Initialize conversion pipeline
-        conversion_pipeline = FileConversionPipeline(str(base_path.parent))
+        # Root the pipeline at the project so registry paths and the doc index match uploads
+        conversion_pipeline = FileConversionPipeline(str(base_path))
         
         # Process uploaded files
         file_structure = {}
         files_to_convert = []  # Track files that need conversion
+        files_to_register = []  # Other files, recorded in the registry without conversion
         
         await notify_import_status(session_id, "uploading", 20, "Processing uploaded files...")
         
@@ -368,12 +369,15 @@ async def import_existing_data(
                             file_structure[exp_name]["files"].append(filename)
                             
                             # Check if needs conversion
+                            file_entry = {
+                                "path": file_path,
+                                "exp_name": exp_name,
+                                "filename": filename
+                            }
                             if conversion_pipeline.needs_conversion(filename):
-                                files_to_convert.append({
-                                    "path": file_path,
-                                    "exp_name": exp_name,
-                                    "filename": filename
-                                })
+                                files_to_convert.append(file_entry)
+                            else:
+                                files_to_register.append(file_entry)
             else:
                 # Regular file - put in imported_files folder
                 imported_path = experiments_path / "imported_files"
@@ -386,12 +390,15 @@ async def import_existing_data(
                 file_structure["imported_files"]["files"].append(file.filename)
                 
                 # Check if needs conversion
+                file_entry = {
+                    "path": file_path,
+                    "exp_name": "imported_files",
+                    "filename": file.filename
+                }
                 if conversion_pipeline.needs_conversion(file.filename):
-                    files_to_convert.append({
-                        "path": file_path,
-                        "exp_name": "imported_files",
-                        "filename": file.filename
-                    })
+                    files_to_convert.append(file_entry)
+                else:
+                    files_to_register.append(file_entry)
         
         # Convert PDF/DOCX/PPTX files to Markdown
         conversion_results = []
@@ -433,6 +440,16 @@ async def import_existing_data(
                 logger.error(f"Failed to convert {file_info['filename']}: {e}")
                 conversion_results.append(f"❌ {file_info['filename']} (error)")
         
+        # Record the remaining files through the same registry path as uploads
+        for file_info in files_to_register:
+            try:
+                await conversion_pipeline.process_upload(
+                    file_info['path'],
+                    str(base_path / "experiments" / file_info['exp_name'])
+                )
+            except Exception as e:
+                logger.error(f"Failed to register {file_info['filename']}: {e}")
+        
         # Use React agent to analyze and generate intelligent README
         await notify_import_status(session_id, "analyzing", 50, "AI agent analyzing project structure...")
         
@@ -652,32 +669,7 @@ Be specific and include actual values from the documents."""
         
         # Analysis is triggered below using React agent for deep content understanding
         
-        # Create file registry for tracking conversions
-        registry = {
-            "version": "3.0",
-            "project_id": project_id,
-            "created_at": datetime.now().isoformat(),
-            "files": {}
-        }
-        
-        for exp_name, exp_data in file_structure.items():
-            for filename in exp_data['files']:
-                registry["files"][filename] = {
-                    "experiment": exp_name,
-                    "upload_time": datetime.now().isoformat(),
-                    "needs_conversion": conversion_pipeline.needs_conversion(filename)
-                }
-            
-            # Add conversion info with correct markdown path
-            for conv in exp_data.get('converted', []):
-                if conv['original'] in registry["files"]:
-                    registry["files"][conv['original']]["conversion"] = {
-                        "status": "success",
-                        "markdown_path": conv['markdown'],  # Now contains the actual filename
-                        "timestamp": datetime.now().isoformat()
-                    }
-        
-        (base_path / ".labacc" / "file_registry.json").write_text(json.dumps(registry, indent=2))
+        # Files are tracked in each experiment's .labacc/file_registry.json by the conversion pipeline
         
         # Generate README for each experiment folder
         for exp_name in file_structure.keys():
@@ -0,0 +1,304 @@
+"""Background jobs run after a file upload.
+
+Uploads only write bytes to disk and enqueue a conversion job. Conversion
+then fans out into agent analysis, README/registry summary and (for large
+tables) columnar sidecar jobs, all processed by the persistent job queue.
+Uploaded images also get their file browser thumbnail rendered ahead of time.
+
+Jobs are retried on failure, so steps with side effects (chat messages,
+README updates) are recorded as they finish and skipped on a retry.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from src.api.job_queue import JobQueue, completed_steps, get_job_queue
+from src.config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Job kinds
+CONVERT_UPLOAD = "convert_upload"
+ANALYZE_UPLOAD = "analyze_upload"
+SUMMARIZE_UPLOAD = "summarize_upload"
+INGEST_TABLE = "ingest_table"
+GENERATE_THUMBNAIL = "generate_thumbnail"
+
+# Conversion unblocks everything else, so it runs first
+_PRIORITIES = {
+    CONVERT_UPLOAD: 10,
+    SUMMARIZE_UPLOAD: 5,
+    INGEST_TABLE: 3,
+    GENERATE_THUMBNAIL: 1,
+    ANALYZE_UPLOAD: 0,
+}
+
+
+def enqueue_upload_processing(
+    file_path: Path,
+    filename: str,
+    file_size: int,
+    experiment_id: str,
+    project_root: str,
+    session_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Queue conversion (and follow-up analysis) for a file saved to an experiment.
+
+    Returns:
+        The created conversion job
+    """
+    return get_job_queue().enqueue(
+        CONVERT_UPLOAD,
+        {
+            "file_path": str(file_path),
+            "filename": filename,
+            "file_size": file_size,
+            "experiment_id": experiment_id,
+            "project_root": project_root
+        },
+        priority=_PRIORITIES[CONVERT_UPLOAD],
+        session_id=session_id
+    )
+
+
+def enqueue_thumbnail(
+    file_path: Path,
+    project_root: str,
+    session_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Queue thumbnail rendering for an uploaded image (any folder).
+
+    Returns:
+        The created job, or None if the file is not an image
+    """
+    from src.components.thumbnails import is_thumbnailable
+
+    if not is_thumbnailable(str(file_path)):
+        return None
+    return get_job_queue().enqueue(
+        GENERATE_THUMBNAIL,
+        {"file_path": str(file_path), "project_root": project_root},
+        priority=_PRIORITIES[GENERATE_THUMBNAIL],
+        session_id=session_id
+    )
+
+
+async def _post_agent_message(session_id: str, content: str, author: str):
+    """Send a chat message to the session via the API server."""
+    async with aiohttp.ClientSession() as session:
+        url = "http://localhost:8002/api/agent-message"
+        data = {
+            "session_id": session_id,
+            "content": content,
+            "author": author
+        }
+        async with session.post(url, json=data) as resp:
+            if resp.status != 200:
+                logger.warning(f"Failed to send {author} message: {resp.status}")
+
+
+async def _run_step(job: Dict[str, Any], step: str, action: Callable[[], Awaitable[Any]]) -> Any:
+    """Run one step of a job once: a retry gets the value recorded by the earlier attempt."""
+    done = completed_steps(job)
+    if step in done:
+        logger.info(f"Job {job['id']}: skipping {step}, done by an earlier attempt")
+        return done[step]
+    value = await action()
+    get_job_queue().mark_step_done(job, step, value)
+    return value
+
+
+def _file_type(filename: str) -> str:
+    """Classify a file for the README file list."""
+    file_ext = Path(filename).suffix.lower()
+    if file_ext in ['.csv', '.tsv', '.txt']:
+        return "Data"
+    elif file_ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg']:
+        return "Image"
+    elif file_ext in ['.pdf', '.doc', '.docx', '.md']:
+        return "Document"
+    elif file_ext in ['.py', '.ipynb']:
+        return "Code"
+    elif file_ext in ['.json', '.yaml', '.yml']:
+        return "Config"
+    return "File"
+
+
+async def run_conversion_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an uploaded file, record it in the registry and queue follow-ups."""
+    from src.api.file_conversion import FileConversionPipeline
+    from src.api.file_routes import convert_and_register_upload
+    from src.components.table_sidecar import wants_sidecar
+
+    payload = job["payload"]
+    project_root = payload["project_root"]
+    queue = get_job_queue()
+
+    await queue.update_progress(job["id"], 0.1, f"Converting {payload['filename']}")
+
+    conversion_result = await convert_and_register_upload(
+        Path(payload["file_path"]),
+        payload["filename"],
+        payload["file_size"],
+        payload["experiment_id"],
+        project_root,
+        FileConversionPipeline(project_root)
+    )
+
+    file_info = {
+        "name": payload["filename"],
+        "path": str(Path(payload["file_path"]).relative_to(project_root)),
+        "size": payload["file_size"],
+        "converted": conversion_result.get("converted_path"),
+        "conversion_status": conversion_result.get("conversion_status", "not_needed"),
+        "experiment_id": payload["experiment_id"],
+        "project_root": project_root
+    }
+
+    # Each follow-up is enqueued once; a retried conversion reuses the recorded job id
+    async def enqueue_once(kind: str, args: Dict[str, Any]) -> str:
+        async def enqueue() -> str:
+            return queue.enqueue(kind, args, priority=_PRIORITIES[kind], session_id=job["session_id"])["id"]
+        return await _run_step(job, f"enqueued_{kind}", enqueue)
+
+    follow_ups = {}
+    follow_ups[SUMMARIZE_UPLOAD] = await enqueue_once(SUMMARIZE_UPLOAD, file_info)
+    
+    # Large tables get a columnar sidecar so later analyses skip parsing
+    if wants_sidecar(payload["file_path"]):
+        follow_ups[INGEST_TABLE] = await enqueue_once(INGEST_TABLE, {"file_path": payload["file_path"]})
+
+    # Proactive agent analysis needs a chat session to report to
+    if job["session_id"] and file_info["conversion_status"] in ["success", "not_needed"]:
+        follow_ups[ANALYZE_UPLOAD] = await enqueue_once(ANALYZE_UPLOAD, file_info)
+
+    return {**file_info, "follow_up_jobs": follow_ups}
+
+
+async def run_analysis_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Notify the chat about an upload and let the agent analyse it."""
+    from src.api.react_bridge import notify_agent_of_upload
+
+    file_data = job["payload"]
+    exp_id = file_data["experiment_id"]
+    sess_id = job["session_id"]
+
+    # First send a notification that file was uploaded
+    notification = f"📎 File uploaded: **{file_data['name']}**"
+    if file_data["conversion_status"] == "success":
+        notification += f"\n✅ Successfully converted to Markdown and saved to {exp_id}/{file_data['name'].rsplit('.', 1)[0]}.md"
+    else:
+        notification += f"\n📁 Saved to {exp_id}/originals/"
+    await _run_step(job, "notified", lambda: _post_agent_message(sess_id, notification, "System"))
+
+    # Now trigger actual agent analysis, using the converted file if available
+    async def analyze() -> str:
+        logger.info(f"Triggering agent analysis for {file_data['name']}")
+        return await notify_agent_of_upload(
+            session_id=sess_id,
+            file_path=file_data.get("converted") or file_data["path"],
+            experiment_id=exp_id,
+            original_name=file_data["name"],
+            conversion_status=file_data["conversion_status"]
+        )
+
+    analysis_response = await _run_step(job, "analysis", analyze)
+
+    # Send the analysis as a message to the chat
+    await _run_step(job, "analysis_sent", lambda: _post_agent_message(sess_id, analysis_response, "Assistant"))
+    logger.info(f"Analysis sent to chat for {file_data['name']}")
+    return {"analysis_length": len(analysis_response or "")}
+
+
+async def run_summary_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarise an upload with the LLM and record it in the experiment README."""
+    from src.memory.file_summarizer import summarize_uploaded_file
+    from src.memory.memory_tools import append_insight, update_file_registry
+
+    file_info = job["payload"]
+    experiment_id = file_info["experiment_id"]
+    filename = file_info["name"]
+    file_type = _file_type(filename)
+
+    # Use converted markdown for analysis when available
+    file_full_path = Path(file_info["project_root"]) / file_info["path"]
+    if file_info.get("converted"):
+        analysis_path = Path(file_info["project_root"]) / file_info["converted"]
+        if analysis_path.exists():
+            file_full_path = analysis_path
+            logger.info(f"Using converted file for analysis: {analysis_path}")
+
+    # Get intelligent summary with experiment context
+    async def summarize() -> str:
+        try:
+            summary = await summarize_uploaded_file(str(file_full_path), experiment_id)
+            logger.info(f"Generated LLM summary for {filename}: {summary[:50]}...")
+            return summary
+        except Exception as e:
+            logger.error(f"Failed to generate LLM summary: {e}")
+            # Fallback to simple summary
+            return f"Uploaded {file_type.lower()} file"
+
+    summary = await _run_step(job, "summary", summarize)
+
+    await _run_step(job, "registry_updated", lambda: update_file_registry.ainvoke({
+        "experiment_id": experiment_id,
+        "file_name": filename,
+        "file_type": file_type,
+        "file_size": f"{file_info['size']} bytes",
+        "summary": summary
+    }))
+    await _run_step(job, "insight_added", lambda: append_insight.ainvoke({
+        "experiment_id": experiment_id,
+        "updates": f"Added {filename} to experiment (source: file_upload)"
+    }))
+
+    logger.info(f"Updated README for {experiment_id} after file upload")
+    return {"summary": summary}
+
+
+async def run_table_ingest_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the columnar sidecar of an uploaded table."""
+    from src.components.table_sidecar import ensure_sidecar
+
+    manifest = await asyncio.to_thread(ensure_sidecar, job["payload"]["file_path"])
+    if manifest is None:
+        return {"sidecar": None}
+    return {
+        "sidecar": True,
+        "tables": [{"name": t["name"], "rows": t["rows"]} for t in manifest["tables"]],
+        "parse_seconds": manifest["parse_seconds"],
+    }
+
+
+async def run_thumbnail_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Render the file browser thumbnail of an uploaded image."""
+    from src.components.thumbnails import get_thumbnail_cache
+
+    payload = job["payload"]
+    source = Path(payload["file_path"])
+    if not source.exists():
+        # Deleted or moved before the job ran
+        return {"thumbnail": None}
+    cache = get_thumbnail_cache(payload["project_root"])
+    thumbnail = await cache.ensure(source)
+    # The cache works on the resolved root, which differs from the payload's if it has symlinks
+    return {"thumbnail": str(thumbnail.relative_to(cache.project_root))}
+
+
+def register_upload_jobs(queue: JobQueue):
+    """Register upload job handlers with per-kind concurrency from config."""
+    queue.register(CONVERT_UPLOAD, run_conversion_job,
+                   concurrency=config.get("jobs.concurrency.convert_upload", 2))
+    queue.register(ANALYZE_UPLOAD, run_analysis_job,
+                   concurrency=config.get("jobs.concurrency.analyze_upload", 1))
+    queue.register(SUMMARIZE_UPLOAD, run_summary_job,
+                   concurrency=config.get("jobs.concurrency.summarize_upload", 2))
+    queue.register(INGEST_TABLE, run_table_ingest_job,
+                   concurrency=config.get("jobs.concurrency.ingest_table", 1))
+    queue.register(GENERATE_THUMBNAIL, run_thumbnail_job,
+                   concurrency=config.get("jobs.concurrency.generate_thumbnail", 2))
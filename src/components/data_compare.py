@@ -0,0 +1,191 @@
+"""
+Compare tabular data files across experiments in one local computation.
+
+"Compare all PCR experiments" used to mean one ``analyze_data`` round-trip
+per file. ``compare_files`` instead:
+
+    1. finds the CSV/TSV/Excel files matching a pattern anywhere in the
+       project (``find_data_files``),
+    2. loads them concurrently, through their columnar sidecars when they
+       have one (``load_tables``),
+    3. aligns them on the numeric columns they share (or the requested
+       ones) and computes count, mean, std, min and max per file, plus each
+       file's mean delta from a baseline file - all vectorized with pandas,
+    4. renders one compact Markdown table for the LLM.
+"""
+
+import asyncio
+import fnmatch
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.components.table_sidecar import TABULAR_EXTENSIONS, read_table
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES = ["count", "mean", "std", "min", "max"]
+
+
+def find_data_files(project_root: str, pattern: str, max_files: int = 50) -> List[Path]:
+    """Tabular files under the project whose name or relative path matches a pattern.
+
+    Matching is case-insensitive; a pattern without wildcards matches any
+    path containing it (e.g. "pcr" or "*qpcr*.csv").
+    """
+    root = Path(project_root)
+    pattern = pattern.lower().strip() or "*"
+    has_wildcard = any(c in pattern for c in "*?[")
+
+    matches = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            path = Path(directory) / name
+            if path.suffix.lower() not in TABULAR_EXTENSIONS:
+                continue
+            rel = str(path.relative_to(root)).lower()
+            if has_wildcard:
+                matched = fnmatch.fnmatch(name.lower(), pattern) or fnmatch.fnmatch(rel, pattern)
+            else:
+                matched = pattern in rel
+            if matched:
+                matches.append(path)
+                if len(matches) >= max_files:
+                    return matches
+    return matches
+
+
+async def load_tables(paths: Sequence[Path], labels: Sequence[str], max_concurrent: int = 4) -> Dict:
+    """Load tables concurrently off the event loop.
+
+    Returns:
+        label -> DataFrame, or the exception raised while loading it
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def load(path: Path):
+        async with semaphore:
+            return await asyncio.to_thread(read_table, str(path))
+
+    results = await asyncio.gather(*(load(p) for p in paths), return_exceptions=True)
+    return dict(zip(labels, results))
+
+
+def compare_tables(tables: Dict[str, pd.DataFrame], columns: Optional[List[str]] = None,
+                   baseline: Optional[str] = None) -> Dict:
+    """Per-file aggregates and deltas over shared numeric columns.
+
+    Args:
+        tables: label -> DataFrame
+        columns: Columns to compare (default: numeric columns present in every table)
+        baseline: Label of the reference table for deltas (default: the first)
+
+    Returns:
+        ``columns``, ``baseline``, ``summary`` (DataFrame indexed by (file,
+        column) with the aggregates), ``delta`` and ``delta_pct`` (file x
+        column DataFrames of mean differences from the baseline) and
+        ``skipped`` (label -> reason)
+    """
+    skipped: Dict[str, str] = {}
+    numeric = {}
+    for label, frame in tables.items():
+        cols = frame.select_dtypes("number").columns
+        if len(cols) == 0:
+            skipped[label] = "no numeric columns"
+        else:
+            numeric[label] = frame
+
+    if columns:
+        shared = [c for c in columns if any(c in frame.columns for frame in numeric.values())]
+    else:
+        # Numeric in every table, in the first table's order
+        common = set.intersection(*(set(f.select_dtypes("number").columns) for f in numeric.values())) \
+            if numeric else set()
+        first = next(iter(numeric.values()), pd.DataFrame())
+        shared = [c for c in first.columns if c in common]
+
+    if not shared:
+        return {"columns": [], "baseline": None, "summary": pd.DataFrame(), "delta": pd.DataFrame(),
+                "delta_pct": pd.DataFrame(), "skipped": skipped}
+
+    # One aggregate pass per table; missing columns aggregate to NaN
+    summary = pd.concat(
+        {
+            label: frame.reindex(columns=shared).apply(pd.to_numeric, errors="coerce").agg(AGGREGATES).T
+            for label, frame in numeric.items()
+        },
+        names=["file", "column"],
+    )
+
+    means = summary["mean"].unstack("column")[shared]
+    baseline = baseline if baseline in means.index else means.index[0]
+    reference = means.loc[baseline]
+    delta = means - reference
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta_pct = delta / reference.abs().replace(0, np.nan) * 100
+
+    return {
+        "columns": shared,
+        "baseline": baseline,
+        "summary": summary,
+        "delta": delta,
+        "delta_pct": delta_pct,
+        "skipped": skipped,
+    }
+
+
+def _fmt(value: float) -> str:
+    return "–" if pd.isna(value) else f"{value:.4g}"
+
+
+def format_comparison(result: Dict, max_columns: int = 6) -> str:
+    """Render a comparison as one Markdown table: mean ± std (n) and Δ% per column."""
+    columns = result["columns"][:max_columns]
+    if not columns:
+        return "No shared numeric columns to compare."
+
+    summary = result["summary"]
+    header = ["file"] + [h for c in columns for h in (f"{c} mean ± std (n)", f"{c} Δ%")]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for label in result["delta"].index:
+        cells = [label + (" (baseline)" if label == result["baseline"] else "")]
+        for column in columns:
+            row = summary.loc[(label, column)]
+            cells.append(f"{_fmt(row['mean'])} ± {_fmt(row['std'])} ({int(row['count'])})")
+            pct = result["delta_pct"].loc[label, column]
+            cells.append("" if label == result["baseline"] else ("–" if pd.isna(pct) else f"{pct:+.1f}%"))
+        lines.append("| " + " | ".join(cells) + " |")
+
+    if len(result["columns"]) > max_columns:
+        lines.append(f"\n({len(result['columns']) - max_columns} more shared columns not shown: "
+                     f"{', '.join(result['columns'][max_columns:])})")
+    return "\n".join(lines)
+
+
+async def compare_files(project_root: str, pattern: str, columns: Optional[List[str]] = None,
+                        baseline: Optional[str] = None, max_files: int = 50,
+                        max_concurrent: int = 4) -> Dict:
+    """Find, load and compare the data files matching a pattern.
+
+    Returns:
+        ``compare_tables`` result plus ``files`` (labels compared) and
+        ``errors`` (label -> load error)
+    """
+    root = Path(project_root)
+    paths = await asyncio.to_thread(find_data_files, project_root, pattern, max_files)
+    labels = [str(p.relative_to(root)) for p in paths]
+    loaded = await load_tables(paths, labels, max_concurrent)
+
+    errors = {label: str(value) for label, value in loaded.items() if isinstance(value, BaseException)}
+    tables = {label: value for label, value in loaded.items() if not isinstance(value, BaseException)}
+    for label, error in errors.items():
+        logger.warning(f"Could not load {label} for comparison: {error}")
+
+    result = await asyncio.to_thread(compare_tables, tables, columns, baseline) if tables else \
+        compare_tables({}, columns, baseline)
+    return {**result, "files": labels, "errors": errors}
@@ -0,0 +1,275 @@
+"""
+Streaming statistics for delimited data files.
+
+``compute_csv_stats`` makes one chunked pass over a CSV/TSV file and
+computes, for every numeric column, the exact count, mean, variance, min
+and max (chunk moments merged with Chan's parallel update) plus
+approximate quantiles from a bounded uniform sample (bottom-k random
+keys). Memory is bounded by the chunk size and the sample size, not the
+file size.
+
+Results are cached by the file's SHA-256 in a store shared by all
+projects (``<projects.root_path>/.labacc/data_stats`` by default), so
+re-analyzing an unchanged or re-uploaded file is a single JSON read. When
+the file has a current columnar sidecar (see ``table_sidecar``), a cache
+miss scans the memory-mapped columns instead of parsing the text.
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STATS_VERSION = 1
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def detect_separator(file_path: str, sample_bytes: int = 64 * 1024) -> str:
+    """Guess the field separator from the extension or the first bytes of the file."""
+    if Path(file_path).suffix.lower() == ".tsv":
+        return "\t"
+    with open(file_path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        sample = f.read(sample_bytes)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",\t;").delimiter
+    except csv.Error:
+        return ","
+
+
+class _ColumnAccumulator:
+    """Running moments, extrema and quantile sample of one numeric column."""
+
+    def __init__(self, sample_size: int):
+        self.sample_size = sample_size
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sample_keys = np.empty(0)
+        self.sample_values = np.empty(0)
+
+    def update(self, values: np.ndarray, rng: np.random.Generator):
+        valid = values[~np.isnan(values)]
+        self.nulls += len(values) - len(valid)
+        n = len(valid)
+        if not n:
+            return
+
+        # Merge this chunk's moments into the running ones
+        chunk_mean = float(valid.mean())
+        chunk_m2 = float(((valid - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(valid.min()))
+        self.max = max(self.max, float(valid.max()))
+
+        # Keep the values with the smallest random keys: a uniform sample
+        keys = np.concatenate([self.sample_keys, rng.random(n)])
+        sample = np.concatenate([self.sample_values, valid])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, sample = keys[keep], sample[keep]
+        self.sample_keys, self.sample_values = keys, sample
+
+    def result(self) -> Dict:
+        if not self.count:
+            return {"count": 0, "nulls": self.nulls}
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        quantiles = np.quantile(self.sample_values, QUANTILES)
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "mean": self.mean,
+            "variance": variance,
+            "std": variance ** 0.5,
+            "min": self.min,
+            "max": self.max,
+            "quantiles": {f"p{round(q * 100)}": float(v) for q, v in zip(QUANTILES, quantiles)},
+            "quantiles_exact": self.count <= self.sample_size,
+        }
+
+
+def _accumulate(chunks: Iterable[pd.DataFrame], sample_size: int, seed: int) -> Dict:
+    """Statistics over a sequence of DataFrame chunks of one table."""
+    rng = np.random.default_rng(seed)
+    columns: List[str] = []
+    numeric: Dict[str, _ColumnAccumulator] = {}
+    rows = 0
+
+    for chunk in chunks:
+        if not columns:
+            columns = [str(c) for c in chunk.columns]
+            # Columns typed numeric in the first chunk are tracked for the whole file
+            numeric = {
+                str(c): _ColumnAccumulator(sample_size)
+                for c in chunk.columns
+                if pd.api.types.is_numeric_dtype(chunk[c]) and not pd.api.types.is_bool_dtype(chunk[c])
+            }
+        rows += len(chunk)
+        for column, accumulator in numeric.items():
+            # Unparseable values in later chunks count as nulls
+            values = pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=np.float64)
+            accumulator.update(values, rng)
+
+    return {
+        "version": STATS_VERSION,
+        "rows": rows,
+        "columns": columns,
+        "numeric": {column: accumulator.result() for column, accumulator in numeric.items()},
+    }
+
+
+def compute_csv_stats(file_path: str, chunk_rows: int = 200_000, sample_size: int = 20_000,
+                      seed: int = 0, sep: Optional[str] = None) -> Dict:
+    """Compute statistics for every column of a delimited file in one streaming pass.
+
+    Args:
+        file_path: CSV/TSV file
+        chunk_rows: Rows parsed per chunk
+        sample_size: Values kept per column for approximate quantiles
+        seed: Seed of the sampling keys, for reproducible quantiles
+        sep: Field separator (detected if not given)
+
+    Returns:
+        ``rows``, ``columns``, ``separator`` and per-column ``numeric`` statistics
+    """
+    sep = sep or detect_separator(file_path)
+    reader = pd.read_csv(file_path, sep=sep, chunksize=chunk_rows)
+    return {**_accumulate(reader, sample_size, seed), "separator": sep}
+
+
+def compute_frame_stats(frame: pd.DataFrame, chunk_rows: int = 200_000, sample_size: int = 20_000,
+                        seed: int = 0) -> Dict:
+    """Compute the same statistics for an in-memory or memory-mapped DataFrame, slice by slice."""
+    slices = (frame.iloc[start:start + chunk_rows] for start in range(0, max(len(frame), 1), chunk_rows))
+    return _accumulate(slices, sample_size, seed)
+
+
+def format_stats(stats: Dict, max_columns: int = 20) -> str:
+    """Render statistics as one line per numeric column."""
+    lines = []
+    for column, s in list(stats["numeric"].items())[:max_columns]:
+        if not s["count"]:
+            lines.append(f"{column}: no numeric values ({s['nulls']} empty)")
+            continue
+        q = s["quantiles"]
+        approx = "" if s["quantiles_exact"] else "~"
+        lines.append(
+            f"{column}: n={s['count']:,}, mean={s['mean']:.4g}, std={s['std']:.4g}, "
+            f"min={s['min']:.4g}, {approx}p5={q['p5']:.4g}, {approx}median={q['p50']:.4g}, "
+            f"{approx}p95={q['p95']:.4g}, max={s['max']:.4g}"
+            + (f", {s['nulls']:,} missing" if s["nulls"] else "")
+        )
+    if len(stats["numeric"]) > max_columns:
+        lines.append(f"... {len(stats['numeric']) - max_columns} more numeric columns")
+    return "\n".join(lines)
+
+
+class DataStatsCache:
+    """Statistics of data files keyed by content hash, shared across projects."""
+
+    def __init__(self, cache_dir: str, chunk_rows: int = 200_000, sample_size: int = 20_000):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding ``<sha256>.json`` entries
+            chunk_rows: Rows parsed per chunk when computing
+            sample_size: Values kept per column for approximate quantiles
+        """
+        self.cache_dir = Path(cache_dir)
+        self.chunk_rows = chunk_rows
+        self.sample_size = sample_size
+        # (path, size, mtime_ns) -> sha256, so unchanged files are not re-hashed
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def _file_hash(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        key = (str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            sha = self._hashes.get(key)
+        if sha is None:
+            # Imported here so worker processes using this module don't load the API package
+            from src.api.conversion_store import hash_file
+
+            sha = hash_file(Path(file_path))
+            with self._lock:
+                self._hashes[key] = sha
+        return sha
+
+    def get_stats(self, file_path: str) -> Dict:
+        """Get the statistics of a file, computing them on a cache miss.
+
+        Blocking - call via ``asyncio.to_thread`` from async code.
+
+        Returns:
+            Statistics as from ``compute_csv_stats``, plus ``sha256`` and ``cached``
+        """
+        sha = self._file_hash(file_path)
+        entry_path = self.cache_dir / f"{sha}.json"
+        if entry_path.exists():
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+                if stats.get("version") == STATS_VERSION and stats.get("sample_size") == self.sample_size:
+                    return {**stats, "cached": True}
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable stats cache entry {entry_path.name}: {e}")
+
+        from src.components.table_sidecar import TableSidecar
+
+        seed = int(sha[:8], 16)
+        sidecar = TableSidecar(file_path)
+        manifest = sidecar.manifest()
+        if manifest is not None:
+            # Columns are already parsed - scan the memory-mapped sidecar instead of the text
+            stats = compute_frame_stats(sidecar.load(manifest=manifest), chunk_rows=self.chunk_rows,
+                                        sample_size=self.sample_size, seed=seed)
+        else:
+            stats = compute_csv_stats(file_path, chunk_rows=self.chunk_rows, sample_size=self.sample_size,
+                                      seed=seed)
+        stats.update(sha256=sha, sample_size=self.sample_size)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            # Caching is an optimisation - never fail the analysis over it
+            logger.warning(f"Could not cache stats for {Path(file_path).name}: {e}")
+        return {**stats, "cached": False}
+
+
+# Global stats cache instance (singleton pattern)
+_global_stats_cache = None
+
+
+def get_data_stats_cache() -> DataStatsCache:
+    """Get the global data statistics cache, configured from ``analysis``."""
+    global _global_stats_cache
+    if _global_stats_cache is None:
+        from src.config.config import config
+
+        cache_path = config.get("analysis.stats_cache_path") or str(
+            config.get_project_root() / ".labacc" / "data_stats"
+        )
+        _global_stats_cache = DataStatsCache(
+            cache_path,
+            chunk_rows=int(config.get("analysis.chunk_rows", 200_000)),
+            sample_size=int(config.get("analysis.quantile_sample_size", 20_000)),
+        )
+    return _global_stats_cache
@@ -0,0 +1,191 @@
+"""
+Profiles of every sheet in an Excel workbook.
+
+Lab workbooks keep raw data, plate maps and analysis on separate sheets, so
+``profile_workbook`` profiles all of them: row and column counts, the
+inferred type and fill of each column, and full statistics for numeric
+columns (see ``data_stats``).
+
+Sheets are parsed concurrently in a process pool, since openpyxl parsing
+is CPU-bound and holds the GIL. The whole profile runs under a time
+budget: sheets not finished in time are reported as skipped rather than
+holding up the analysis. Sheets larger than ``max_rows`` are profiled from
+their first ``max_rows`` rows and flagged as truncated. Workbooks with a
+current columnar sidecar are profiled from it directly, in full.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.components.data_stats import compute_frame_stats, format_stats
+
+logger = logging.getLogger(__name__)
+
+SKIPPED_TIME_BUDGET = "time budget exceeded"
+
+
+def list_sheets(file_path: str) -> List[Dict]:
+    """Sheet names with the row and column counts declared by the workbook (None if unknown)."""
+    if file_path.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            return [
+                {"sheet": sheet.title, "declared_rows": sheet.max_row, "declared_columns": sheet.max_column}
+                for sheet in workbook.worksheets
+            ]
+        finally:
+            workbook.close()
+    with pd.ExcelFile(file_path) as workbook:
+        return [{"sheet": str(name), "declared_rows": None, "declared_columns": None}
+                for name in workbook.sheet_names]
+
+
+def profile_frame(frame: pd.DataFrame, sample_size: int = 20_000) -> Dict:
+    """Row count, per-column inferred type and fill, and numeric statistics of one table."""
+    columns = []
+    for name in frame.columns:
+        series = frame[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            inferred = pd.api.types.infer_dtype(series.cat.categories, skipna=True)
+        else:
+            inferred = pd.api.types.infer_dtype(series, skipna=True)
+        column = {"name": str(name), "dtype": inferred, "non_null": int(series.notna().sum())}
+        if inferred in ("string", "mixed", "categorical"):
+            column["unique"] = int(series.nunique())
+        columns.append(column)
+
+    stats = compute_frame_stats(frame, sample_size=sample_size)
+    return {"rows": len(frame), "columns": columns, "numeric": stats["numeric"]}
+
+
+def profile_sheet(file_path: str, sheet: str, max_rows: int, sample_size: int = 20_000) -> Dict:
+    """Parse and profile one sheet. Runs in a worker process."""
+    start = time.perf_counter()
+    # One extra row tells a sheet of exactly max_rows rows from a longer one
+    frame = pd.read_excel(file_path, sheet_name=sheet, nrows=max_rows + 1)
+    truncated = len(frame) > max_rows
+    profile = profile_frame(frame.iloc[:max_rows], sample_size)
+    profile.update(
+        sheet=sheet,
+        truncated=truncated,
+        seconds=round(time.perf_counter() - start, 3),
+    )
+    return profile
+
+
+def _profile_from_sidecar(file_path: str, manifest: Dict, sample_size: int) -> List[Dict]:
+    from src.components.table_sidecar import TableSidecar
+
+    sidecar = TableSidecar(file_path)
+    profiles = []
+    for table in manifest["tables"]:
+        start = time.perf_counter()
+        profile = profile_frame(sidecar.load(table["name"], manifest=manifest), sample_size)
+        profile.update(sheet=table["name"], truncated=False, seconds=round(time.perf_counter() - start, 3))
+        profiles.append(profile)
+    return profiles
+
+
+# Process pool shared by all workbook profiles (singleton pattern)
+_global_executor = None
+
+
+def get_profile_executor() -> ProcessPoolExecutor:
+    """Get the process pool used to parse sheets, sized from ``analysis.excel.max_workers``."""
+    global _global_executor
+    if _global_executor is None:
+        from src.config.config import config
+
+        # Spawned workers: forking a threaded server process is not safe
+        _global_executor = ProcessPoolExecutor(
+            max_workers=int(config.get("analysis.excel.max_workers", 4)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _global_executor
+
+
+async def profile_workbook(file_path: str, time_budget: float = 60.0, max_rows: int = 200_000,
+                           sample_size: int = 20_000,
+                           executor: Optional[ProcessPoolExecutor] = None) -> Dict:
+    """Profile every sheet of a workbook without blocking the event loop.
+
+    Args:
+        file_path: .xlsx or .xls workbook
+        time_budget: Seconds to wait for sheets; unfinished ones are skipped
+        max_rows: Rows parsed per sheet; larger sheets are truncated
+        sample_size: Values kept per column for approximate quantiles
+        executor: Process pool to parse sheets in (the shared pool by default)
+
+    Returns:
+        ``sheets``: one profile per sheet in workbook order, each with
+        ``sheet``, ``rows``, ``columns``, ``numeric``, ``truncated`` and
+        ``seconds``, or ``skipped`` with the reason; plus ``seconds`` for
+        the whole workbook
+    """
+    from src.components.table_sidecar import TableSidecar
+
+    start = time.perf_counter()
+    manifest = await asyncio.to_thread(TableSidecar(file_path).manifest)
+    if manifest is not None:
+        sheets = await asyncio.to_thread(_profile_from_sidecar, file_path, manifest, sample_size)
+        return {"sheets": sheets, "source": "sidecar", "seconds": round(time.perf_counter() - start, 3)}
+
+    declared = await asyncio.to_thread(list_sheets, file_path)
+    executor = executor or get_profile_executor()
+    loop = asyncio.get_running_loop()
+    futures = {
+        info["sheet"]: asyncio.ensure_future(
+            loop.run_in_executor(executor, profile_sheet, file_path, info["sheet"], max_rows, sample_size)
+        )
+        for info in declared
+    }
+    _, pending = await asyncio.wait(futures.values(), timeout=time_budget)
+    for future in pending:
+        # Queued sheets are dropped; a sheet already being parsed finishes in its worker
+        future.cancel()
+
+    sheets = []
+    for info in declared:
+        future = futures[info["sheet"]]
+        if future in pending:
+            sheets.append({**info, "skipped": SKIPPED_TIME_BUDGET})
+        elif future.exception() is not None:
+            sheets.append({**info, "skipped": f"could not parse: {future.exception()}"})
+        else:
+            sheets.append({**info, **future.result()})
+
+    if pending:
+        logger.warning(f"Profiled {len(declared) - len(pending)} of {len(declared)} sheets of "
+                       f"{file_path} within the {time_budget:.0f}s budget")
+    return {"sheets": sheets, "source": "workbook", "seconds": round(time.perf_counter() - start, 3)}
+
+
+def format_workbook_profile(profile: Dict, max_columns: int = 8) -> str:
+    """Render a workbook profile as a combined per-sheet summary."""
+    sheets = profile["sheets"]
+    lines = [f"Excel workbook with {len(sheets)} sheet{'s' if len(sheets) != 1 else ''}:"]
+    for sheet in sheets:
+        if "skipped" in sheet:
+            size = f" (~{sheet['declared_rows']:,} rows)" if sheet.get("declared_rows") else ""
+            lines.append(f"- Sheet '{sheet['sheet']}'{size}: skipped, {sheet['skipped']}")
+            continue
+
+        columns = sheet["columns"]
+        described = ", ".join(f"{c['name']} ({c['dtype']})" for c in columns[:max_columns])
+        if len(columns) > max_columns:
+            described += f", ... {len(columns) - max_columns} more"
+        rows = f"{sheet['rows']:,} rows"
+        if sheet["truncated"]:
+            rows = f"first {rows}" + (f" of ~{sheet['declared_rows']:,}" if sheet.get("declared_rows") else "")
+        lines.append(f"- Sheet '{sheet['sheet']}': {rows} x {len(columns)} columns: {described}")
+        if sheet["numeric"]:
+            lines.extend(f"    {line}" for line in format_stats(sheet, max_columns=max_columns).splitlines())
+    return "\n".join(lines)
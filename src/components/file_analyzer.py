@@ -1,13 +1,23 @@
 """Quick file analysis for LabAcc Copilot"""
 
+import asyncio
+import logging
 import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import AsyncIterator
 
-import pandas as pd
 from langchain_core.language_models import BaseLLM
 from langchain_core.messages import HumanMessage
 
+from src.components.data_stats import format_stats, get_data_stats_cache
+from src.components.excel_profile import format_workbook_profile, profile_workbook
+from src.components.table_sidecar import ensure_sidecar
+from src.config.config import config
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class FileAnalysis:
@@ -21,6 +31,7 @@ class FileAnalysis:
     image_metadata: dict | None  # For images
     analysis_confidence: float
     error_message: str | None = None
+    statistics: dict | None = None  # Full-file column statistics for CSV files
 
 
 class QuickFileAnalyzer:
@@ -84,27 +95,21 @@ class QuickFileAnalyzer:
     async def _analyze_csv(self, file_path: str, file_name: str, size_bytes: int) -> FileAnalysis:
         """Analyze CSV/TSV data files"""
         try:
-            # Read with pandas, limit to first 1000 rows for quick analysis
-            df = pd.read_csv(file_path, nrows=1000)
+            # One streaming pass over the whole file, cached by content hash
+            stats = await asyncio.to_thread(get_data_stats_cache().get_stats, file_path)
 
-            rows, cols = df.shape
+            rows, cols = stats["rows"], len(stats["columns"])
             data_points = rows * cols
 
             # Generate summary
             summary_parts = [
-                f"CSV file with {rows} rows and {cols} columns",
-                f"Columns: {', '.join(df.columns.tolist()[:5])}" + ("..." if len(df.columns) > 5 else "")
+                f"CSV file with {rows:,} rows and {cols} columns",
+                f"Columns: {', '.join(stats['columns'][:5])}" + ("..." if cols > 5 else "")
             ]
 
-            # Check for numeric data
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-            if numeric_cols:
-                summary_parts.append(f"Numeric columns: {', '.join(numeric_cols[:3])}" + ("..." if len(numeric_cols) > 3 else ""))
-
-                # Basic statistics for first numeric column
-                first_numeric = numeric_cols[0]
-                stats = df[first_numeric].describe()
-                summary_parts.append(f"{first_numeric}: mean={stats['mean']:.2f}, range={stats['min']:.2f}-{stats['max']:.2f}")
+            # Statistics for every numeric column, computed over all rows
+            if stats["numeric"]:
+                summary_parts.append(f"Numeric column statistics:\n{format_stats(stats)}")
 
             content_summary = ". ".join(summary_parts)
 
@@ -116,7 +121,8 @@ class QuickFileAnalyzer:
                 content_summary=content_summary,
                 data_points=data_points,
                 image_metadata=None,
-                analysis_confidence=0.9
+                analysis_confidence=0.9,
+                statistics=stats
             )
 
         except Exception as e:
@@ -135,25 +141,33 @@ class QuickFileAnalyzer:
     async def _analyze_excel(self, file_path: str, file_name: str, size_bytes: int) -> FileAnalysis:
         """Analyze Excel files"""
         try:
-            # Read first sheet with pandas
-            df = pd.read_excel(file_path, nrows=1000)
-
-            rows, cols = df.shape
-            data_points = rows * cols
-
-            summary = f"Excel file with {rows} rows and {cols} columns. Columns: {', '.join(df.columns.tolist()[:5])}"
-            if len(df.columns) > 5:
-                summary += "..."
+            # Large workbooks get their sidecar on first access, like read_table;
+            # the profile below then reads it instead of parsing the sheets
+            try:
+                await asyncio.to_thread(ensure_sidecar, file_path)
+            except Exception as e:
+                logger.warning(f"Could not build sidecar for {file_name}, parsing sheets directly: {e}")
+
+            # Every sheet, parsed concurrently in worker processes under a time budget
+            profile = await profile_workbook(
+                file_path,
+                time_budget=float(config.get("analysis.excel.time_budget_seconds", 60)),
+                max_rows=int(config.get("analysis.excel.max_rows_per_sheet", 200_000)),
+            )
+            profiled = [sheet for sheet in profile["sheets"] if "skipped" not in sheet]
+            data_points = sum(sheet["rows"] * len(sheet["columns"]) for sheet in profiled)
+            complete = len(profiled) == len(profile["sheets"]) and not any(s["truncated"] for s in profiled)
 
             return FileAnalysis(
                 file_path=file_path,
                 file_name=file_name,
                 file_type="excel",
                 size_bytes=size_bytes,
-                content_summary=summary,
+                content_summary=format_workbook_profile(profile),
                 data_points=data_points,
                 image_metadata=None,
-                analysis_confidence=0.8
+                analysis_confidence=0.8 if complete else 0.6,
+                statistics=profile
             )
 
         except Exception as e:
@@ -241,17 +255,34 @@ class QuickFileAnalyzer:
             logger.debug(f"Image content analysis failed: {e}")
             return ""
 
-    async def _analyze_text(self, file_path: str, file_name: str, size_bytes: int) -> FileAnalysis:
-        """Analyze text files"""
-        try:
-            with open(file_path, encoding='utf-8') as f:
-                content = f.read(1000)  # First 1000 characters
+    def _read_text_preview(self, file_path: str) -> str:
+        """First 1000 characters of a text file"""
+        with open(file_path, encoding='utf-8') as f:
+            return f.read(1000)
 
-            lines = content.count('\n') + 1
-            words = len(content.split())
+    def _text_analysis(self, file_path: str, preview: str, size_bytes: int,
+                       content_summary: str | None, confidence: float = 0.8) -> FileAnalysis:
+        """Text file analysis from its preview, with a basic summary if the LLM gave none"""
+        lines = preview.count('\n') + 1
+        words = len(preview.split())
+        if not content_summary:
+            content_summary = f"Text file with {lines} lines and {words} words"
+            confidence = 0.5
+
+        return FileAnalysis(
+            file_path=file_path,
+            file_name=os.path.basename(file_path),
+            file_type="text",
+            size_bytes=size_bytes,
+            content_summary=content_summary,
+            data_points=words,
+            image_metadata=None,
+            analysis_confidence=confidence
+        )
 
-            # Use LLM for content summary
-            summary_prompt = f"""Briefly analyze this text file content (first 1000 characters):
+    async def _summarize_text(self, file_name: str, content: str) -> str | None:
+        """One-file LLM summary of a text preview (None if the LLM fails)"""
+        summary_prompt = f"""Briefly analyze this text file content (first 1000 characters):
 
 Filename: {file_name}
 Content preview:
@@ -259,37 +290,98 @@ Content preview:
 
 Provide a 1-2 sentence summary of what this file contains."""
 
-            try:
-                response = await self.llm.ainvoke([HumanMessage(content=summary_prompt)])
-                content_summary = response.content.strip()
-                confidence = 0.8
-            except:
-                content_summary = f"Text file with {lines} lines and {words} words"
-                confidence = 0.5
+        try:
+            response = await self.llm.ainvoke([HumanMessage(content=summary_prompt)])
+            return response.content.strip()
+        except Exception:
+            return None
 
-            return FileAnalysis(
-                file_path=file_path,
-                file_name=file_name,
-                file_type="text",
-                size_bytes=size_bytes,
-                content_summary=content_summary,
-                data_points=words,
-                image_metadata=None,
-                analysis_confidence=confidence
-            )
+    async def _analyze_text(self, file_path: str, file_name: str, size_bytes: int) -> FileAnalysis:
+        """Analyze text files"""
+        try:
+            content = await asyncio.to_thread(self._read_text_preview, file_path)
+            summary = await self._summarize_text(file_name, content)
+            return self._text_analysis(file_path, content, size_bytes, summary)
 
         except Exception as e:
-            return FileAnalysis(
-                file_path=file_path,
-                file_name=file_name,
-                file_type="text",
-                size_bytes=size_bytes,
-                content_summary=f"Text file (unable to read: {str(e)})",
-                data_points=None,
-                image_metadata=None,
-                analysis_confidence=0.1,
-                error_message=str(e)
-            )
+            return self._text_error(file_path, size_bytes, e)
+
+    def _text_error(self, file_path: str, size_bytes: int, error: Exception) -> FileAnalysis:
+        """Analysis of a text file that could not be read"""
+        return FileAnalysis(
+            file_path=file_path,
+            file_name=os.path.basename(file_path),
+            file_type="text",
+            size_bytes=size_bytes,
+            content_summary=f"Text file (unable to read: {str(error)})",
+            data_points=None,
+            image_metadata=None,
+            analysis_confidence=0.1,
+            error_message=str(error)
+        )
+
+    async def _summarize_text_batch(self, previews: list[tuple[str, str]]) -> dict[int, str]:
+        """Summarize several text previews in one LLM request.
+
+        Args:
+            previews: (file name, preview) pairs
+
+        Returns:
+            Index into ``previews`` -> summary, for the files the reply covered
+        """
+        sections = "\n\n".join(
+            f"[{i}] Filename: {name}\nContent preview:\n{content}"
+            for i, (name, content) in enumerate(previews, 1)
+        )
+        prompt = f"""Briefly analyze these {len(previews)} text files (first 1000 characters of each):
+
+{sections}
+
+For each file, provide a 1-2 sentence summary of what it contains.
+Answer with exactly one line per file, in the form "[number] summary"."""
+
+        try:
+            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        except Exception as e:
+            logger.debug(f"Batched text summary failed: {e}")
+            return {}
+
+        summaries = {}
+        for match in re.finditer(r"^\s*\[?(\d+)[\]:.)]\s*(.+)$", response.content, re.MULTILINE):
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(previews):
+                summaries[index] = match.group(2).strip()
+        return summaries
+
+    async def _analyze_text_batch(self, file_paths: list[str], llm_semaphore: asyncio.Semaphore) -> list[FileAnalysis]:
+        """Analyze several text files with one LLM request, falling back per file"""
+        sizes = [os.path.getsize(p) if os.path.exists(p) else 0 for p in file_paths]
+        previews = await asyncio.gather(
+            *(asyncio.to_thread(self._read_text_preview, p) for p in file_paths), return_exceptions=True
+        )
+        readable = [i for i, preview in enumerate(previews) if not isinstance(preview, BaseException)]
+
+        async with llm_semaphore:
+            if len(readable) > 1:
+                batch = await self._summarize_text_batch(
+                    [(os.path.basename(file_paths[i]), previews[i]) for i in readable]
+                )
+                summaries = {readable[j]: summary for j, summary in batch.items()}
+            else:
+                summaries = {}
+
+        async def summarize_alone(i: int):
+            async with llm_semaphore:
+                summaries[i] = await self._summarize_text(os.path.basename(file_paths[i]), previews[i])
+
+        # Files the batched reply missed get their own request
+        await asyncio.gather(*(summarize_alone(i) for i in readable if i not in summaries))
+
+        return [
+            self._text_error(path, size, previews[i]) if i not in readable
+            else self._text_analysis(path, previews[i], size, summaries.get(i))
+            for i, (path, size) in enumerate(zip(file_paths, sizes))
+        ]
 
     async def _analyze_generic(self, file_path: str, file_name: str, file_type: str, size_bytes: int) -> FileAnalysis:
         """Analyze unknown file types"""
@@ -312,13 +404,63 @@ Provide a 1-2 sentence summary of what this file contains."""
             size_bytes /= 1024
         return f"{size_bytes:.1f}TB"
 
+    async def iter_analyses(self, file_paths: list[str], max_concurrent: int | None = None,
+                            llm_concurrency: int | None = None,
+                            text_batch_size: int | None = None) -> AsyncIterator[FileAnalysis]:
+        """Analyze files concurrently, yielding each analysis as soon as it completes.
+
+        Data files are profiled in parallel (CSV statistics in threads, workbook
+        sheets in the process pool); at most ``llm_concurrency`` LLM requests
+        run at once, and text files are summarized ``text_batch_size`` per
+        request.
+
+        Args:
+            file_paths: Files to analyze
+            max_concurrent: Files analyzed at once (``analysis.batch.max_concurrent``)
+            llm_concurrency: Concurrent LLM requests (``analysis.batch.llm_concurrency``)
+            text_batch_size: Text previews per LLM request (``analysis.batch.text_batch_size``)
+        """
+        max_concurrent = max_concurrent or int(config.get("analysis.batch.max_concurrent", 4))
+        llm_concurrency = llm_concurrency or int(config.get("analysis.batch.llm_concurrency", 2))
+        text_batch_size = text_batch_size or int(config.get("analysis.batch.text_batch_size", 8))
+
+        file_semaphore = asyncio.Semaphore(max_concurrent)
+        llm_semaphore = asyncio.Semaphore(llm_concurrency)
+
+        async def analyze_one(file_path: str) -> list[FileAnalysis]:
+            async with file_semaphore:
+                if self.detect_file_type(file_path) == "image":
+                    # Vision requests count against the LLM limit too
+                    async with llm_semaphore:
+                        return [await self.analyze_file(file_path)]
+                return [await self.analyze_file(file_path)]
+
+        async def analyze_texts(batch: list[str]) -> list[FileAnalysis]:
+            async with file_semaphore:
+                return await self._analyze_text_batch(batch, llm_semaphore)
+
+        text_paths = [p for p in file_paths if self.detect_file_type(p) == "text"]
+        tasks = [
+            asyncio.ensure_future(analyze_texts(text_paths[i:i + text_batch_size]))
+            for i in range(0, len(text_paths), text_batch_size)
+        ]
+        tasks += [asyncio.ensure_future(analyze_one(p)) for p in file_paths if self.detect_file_type(p) != "text"]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for analysis in await next_done:
+                    yield analysis
+        finally:
+            # Consumer stopped early: don't leave analyses running
+            for task in tasks:
+                task.cancel()
+
     async def analyze_multiple_files(self, file_paths: list[str]) -> list[FileAnalysis]:
-        """Analyze multiple files and return results"""
-        analyses = []
-        for file_path in file_paths:
-            analysis = await self.analyze_file(file_path)
-            analyses.append(analysis)
-        return analyses
+        """Analyze multiple files concurrently and return results in input order"""
+        by_path = {}
+        async for analysis in self.iter_analyses(file_paths):
+            by_path[analysis.file_path] = analysis
+        return [by_path[file_path] for file_path in file_paths]
 
     def generate_summary_report(self, analyses: list[FileAnalysis]) -> str:
         """Generate summary report for multiple file analyses"""
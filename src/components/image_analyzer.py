@@ -3,19 +3,34 @@ Image Analysis Module for LabAcc Copilot
 
 Provides image understanding capabilities using vision LLMs (GLM-4.5V).
 Can be used both as an internal function and as a React agent tool.
+
+Images are downscaled and re-encoded before upload (see
+``image_preprocess``). One analyzer (and vision client) is kept per model for the whole process
+(``get_image_analyzer``). Successful analyses are cached on disk keyed by
+the image content, the prompt and the model (``ImageResultCache``), so
+analyzing the same image again skips the vision call entirely.
 """
 
+import asyncio
 import base64
+import hashlib
+import json
 import logging
+import math
+import os
+import re
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from PIL import Image
-import io
 
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 
+from src.components.image_preprocess import prepare_image, preprocess_settings
+
 logger = logging.getLogger(__name__)
 
 # Supported image formats
@@ -35,14 +50,83 @@ class ImageAnalysisResult:
     key_features: list[str]
     suggested_tags: list[str]
     error_message: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = None  # Upload size and timings of the vision call
+
+
+# Map PIL formats to MIME types that Doubao supports
+MIME_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'jpg': 'image/jpeg',
+    'webp': 'image/webp',
+    'bmp': 'image/bmp',
+    'tiff': 'image/tiff',
+    'tif': 'image/tiff'
+}
+
+CACHE_VERSION = 1
+ANALYSIS_FIELDS = ("content_description", "experimental_context", "key_features", "suggested_tags")
+
+
+class ImageResultCache:
+    """Successful image analyses keyed by image content, prompt and model"""
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding ``<key>.json`` entries
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(image_sha256: str, prompt: str, model_name: str, variant: str = "") -> str:
+        """Entry key; ``variant`` covers anything else that changes what the model sees"""
+        text = f"{CACHE_VERSION}\n{image_sha256}\n{model_name}\n{variant}\n{prompt}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached analysis fields, or None on a miss"""
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable image analysis cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, fields: Dict[str, Any]):
+        """Store analysis fields; failures are logged, never raised"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self.cache_dir / f"{key}.json"
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({**fields, "cached_at": time.time()}, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            # Caching is an optimisation - never fail the analysis over it
+            logger.warning(f"Could not cache image analysis {key}: {e}")
 
 
 class ImageAnalyzer:
     """Analyzes images using vision LLM"""
     
-    def __init__(self, vision_model_name: str = "doubao-seed-1-6-thinking"):
-        """Initialize with vision model configuration"""
+    def __init__(self, vision_model_name: str = "doubao-seed-1-6-thinking",
+                 cache: Optional[ImageResultCache] = None,
+                 preprocess: Optional[Dict[str, Any]] = None):
+        """Initialize with vision model configuration
+        
+        Args:
+            vision_model_name: Model name from llm_config.json
+            cache: Optional on-disk result cache
+            preprocess: ``prepare_image`` options (default: ``analysis.image`` config)
+        """
         self.model_name = vision_model_name
+        self.cache = cache
+        self.preprocess = preprocess if preprocess is not None else preprocess_settings()
+        self.max_images_per_request = 1
         self._init_vision_llm()
     
     def _init_vision_llm(self):
@@ -76,6 +160,9 @@ class ImageAnalyzer:
                 max_retries=1  # Only retry once on failure
             )
             
+            # Models that accept several images in one message get batched requests
+            self.max_images_per_request = int(model_config.get("max_images_per_request", 1))
+            
             logger.info(f"Initialized vision LLM: {self.model_name}")
             
         except Exception as e:
@@ -105,6 +192,138 @@ class ImageAnalyzer:
             logger.error(f"Failed to get image metadata: {e}")
             return {}
     
+    @staticmethod
+    def _describe(image_path: str, sha256: str) -> Dict[str, Any]:
+        """Content hash, metadata and MIME type of an image file"""
+        try:
+            with Image.open(image_path) as img:
+                metadata = {"size": img.size, "format": img.format, "mode": img.mode}
+        except Exception as e:
+            logger.error(f"Failed to get image metadata: {e}")
+            metadata = {}
+        
+        actual_format = (metadata.get("format") or "").lower()
+        if actual_format not in MIME_TYPES:
+            logger.warning(f"Could not map image format {actual_format or 'unknown'!r}, using jpeg")
+        return {"sha256": sha256, "metadata": metadata, "mime_type": MIME_TYPES.get(actual_format, 'image/jpeg')}
+    
+    def load_image(self, image_path: str) -> Dict[str, Any]:
+        """Read an image once: its bytes, content hash, metadata and MIME type.
+        
+        Blocking - call via ``asyncio.to_thread``.
+        """
+        data = Path(image_path).read_bytes()
+        return {"bytes": data, **self._describe(image_path, hashlib.sha256(data).hexdigest())}
+    
+    def identify_image(self, image_path: str) -> Dict[str, Any]:
+        """Like ``load_image`` without keeping the bytes: the hash is computed while streaming the file.
+        
+        Blocking - call via ``asyncio.to_thread``.
+        """
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return self._describe(image_path, digest.hexdigest())
+    
+    def build_prompt(self, image_name: str, context: Optional[str] = None,
+                     experiment_id: Optional[str] = None) -> str:
+        """Analysis prompt for one image"""
+        return f"""Analyze this laboratory/experimental image and provide detailed insights.
+
+Image: {image_name}
+{f'Experiment Context: {context}' if context else ''}
+{f'Experiment ID: {experiment_id}' if experiment_id else ''}
+
+Please analyze the image and provide:
+
+1. **Content Description**: What is shown in the image? Be specific about what you see.
+
+2. **Experimental Context**: How does this relate to laboratory work or experiments? What type of data or results might this represent?
+
+3. **Key Features**: List 3-5 important features or observations from the image:
+   - Feature 1
+   - Feature 2
+   - etc.
+
+4. **Suggested Tags**: Provide 3-5 relevant tags for categorizing this image:
+   - Tag 1
+   - Tag 2
+   - etc.
+
+Focus on scientific/experimental relevance. Be factual and specific."""
+    
+    @staticmethod
+    def parse_analysis(analysis_text: str) -> Dict[str, Any]:
+        """Split a vision model reply into description, context, features and tags"""
+        content_description = ""
+        experimental_context = ""
+        key_features = []
+        suggested_tags = []
+        
+        # Simple parsing (could be improved with structured output)
+        current_section = None
+        for line in analysis_text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+                
+            if "Content Description" in line:
+                current_section = "description"
+            elif "Experimental Context" in line:
+                current_section = "context"
+            elif "Key Features" in line:
+                current_section = "features"
+            elif "Suggested Tags" in line:
+                current_section = "tags"
+            elif current_section == "description" and not line.startswith("*"):
+                content_description += line + " "
+            elif current_section == "context" and not line.startswith("*"):
+                experimental_context += line + " "
+            elif current_section == "features" and line.startswith("-"):
+                key_features.append(line[1:].strip())
+            elif current_section == "tags" and line.startswith("-"):
+                suggested_tags.append(line[1:].strip())
+        
+        # Fallback if parsing didn't work well
+        content_description = content_description.strip() or analysis_text[:500]
+        return {
+            "content_description": content_description,
+            "experimental_context": experimental_context.strip(),
+            "key_features": key_features[:5],  # Limit to 5
+            "suggested_tags": suggested_tags[:5]  # Limit to 5
+        }
+    
+    def _cache_key(self, image: Dict[str, Any], image_name: str, context: Optional[str],
+                   experiment_id: Optional[str], batch: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key of the analysis of a loaded image, alone or in a batch with ``batch`` overrides"""
+        prompt = self.build_prompt(image_name, context, experiment_id)
+        variant = {**self.preprocess, **batch, "batched": True} if batch else self.preprocess
+        return ImageResultCache.make_key(image["sha256"], prompt, self.model_name,
+                                         json.dumps(variant, sort_keys=True))
+    
+    def _batch_overrides(self, max_edge: int) -> Dict[str, Any]:
+        """Preprocessing of images sharing a request: smaller, with a share of the payload budget"""
+        budget = max(self.preprocess.get("max_bytes", 4 * 1024 * 1024) // self.max_images_per_request, 256 * 1024)
+        return {"max_edge": min(max_edge, self.preprocess.get("max_edge", max_edge)), "max_bytes": budget}
+    
+    async def _cached_fields(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        return {field: cached[field] for field in ANALYSIS_FIELDS} if cached is not None else None
+    
+    async def _prepare(self, image: Dict[str, Any], name: str, **overrides) -> Dict[str, Any]:
+        """Downscale and re-encode off the event loop; fall back to the original file"""
+        try:
+            return await asyncio.to_thread(prepare_image, image["bytes"], **{**self.preprocess, **overrides})
+        except Exception as e:
+            logger.warning(f"Could not preprocess {name}, sending it as is: {e}")
+            size = image["metadata"].get("size", (0, 0))
+            return {"bytes": image["bytes"], "mime_type": image["mime_type"],
+                    "width": size[0], "height": size[1], "original_bytes": len(image["bytes"]),
+                    "frames": 1, "reencoded": False, "seconds": 0.0}
+    
     async def analyze_image(
         self, 
         image_path: str,
@@ -153,8 +372,33 @@ class ImageAnalyzer:
                 error_message=f"Unsupported image format: {image_path.suffix}"
             )
         
-        # Get metadata
-        metadata = self.get_image_metadata(str(image_path))
+        try:
+            image = await asyncio.to_thread(self.load_image, str(image_path))
+        except Exception as e:
+            logger.error(f"Failed to read image {image_path}: {e}")
+            return ImageAnalysisResult(
+                success=False,
+                file_path=str(image_path),
+                file_name=image_path.name,
+                image_size=(0, 0),
+                format="unknown",
+                content_description="",
+                experimental_context="",
+                key_features=[],
+                suggested_tags=[],
+                error_message=str(e)
+            )
+        metadata = image["metadata"]
+        
+        def result_from(fields: Dict[str, Any]) -> ImageAnalysisResult:
+            return _analysis_result(image_path, metadata, fields)
+        
+        prompt = self.build_prompt(image_path.name, context, experiment_id)
+        cache_key = self._cache_key(image, image_path.name, context, experiment_id)
+        cached = await self._cached_fields(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached analysis of {image_path.name}")
+            return result_from(cached)
         
         # Check if vision LLM is available
         if not self.vision_llm:
@@ -173,57 +417,18 @@ class ImageAnalyzer:
             )
         
         try:
-            # Encode image
-            base64_image = self.encode_image_to_base64(str(image_path))
-            
-            # Build prompt
-            prompt = f"""Analyze this laboratory/experimental image and provide detailed insights.
-
-Image: {image_path.name}
-{f'Experiment Context: {context}' if context else ''}
-{f'Experiment ID: {experiment_id}' if experiment_id else ''}
-
-Please analyze the image and provide:
-
-1. **Content Description**: What is shown in the image? Be specific about what you see.
-
-2. **Experimental Context**: How does this relate to laboratory work or experiments? What type of data or results might this represent?
-
-3. **Key Features**: List 3-5 important features or observations from the image:
-   - Feature 1
-   - Feature 2
-   - etc.
-
-4. **Suggested Tags**: Provide 3-5 relevant tags for categorizing this image:
-   - Tag 1
-   - Tag 2
-   - etc.
-
-Focus on scientific/experimental relevance. Be factual and specific."""
-            
-            # Get correct MIME type based on actual image format
-            try:
-                from PIL import Image
-                with Image.open(image_path) as img:
-                    actual_format = img.format.lower()
-                
-                # Map PIL formats to MIME types that Doubao supports
-                format_mapping = {
-                    'png': 'image/png',
-                    'jpeg': 'image/jpeg', 
-                    'jpg': 'image/jpeg',
-                    'webp': 'image/webp',
-                    'bmp': 'image/bmp',
-                    'tiff': 'image/tiff',
-                    'tif': 'image/tiff'
-                }
-                
-                mime_type = format_mapping.get(actual_format, 'image/jpeg')
-                logger.info(f"Using MIME type: {mime_type} for format: {actual_format}")
-                
-            except Exception as e:
-                logger.warning(f"Could not detect image format, using jpeg: {e}")
-                mime_type = 'image/jpeg'
+            prepared = await self._prepare(image, image_path.name)
+            base64_image = base64.b64encode(prepared["bytes"]).decode('utf-8')
+            mime_type = prepared["mime_type"]
+            payload = {
+                "original_bytes": prepared["original_bytes"],
+                "original_base64_bytes": 4 * math.ceil(prepared["original_bytes"] / 3),
+                "sent_base64_bytes": len(base64_image),
+                "sent_size": (prepared["width"], prepared["height"]),
+                "frames": prepared["frames"],
+                "reencoded": prepared["reencoded"],
+                "preprocess_seconds": round(prepared["seconds"], 3),
+            }
             
             # Create message with image using correct MIME type
             message = HumanMessage(
@@ -239,14 +444,21 @@ Focus on scientific/experimental relevance. Be factual and specific."""
             )
             
             # Get analysis from vision LLM with timeout handling
-            import asyncio
             try:
                 # Add an additional timeout wrapper
+                call_start = time.perf_counter()
                 response = await asyncio.wait_for(
                     self.vision_llm.ainvoke([message]), 
                     timeout=185  # Slightly longer than the client timeout (3 min)
                 )
                 analysis_text = response.content
+                payload["vision_seconds"] = round(time.perf_counter() - call_start, 3)
+                logger.info(
+                    f"Vision payload for {image_path.name}: {payload['original_base64_bytes'] / 1e6:.2f} MB -> "
+                    f"{payload['sent_base64_bytes'] / 1e6:.2f} MB {mime_type} "
+                    f"({payload['sent_size'][0]}x{payload['sent_size'][1]}), "
+                    f"preprocessed in {payload['preprocess_seconds']:.2f}s, answered in {payload['vision_seconds']:.1f}s"
+                )
             except asyncio.TimeoutError:
                 logger.warning(f"Vision model timed out analyzing {image_path.name}")
                 # Return basic info without AI analysis
@@ -260,60 +472,17 @@ Focus on scientific/experimental relevance. Be factual and specific."""
                     experimental_context="Analysis unavailable due to timeout",
                     key_features=["Image metadata available", f"Format: {metadata.get('format', 'unknown')}"],
                     suggested_tags=["needs-manual-review"],
-                    error_message="Vision model timeout - returning basic metadata only"
+                    error_message="Vision model timeout - returning basic metadata only",
+                    payload=payload
                 )
             
-            # Parse the response
-            content_description = ""
-            experimental_context = ""
-            key_features = []
-            suggested_tags = []
-            
-            # Simple parsing (could be improved with structured output)
-            lines = analysis_text.split('\n')
-            current_section = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if "Content Description" in line:
-                    current_section = "description"
-                elif "Experimental Context" in line:
-                    current_section = "context"
-                elif "Key Features" in line:
-                    current_section = "features"
-                elif "Suggested Tags" in line:
-                    current_section = "tags"
-                elif current_section == "description" and not line.startswith("*"):
-                    content_description += line + " "
-                elif current_section == "context" and not line.startswith("*"):
-                    experimental_context += line + " "
-                elif current_section == "features" and line.startswith("-"):
-                    key_features.append(line[1:].strip())
-                elif current_section == "tags" and line.startswith("-"):
-                    suggested_tags.append(line[1:].strip())
-            
-            # Clean up
-            content_description = content_description.strip()
-            experimental_context = experimental_context.strip()
-            
-            # Fallback if parsing didn't work well
-            if not content_description:
-                content_description = analysis_text[:500]
-            
-            return ImageAnalysisResult(
-                success=True,
-                file_path=str(image_path),
-                file_name=image_path.name,
-                image_size=metadata.get("size", (0, 0)),
-                format=metadata.get("format", "unknown"),
-                content_description=content_description,
-                experimental_context=experimental_context,
-                key_features=key_features[:5],  # Limit to 5
-                suggested_tags=suggested_tags[:5]  # Limit to 5
-            )
+            fields = self.parse_analysis(analysis_text)
+            if self.cache is not None:
+                # Only complete analyses are cached; timeouts and errors are retried next time
+                await asyncio.to_thread(self.cache.put, cache_key, {**fields, "model": self.model_name})
+            result = result_from(fields)
+            result.payload = payload
+            return result
             
         except Exception as e:
             logger.error(f"Failed to analyze image {image_path}: {e}")
@@ -334,6 +503,204 @@ Focus on scientific/experimental relevance. Be factual and specific."""
             )
 
 
+    def build_batch_prompt(self, image_names: List[str], context: Optional[str] = None,
+                           experiment_id: Optional[str] = None) -> str:
+        """Analysis prompt for several images sent in one message"""
+        listing = "\n".join(f"Image {i}: {name}" for i, name in enumerate(image_names, 1))
+        return f"""Analyze these {len(image_names)} laboratory/experimental images, attached in this order:
+{listing}
+{f'Experiment Context: {context}' if context else ''}
+{f'Experiment ID: {experiment_id}' if experiment_id else ''}
+
+Analyze each image separately. For each one, start a section with the line
+"### Image N: <file name>" and provide:
+
+1. **Content Description**: What is shown in the image? Be specific about what you see.
+
+2. **Experimental Context**: How does this relate to laboratory work or experiments? What type of data or results might this represent?
+
+3. **Key Features**: List 3-5 important features or observations from the image:
+   - Feature 1
+   - etc.
+
+4. **Suggested Tags**: Provide 3-5 relevant tags for categorizing this image:
+   - Tag 1
+   - etc.
+
+Focus on scientific/experimental relevance. Be factual and specific."""
+    
+    @classmethod
+    def parse_batch_analysis(cls, analysis_text: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """Split a batched reply into per-image fields, keyed by 0-based image index"""
+        parts = re.split(r"^\s*#{1,6}\s*\**\s*Image\s+(\d+)\b.*$", analysis_text, flags=re.MULTILINE)
+        results = {}
+        # parts = [preamble, number, section, number, section, ...]
+        for number, section in zip(parts[1::2], parts[2::2]):
+            index = int(number) - 1
+            if 0 <= index < count and index not in results and section.strip():
+                results[index] = cls.parse_analysis(section)
+        return results
+    
+    async def _analyze_batch(self, images: List[Dict[str, Any]], context: Optional[str],
+                             experiment_id: Optional[str], overrides: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """One vision request for several loaded images; returns the fields parsed per image"""
+        names = [image["path"].name for image in images]
+        prepared = await asyncio.gather(*(self._prepare(image, name, **overrides)
+                                          for image, name in zip(images, names)))
+        
+        content = [{"type": "text", "text": self.build_batch_prompt(names, context, experiment_id)}]
+        for item in prepared:
+            encoded = base64.b64encode(item["bytes"]).decode('utf-8')
+            content.append({"type": "image_url", "image_url": {"url": f"data:{item['mime_type']};base64,{encoded}"}})
+        
+        start = time.perf_counter()
+        response = await asyncio.wait_for(
+            self.vision_llm.ainvoke([HumanMessage(content=content)]),
+            timeout=185  # Slightly longer than the client timeout (3 min)
+        )
+        parsed = self.parse_batch_analysis(response.content, len(images))
+        logger.info(
+            f"Batched vision request for {len(images)} images: "
+            f"{sum(4 * math.ceil(p['original_bytes'] / 3) for p in prepared) / 1e6:.2f} MB -> "
+            f"{sum(4 * math.ceil(len(p['bytes']) / 3) for p in prepared) / 1e6:.2f} MB, "
+            f"answered in {time.perf_counter() - start:.1f}s, {len(parsed)} parsed"
+        )
+        return parsed
+    
+    async def analyze_images(
+        self,
+        image_paths: List[str],
+        context: Optional[str] = None,
+        experiment_id: Optional[str] = None,
+        max_concurrent: int = 3,
+        batch_max_edge: int = 1024
+    ) -> List[ImageAnalysisResult]:
+        """
+        Analyze several images, sharing vision requests where the model allows
+        
+        Cached images are answered from the cache. If the model accepts several
+        images per message (``max_images_per_request`` in llm_config.json), the
+        rest are sent in groups, downscaled to ``batch_max_edge``, and each
+        parsed result is cached under a batch variant of the image's key, so
+        single-image calls never get a lower-resolution batched answer. Images
+        a batched reply does not cover, and all images for single-image models,
+        are analyzed one by one. At most ``max_concurrent`` requests run at once.
+        
+        Returns:
+            One ImageAnalysisResult per path, in input order
+        """
+        paths = [Path(p) for p in image_paths]
+        results: List[Optional[ImageAnalysisResult]] = [None] * len(paths)
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def analyze_alone(index: int):
+            async with semaphore:
+                results[index] = await self.analyze_image(str(paths[index]), context, experiment_id)
+        
+        if self.vision_llm is None or self.max_images_per_request < 2:
+            await asyncio.gather(*(analyze_alone(i) for i in range(len(paths))))
+            return results
+        
+        batch = self._batch_overrides(batch_max_edge)
+        
+        # Identify what can be batched; everything else (missing, unsupported, unreadable) goes alone.
+        # Only hashes and metadata are kept here - image bytes are read per group, under the semaphore.
+        candidates = [i for i, p in enumerate(paths) if p.exists() and p.suffix.lower() in SUPPORTED_IMAGE_FORMATS]
+        identified = await asyncio.gather(
+            *(asyncio.to_thread(self.identify_image, str(paths[i])) for i in candidates), return_exceptions=True
+        )
+        pending = []
+        for index, image in zip(candidates, identified):
+            if isinstance(image, BaseException):
+                continue
+            name = paths[index].name
+            # A single-image analysis of the same image is at least as good as a batched one
+            cached = (await self._cached_fields(self._cache_key(image, name, context, experiment_id))
+                      or await self._cached_fields(self._cache_key(image, name, context, experiment_id, batch)))
+            if cached is not None:
+                results[index] = _analysis_result(paths[index], image["metadata"], cached)
+            else:
+                pending.append(index)
+        
+        async def analyze_group(group: List[int]):
+            async with semaphore:
+                loaded = await asyncio.gather(
+                    *(asyncio.to_thread(self.load_image, str(paths[i])) for i in group), return_exceptions=True
+                )
+                images = []
+                for index, image in zip(group, loaded):
+                    if not isinstance(image, BaseException):
+                        image["path"] = paths[index]
+                        images.append((index, image))
+                try:
+                    parsed = await self._analyze_batch([image for _, image in images], context,
+                                                       experiment_id, batch) if images else {}
+                except Exception as e:
+                    logger.warning(f"Batched vision request failed, analyzing images one by one: {e}")
+                    parsed = {}
+            for position, (index, image) in enumerate(images):
+                fields = parsed.get(position)
+                if fields is None:
+                    continue
+                results[index] = _analysis_result(paths[index], image["metadata"], fields)
+                if self.cache is not None:
+                    cache_key = self._cache_key(image, paths[index].name, context, experiment_id, batch)
+                    await asyncio.to_thread(self.cache.put, cache_key,
+                                            {**fields, "model": self.model_name, "batched": True})
+        
+        size = self.max_images_per_request
+        await asyncio.gather(*(analyze_group(pending[i:i + size]) for i in range(0, len(pending), size)))
+        
+        # Anything not answered yet is analyzed on its own
+        await asyncio.gather(*(analyze_alone(i) for i, result in enumerate(results) if result is None))
+        return results
+
+
+def _analysis_result(image_path: Path, metadata: Dict[str, Any], fields: Dict[str, Any]) -> ImageAnalysisResult:
+    """Successful result for an image from its parsed analysis fields"""
+    return ImageAnalysisResult(
+        success=True,
+        file_path=str(image_path),
+        file_name=image_path.name,
+        image_size=tuple(metadata.get("size", (0, 0))),
+        format=metadata.get("format", "unknown"),
+        **fields
+    )
+
+
+# Process-wide analyzers, one per vision model (singleton pattern)
+_analyzers: Dict[str, ImageAnalyzer] = {}
+_analyzers_lock = threading.Lock()
+_global_result_cache = None
+
+
+def get_image_result_cache() -> Optional[ImageResultCache]:
+    """Get the shared image analysis cache, or None if ``analysis.image.cache_enabled`` is off"""
+    global _global_result_cache
+    from src.config.config import config
+
+    if not config.get("analysis.image.cache_enabled", True):
+        return None
+    if _global_result_cache is None:
+        cache_path = config.get("analysis.image.cache_path") or str(
+            config.get_project_root() / ".labacc" / "image_analysis"
+        )
+        _global_result_cache = ImageResultCache(cache_path)
+    return _global_result_cache
+
+
+def get_image_analyzer(vision_model: str = "doubao-seed-1-6-thinking") -> ImageAnalyzer:
+    """Get the process-wide analyzer (and vision client) for a model"""
+    with _analyzers_lock:
+        analyzer = _analyzers.get(vision_model)
+        if analyzer is None:
+            analyzer = ImageAnalyzer(vision_model_name=vision_model, cache=get_image_result_cache())
+            # A model that failed to initialize (e.g. missing key) is retried on the next call
+            if analyzer.vision_llm is not None:
+                _analyzers[vision_model] = analyzer
+        return analyzer
+
+
 # Convenience function for direct use
 async def analyze_lab_image(
     image_path: str,
@@ -353,10 +720,34 @@ async def analyze_lab_image(
     Returns:
         ImageAnalysisResult with analysis
     """
-    analyzer = ImageAnalyzer(vision_model_name=vision_model)
+    analyzer = get_image_analyzer(vision_model)
     return await analyzer.analyze_image(image_path, context, experiment_id)
 
 
+async def analyze_lab_images(
+    image_paths: List[str],
+    context: Optional[str] = None,
+    experiment_id: Optional[str] = None,
+    vision_model: str = "doubao-seed-1-6-thinking"
+) -> List[ImageAnalysisResult]:
+    """
+    Analyze several laboratory images, batching vision requests where possible
+    
+    Concurrency and batch downscaling come from ``analysis.image.batch``.
+    
+    Returns:
+        One ImageAnalysisResult per path, in input order
+    """
+    from src.config.config import config
+    
+    analyzer = get_image_analyzer(vision_model)
+    return await analyzer.analyze_images(
+        image_paths, context, experiment_id,
+        max_concurrent=int(config.get("analysis.image.batch.max_concurrent", 3)),
+        batch_max_edge=int(config.get("analysis.image.batch.max_edge", 1024))
+    )
+
+
 # For synchronous use
 def analyze_lab_image_sync(
     image_path: str,
@@ -367,5 +758,4 @@ def analyze_lab_image_sync(
     """
     Synchronous wrapper for image analysis
     """
-    import asyncio
     return asyncio.run(analyze_lab_image(image_path, context, experiment_id, vision_model))
\ No newline at end of file
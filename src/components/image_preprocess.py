@@ -0,0 +1,163 @@
+"""
+Shrink images before they are sent to a vision LLM.
+
+Lab images are often far larger than a vision model can use: a 16-bit
+multi-page microscopy TIFF can be tens of megabytes, base64-inflated by a
+third, and is downsampled by the provider anyway. ``prepare_image``:
+
+    1. picks a representative frame of a multi-page image, or tiles up to
+       ``montage_max_frames`` evenly spaced frames into one montage,
+    2. normalizes bit depth: 16-bit and float images are contrast-stretched
+       to 8 bits (0.5-99.5 percentile), palette/alpha/CMYK images become RGB,
+    3. downsamples so the longest edge is at most ``max_edge``,
+    4. re-encodes as JPEG or WebP, lowering quality and then size until the
+       payload fits ``max_bytes``.
+
+Images that are already small, 8-bit, single-frame PNG/JPEG/WebP files are
+passed through unchanged. Blocking - call via ``asyncio.to_thread``.
+"""
+
+import io
+import logging
+import math
+import time
+from typing import Dict, List
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+PASSTHROUGH_FORMATS = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+OUTPUT_FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp")}
+QUALITY_STEPS = (85, 75, 65, 50)
+EIGHT_BIT_MODES = {"L", "RGB"}
+
+
+def to_8bit(frame: Image.Image) -> Image.Image:
+    """Convert a frame to 8-bit grayscale or RGB, contrast-stretching high bit depths."""
+    if frame.mode in EIGHT_BIT_MODES:
+        return frame
+    if frame.mode.startswith("I") or frame.mode == "F":
+        values = np.asarray(frame, dtype=np.float64)
+        finite = values[np.isfinite(values)]
+        low, high = np.percentile(finite, (0.5, 99.5)) if finite.size else (0.0, 0.0)
+        if high <= low:
+            high = low + 1
+        scaled = np.clip((np.nan_to_num(values, nan=low) - low) / (high - low) * 255, 0, 255)
+        return Image.fromarray(scaled.astype(np.uint8), mode="L")
+    if frame.mode in ("1", "LA"):
+        return frame.convert("L")
+    return frame.convert("RGB")
+
+
+def _frames(img: Image.Image, multipage: str, max_frames: int) -> List[Image.Image]:
+    """The frames to show: one representative frame, or evenly spaced frames for a montage."""
+    count = getattr(img, "n_frames", 1)
+    if count <= 1:
+        # Loaded copy: the source image is closed once the caller is done with it
+        return [img.copy()]
+    if multipage == "montage":
+        shown = min(count, max_frames)
+        indices = sorted({round(i * (count - 1) / max(shown - 1, 1)) for i in range(shown)})
+    elif multipage == "first":
+        indices = [0]
+    else:
+        indices = [count // 2]
+    frames = []
+    for index in indices:
+        img.seek(index)
+        frames.append(img.copy())
+    return frames
+
+
+def _montage(frames: List[Image.Image], max_edge: int) -> Image.Image:
+    """Tile frames into a near-square grid whose longest edge is at most ``max_edge``."""
+    columns = math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / columns)
+    width, height = frames[0].size
+    scale = min(1.0, max_edge / (width * columns), max_edge / (height * rows))
+    tile = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+    mode = "RGB" if any(f.mode == "RGB" for f in frames) else "L"
+    sheet = Image.new(mode, (tile[0] * columns, tile[1] * rows))
+    for i, frame in enumerate(frames):
+        thumb = frame.convert(mode).resize(tile, Image.Resampling.LANCZOS)
+        sheet.paste(thumb, ((i % columns) * tile[0], (i // columns) * tile[1]))
+    return sheet
+
+
+def prepare_image(data: bytes, max_edge: int = 2048, max_bytes: int = 4 * 1024 * 1024,
+                  output_format: str = "jpeg", multipage: str = "montage",
+                  montage_max_frames: int = 9) -> Dict:
+    """Downscale and re-encode an image for a vision LLM.
+
+    Args:
+        data: Original image file contents
+        max_edge: Longest edge of the result in pixels
+        max_bytes: Byte budget of the encoded result
+        output_format: "jpeg" or "webp"
+        multipage: "montage", "middle" or "first" frame of multi-page images
+        montage_max_frames: Frames tiled into a montage
+
+    Returns:
+        ``bytes`` and ``mime_type`` of the payload, its ``width``, ``height``,
+        ``original_bytes``, ``frames`` shown, whether it was ``reencoded``, and
+        ``seconds`` spent
+    """
+    start = time.perf_counter()
+    container, mime_type = OUTPUT_FORMATS.get(output_format.lower(), OUTPUT_FORMATS["jpeg"])
+
+    with Image.open(io.BytesIO(data)) as img:
+        frame_count = getattr(img, "n_frames", 1)
+        if (img.format in PASSTHROUGH_FORMATS and frame_count == 1 and len(data) <= max_bytes
+                and max(img.size) <= max_edge and img.mode in EIGHT_BIT_MODES | {"RGBA", "P", "LA"}):
+            return {
+                "bytes": data, "mime_type": PASSTHROUGH_FORMATS[img.format],
+                "width": img.width, "height": img.height, "original_bytes": len(data),
+                "frames": 1, "reencoded": False, "seconds": time.perf_counter() - start,
+            }
+
+        if img.format == "JPEG":
+            # Let the decoder skip detail we are about to throw away
+            img.draft("RGB", (max_edge, max_edge))
+        frames = [to_8bit(frame) for frame in _frames(img, multipage, montage_max_frames)]
+
+    if len(frames) > 1:
+        picture = _montage(frames, max_edge)
+    else:
+        picture = frames[0]
+        if max(picture.size) > max_edge:
+            picture = picture.copy()
+            picture.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+    # Lower the quality first, then the resolution, until the payload fits
+    while True:
+        for quality in QUALITY_STEPS:
+            buffer = io.BytesIO()
+            picture.save(buffer, format=container, quality=quality)
+            if buffer.tell() <= max_bytes:
+                break
+        if buffer.tell() <= max_bytes or max(picture.size) <= 256:
+            break
+        picture = picture.resize((max(1, int(picture.width * 0.75)), max(1, int(picture.height * 0.75))),
+                                 Image.Resampling.LANCZOS)
+
+    return {
+        "bytes": buffer.getvalue(), "mime_type": mime_type,
+        "width": picture.width, "height": picture.height, "original_bytes": len(data),
+        "frames": len(frames), "reencoded": True, "seconds": time.perf_counter() - start,
+    }
+
+
+def preprocess_settings() -> Dict:
+    """``prepare_image`` keyword arguments from ``analysis.image``."""
+    from src.config.config import config
+
+    return {
+        "max_edge": int(config.get("analysis.image.max_edge", 2048)),
+        "max_bytes": int(float(config.get("analysis.image.max_payload_mb", 4)) * 1024 * 1024),
+        "output_format": str(config.get("analysis.image.output_format", "jpeg")),
+        "multipage": str(config.get("analysis.image.multipage", "montage")),
+        "montage_max_frames": int(config.get("analysis.image.montage_max_frames", 9)),
+    }
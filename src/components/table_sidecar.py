@@ -0,0 +1,360 @@
+"""
+Columnar sidecars for tabular data files.
+
+Parsing a large CSV or workbook is slow, and ``analyze_data`` used to do it
+on every call. A sidecar stores the parsed columns of a CSV, TSV or XLSX
+file next to it under ``.labacc/tables/<file name>/``:
+
+    - numeric, boolean and datetime columns as raw little-endian arrays,
+    - text columns dictionary-encoded (int32 codes plus the distinct values),
+    - ``manifest.json`` with the schema of each table (one per sheet), the
+      source file's size and mtime, and the version directory holding the
+      column files.
+
+Later reads memory-map the column files (copy-on-write) instead of parsing
+text, so only the pages an analysis touches are read. A sidecar is rebuilt
+when the source file's size or mtime changes. CSVs are ingested chunk by
+chunk, so building one needs memory for a chunk, not the whole file.
+
+A rebuild writes its columns to a fresh version directory and then swaps
+in the new manifest with one atomic rename, so readers always see a
+complete sidecar. Builds of the same source in one process are serialized.
+
+Sidecars are built in the background after an upload, or on first access.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_stats import detect_separator
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_DIR = Path(".labacc") / "tables"
+MANIFEST_NAME = "manifest.json"
+SIDECAR_VERSION = 2
+TABULAR_EXTENSIONS = {".csv", ".tsv", ".xlsx", ".xls"}
+
+# Column kind -> on-disk dtype
+_DTYPES = {
+    "float": np.dtype("<f8"),
+    "int": np.dtype("<i8"),
+    "bool": np.dtype("u1"),
+    "datetime": np.dtype("<i8"),
+    "str": np.dtype("<i4"),
+}
+
+
+def _kind(series: pd.Series) -> str:
+    """Storage kind of a parsed column."""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "datetime"
+    return "str"
+
+
+def _merged_kind(a: str, b: str) -> str:
+    """Kind that can hold the values of both kinds."""
+    if a == b:
+        return a
+    if {a, b} == {"int", "float"}:
+        return "float"
+    return "str"
+
+
+class _ColumnWriter:
+    """Appends the chunks of one column to its file, widening the kind if needed."""
+
+    def __init__(self, path: Path, name: str):
+        self.path = path
+        self.name = name
+        self.kind: Optional[str] = None
+        self.rows = 0
+        self.categories: Dict[str, int] = {}
+
+    def _encode(self, series: pd.Series) -> np.ndarray:
+        if self.kind == "float":
+            return series.to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.kind in ("int", "bool"):
+            return series.to_numpy().astype(_DTYPES[self.kind])
+        if self.kind == "datetime":
+            return series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+        # Text: map this chunk's distinct values onto the column dictionary
+        local_codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, value in enumerate(uniques):
+            text = str(value)
+            code = self.categories.get(text)
+            if code is None:
+                code = self.categories[text] = len(self.categories)
+            mapping[i] = code
+        codes = np.full(len(series), -1, dtype=np.int32)
+        present = local_codes >= 0
+        codes[present] = mapping[local_codes[present]]
+        return codes
+
+    def _decode_existing(self) -> pd.Series:
+        """Read back what was written so far (only needed to widen the kind)."""
+        data = np.fromfile(self.path, dtype=_DTYPES[self.kind])
+        if self.kind == "bool":
+            return pd.Series(data.astype(bool))
+        if self.kind == "datetime":
+            return pd.Series(data.view("datetime64[ns]"))
+        if self.kind == "str":
+            categories = list(self.categories)
+            return pd.Series(pd.Categorical.from_codes(data, categories)).astype(object)
+        return pd.Series(data)
+
+    def append(self, series: pd.Series):
+        kind = _kind(series)
+        if self.kind is None:
+            self.kind = kind
+        elif _merged_kind(self.kind, kind) != self.kind:
+            # A later chunk doesn't fit (e.g. NaN in an int column): rewrite as the wider kind
+            existing = self._decode_existing()
+            self.kind, self.categories = _merged_kind(self.kind, kind), {}
+            self.path.write_bytes(self._encode(existing).tobytes())
+        with open(self.path, 'ab') as f:
+            f.write(self._encode(series).tobytes())
+        self.rows += len(series)
+
+    def describe(self) -> Dict:
+        column = {"name": self.name, "kind": self.kind or "float", "file": self.path.name}
+        if self.kind == "str":
+            column["categories"] = list(self.categories)
+        return column
+
+
+def _write_table(table_dir: Path, index: int, chunks: Iterable[pd.DataFrame], name: str) -> Dict:
+    writers: List[_ColumnWriter] = []
+    rows = 0
+    for chunk in chunks:
+        if not writers:
+            writers = [
+                _ColumnWriter(table_dir / f"t{index}_c{i}.bin", str(column))
+                for i, column in enumerate(chunk.columns)
+            ]
+            for writer in writers:
+                writer.path.touch()
+        for writer, column in zip(writers, chunk.columns):
+            writer.append(chunk[column])
+        rows += len(chunk)
+    return {"name": name, "rows": rows, "columns": [w.describe() for w in writers]}
+
+
+# Source sidecar directory -> lock serializing its builds
+_build_locks: Dict[str, threading.RLock] = {}
+_build_locks_guard = threading.Lock()
+
+
+def _build_lock(sidecar_dir: Path) -> threading.RLock:
+    key = str(sidecar_dir.resolve())
+    with _build_locks_guard:
+        return _build_locks.setdefault(key, threading.RLock())
+
+
+class TableSidecar:
+    """Columnar sidecar of one tabular data file."""
+
+    def __init__(self, source_path: str, chunk_rows: int = 200_000):
+        """Initialize the sidecar.
+
+        Args:
+            source_path: CSV, TSV or Excel file
+            chunk_rows: Rows parsed per chunk when ingesting a CSV
+        """
+        self.source_path = Path(source_path)
+        self.dir = self.source_path.parent / SIDECAR_DIR / self.source_path.name
+        self.chunk_rows = chunk_rows
+
+    def _source_signature(self) -> Dict:
+        stat = self.source_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def manifest(self) -> Optional[Dict]:
+        """The manifest if the sidecar exists and matches the current source, else None."""
+        try:
+            with open(self.dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == SIDECAR_VERSION and manifest["source"] == self._source_signature():
+                return manifest
+        except (json.JSONDecodeError, OSError, KeyError):
+            pass
+        return None
+
+    def is_fresh(self) -> bool:
+        """Whether the sidecar exists and its source is unchanged."""
+        return self.manifest() is not None
+
+    def _parse(self):
+        """Yield (table name, chunks) for each table in the source."""
+        if self.source_path.suffix.lower() in (".xlsx", ".xls"):
+            for sheet, frame in pd.read_excel(self.source_path, sheet_name=None).items():
+                yield str(sheet), [frame]
+        else:
+            sep = detect_separator(str(self.source_path))
+            yield "", pd.read_csv(self.source_path, sep=sep, chunksize=self.chunk_rows)
+
+    def build(self) -> Dict:
+        """Parse the source and write the sidecar, replacing any previous one.
+
+        Blocking - call via ``asyncio.to_thread`` or a background job.
+
+        Returns:
+            The new manifest
+        """
+        with _build_lock(self.dir):
+            signature = self._source_signature()
+            version = f"v-{uuid.uuid4().hex}"
+            data_dir = self.dir / version
+            data_dir.mkdir(parents=True)
+
+            start = time.perf_counter()
+            try:
+                tables = [
+                    _write_table(data_dir, index, chunks, name)
+                    for index, (name, chunks) in enumerate(self._parse())
+                ]
+                manifest = {
+                    "version": SIDECAR_VERSION,
+                    "source": signature,
+                    "data_dir": version,
+                    "tables": tables,
+                    "parse_seconds": round(time.perf_counter() - start, 3),
+                    "created_at": time.time(),
+                }
+                tmp_path = self.dir / f"{MANIFEST_NAME}.{version}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, ensure_ascii=False)
+                # The swap: readers see either the old manifest or the new one
+                os.replace(tmp_path, self.dir / MANIFEST_NAME)
+            except BaseException:
+                shutil.rmtree(data_dir, ignore_errors=True)
+                raise
+
+            # Older versions are unreferenced now; open memory maps keep their pages on POSIX
+            for old in self.dir.glob("v-*"):
+                if old.name != version:
+                    shutil.rmtree(old, ignore_errors=True)
+
+        logger.info(f"Built columnar sidecar for {self.source_path.name} "
+                    f"({sum(t['rows'] for t in tables):,} rows) in {manifest['parse_seconds']:.2f}s")
+        return manifest
+
+    def ensure(self) -> Dict:
+        """The current manifest, building the sidecar first if it is missing or stale.
+
+        Concurrent callers in one process build it once. Blocking.
+        """
+        with _build_lock(self.dir):
+            return self.manifest() or self.build()
+
+    def load(self, sheet: Optional[str] = None, manifest: Optional[Dict] = None) -> pd.DataFrame:
+        """Load one table (the first, or the named sheet) with memory-mapped columns.
+
+        Raises:
+            FileNotFoundError: If the sidecar is missing or stale
+            KeyError: If the sheet does not exist
+        """
+        manifest = manifest or self.manifest()
+        if manifest is None:
+            raise FileNotFoundError(f"No current sidecar for {self.source_path.name}")
+        tables = manifest["tables"]
+        if sheet is None:
+            table = tables[0]
+        else:
+            table = next((t for t in tables if t["name"] == sheet), None)
+            if table is None:
+                raise KeyError(f"No sheet named {sheet!r} in {self.source_path.name}")
+
+        start = time.perf_counter()
+        rows = table["rows"]
+        data = {}
+        for column in table["columns"]:
+            dtype = _DTYPES[column["kind"]]
+            if rows:
+                # Copy-on-write: analyses may modify the frame without touching the file.
+                # Plain ndarray view so pandas doesn't carry the memmap subclass around.
+                column_path = self.dir / manifest["data_dir"] / column["file"]
+                values = np.asarray(np.memmap(column_path, dtype=dtype, mode="c", shape=(rows,)))
+            else:
+                values = np.empty(0, dtype=dtype)
+            if column["kind"] == "bool":
+                values = values.view(bool)
+            elif column["kind"] == "datetime":
+                values = values.view("datetime64[ns]")
+            elif column["kind"] == "str":
+                values = pd.Categorical.from_codes(values, column["categories"])
+            data[column["name"]] = values
+        frame = pd.DataFrame(data, copy=False)
+
+        load_seconds = time.perf_counter() - start
+        parse_seconds = manifest.get("parse_seconds") or 0
+        logger.debug(f"Loaded {self.source_path.name} from sidecar in {load_seconds * 1000:.1f} ms "
+                     f"(parsing took {parse_seconds:.2f}s, {parse_seconds / max(load_seconds, 1e-6):.0f}x faster)")
+        return frame
+
+    def sheets(self) -> List[str]:
+        """Names of the tables in the sidecar ("" for a CSV)."""
+        manifest = self.manifest()
+        return [t["name"] for t in manifest["tables"]] if manifest else []
+
+
+def _sidecar_settings() -> Dict:
+    from src.config.config import config
+
+    return {
+        "enabled": bool(config.get("analysis.sidecar.enabled", True)),
+        "min_bytes": int(float(config.get("analysis.sidecar.min_size_kb", 256)) * 1024),
+        "chunk_rows": int(config.get("analysis.chunk_rows", 200_000)),
+    }
+
+
+def wants_sidecar(file_path: str) -> bool:
+    """Whether a file is tabular and large enough for a sidecar to pay off."""
+    path = Path(file_path)
+    if path.suffix.lower() not in TABULAR_EXTENSIONS or not path.exists():
+        return False
+    settings = _sidecar_settings()
+    return settings["enabled"] and path.stat().st_size >= settings["min_bytes"]
+
+
+def ensure_sidecar(file_path: str) -> Optional[Dict]:
+    """Build the sidecar of a file unless it is current; None if the file doesn't want one.
+
+    Blocking - call via ``asyncio.to_thread`` or a background job.
+    """
+    if not wants_sidecar(file_path):
+        return None
+    return TableSidecar(file_path, chunk_rows=_sidecar_settings()["chunk_rows"]).ensure()
+
+
+def read_table(file_path: str, sheet: Optional[str] = None) -> pd.DataFrame:
+    """Read a tabular data file, through its sidecar when it has one.
+
+    Large files get a sidecar built on first access; small files are parsed
+    directly. Blocking - call via ``asyncio.to_thread``.
+    """
+    manifest = ensure_sidecar(file_path)
+    if manifest is not None:
+        return TableSidecar(file_path).load(sheet, manifest=manifest)
+    if Path(file_path).suffix.lower() in (".xlsx", ".xls"):
+        return pd.read_excel(file_path, sheet_name=sheet or 0)
+    return pd.read_csv(file_path, sep=detect_separator(file_path))
@@ -0,0 +1,148 @@
+"""
+Thumbnails of project images for the file browser.
+
+Thumbnails are JPEGs stored in ``<project>/.labacc/thumbs/`` and named after
+the image's project-relative path, mtime and size, so an edited or replaced
+image gets a new thumbnail (and a new ETag) while an unchanged one is served
+straight from disk. Older thumbnails of the same path are removed when a new
+one is written.
+
+Generation runs in a thread pool (Pillow releases the GIL while decoding
+and resampling) and concurrent requests for the same thumbnail share one
+generation. JPEGs are decoded at reduced scale, and 16-bit microscopy
+images are contrast-stretched like vision uploads (see ``image_preprocess``),
+so a directory of large images previews without reading them at full
+resolution more than once.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image
+
+from src.components.image_preprocess import to_8bit
+
+logger = logging.getLogger(__name__)
+
+THUMBS_DIR = Path(".labacc") / "thumbs"
+THUMBNAIL_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.tif', '.tiff'}
+
+
+def is_thumbnailable(file_path: str) -> bool:
+    """Whether a file is an image the file browser shows a thumbnail for."""
+    return Path(file_path).suffix.lower() in THUMBNAIL_EXTENSIONS
+
+
+def render_thumbnail(source_path: str, target_path: str, size: int = 256, quality: int = 80):
+    """Write a JPEG thumbnail of the first frame of an image. Blocking."""
+    with Image.open(source_path) as img:
+        if img.format == "JPEG":
+            # Decode at 1/2, 1/4 or 1/8 scale when that is still larger than the thumbnail
+            img.draft("RGB", (size, size))
+        img.seek(0)
+        frame = to_8bit(img)
+        frame.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        frame.save(tmp_path, format="JPEG", quality=quality)
+        os.replace(tmp_path, target_path)
+
+
+class ThumbnailCache:
+    """On-disk thumbnails of one project's images."""
+
+    def __init__(self, project_root: str, size: int = 256, quality: int = 80):
+        """Initialize the cache.
+
+        Args:
+            project_root: Project directory; thumbnails go in its .labacc/thumbs/
+            size: Longest thumbnail edge in pixels
+            quality: JPEG quality
+        """
+        self.project_root = Path(project_root).resolve()
+        self.dir = self.project_root / THUMBS_DIR
+        self.size = size
+        self.quality = quality
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def _path_prefix(self, source: Path) -> str:
+        relative = str(source.resolve().relative_to(self.project_root))
+        return hashlib.sha1(relative.encode()).hexdigest()[:20]
+
+    def key(self, source: Path) -> str:
+        """Thumbnail key of an image: its path, mtime and size (and the thumbnail size)."""
+        stat = source.stat()
+        return f"{self._path_prefix(source)}_{stat.st_mtime_ns:x}_{stat.st_size:x}_{self.size}"
+
+    def thumbnail_path(self, source: Path) -> Path:
+        return self.dir / f"{self.key(source)}.jpg"
+
+    def generate(self, source: Path) -> Path:
+        """Render the thumbnail if it is missing and drop outdated ones. Blocking."""
+        target = self.thumbnail_path(source)
+        if target.exists():
+            return target
+        self.dir.mkdir(parents=True, exist_ok=True)
+        render_thumbnail(str(source), str(target), self.size, self.quality)
+        for old in self.dir.glob(f"{self._path_prefix(source)}_*.jpg"):
+            if old != target:
+                old.unlink(missing_ok=True)
+        return target
+
+    async def ensure(self, source: Path, executor: Optional[ThreadPoolExecutor] = None) -> Path:
+        """Get the thumbnail of an image, generating it in the worker pool if needed."""
+        target = self.thumbnail_path(source)
+        if target.exists():
+            return target
+
+        key = target.name
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = asyncio.ensure_future(
+                loop.run_in_executor(executor or get_thumbnail_executor(), self.generate, source)
+            )
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+
+# Thread pool shared by all thumbnail generation (singleton pattern)
+_global_executor = None
+_caches: Dict[str, ThumbnailCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_thumbnail_executor() -> ThreadPoolExecutor:
+    """Get the thread pool thumbnails are rendered in, sized from ``thumbnails.max_workers``."""
+    global _global_executor
+    if _global_executor is None:
+        from src.config.config import config
+
+        _global_executor = ThreadPoolExecutor(
+            max_workers=int(config.get("thumbnails.max_workers", 2)),
+            thread_name_prefix="thumbnail",
+        )
+    return _global_executor
+
+
+def get_thumbnail_cache(project_root: str) -> ThumbnailCache:
+    """Get the thumbnail cache of a project, configured from ``thumbnails``."""
+    from src.config.config import config
+
+    root = str(Path(project_root).resolve())
+    with _caches_lock:
+        cache = _caches.get(root)
+        if cache is None:
+            cache = _caches[root] = ThumbnailCache(
+                root,
+                size=int(config.get("thumbnails.size", 256)),
+                quality=int(config.get("thumbnails.quality", 80)),
+            )
+        return cache
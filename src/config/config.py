@@ -93,7 +93,27 @@ class Config:
             },
             "conversion": {
                 "mineru_timeout": 120,
-                "max_file_size": 100
+                "pdf_pages_per_range": 20,
+                "pdf_parallel_ranges": 2,
+                "max_file_size": 100,
+                "store_link_mode": "copy"
+            },
+            "registry": {
+                "flush_delay_seconds": 1.0
+            },
+            "uploads": {
+                "chunk_size_mb": 8,
+                "max_file_size_mb": 10240,
+                "stale_after_hours": 24
+            },
+            "jobs": {
+                "max_attempts": 3,
+                "retry_backoff_seconds": 5,
+                "concurrency": {
+                    "convert_upload": 2,
+                    "analyze_upload": 1,
+                    "summarize_upload": 2
+                }
             },
             "server": {
                 "host": "0.0.0.0",
@@ -208,7 +228,8 @@ class Config:
             "max_research_loops": self.get("deep_research.max_research_loops", 5),
             "search_results_per_query": self.get("deep_research.search_results_per_query", 5),
             "verbose": self.get("deep_research.verbose", True),
-            "response_language": self.get("deep_research.response_language", None)
+            "response_language": self.get("deep_research.response_language", None),
+            "max_concurrent_runs": self.get("deep_research.max_concurrent_runs", 2)
         }
     
     def reload(self):
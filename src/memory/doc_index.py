@@ -0,0 +1,281 @@
+"""
+Local full-text index over a project's documents.
+
+READMEs, converted Markdown and text data files are split into chunks of
+a few lines and stored in a SQLite FTS5 table at
+``<project>/.labacc/doc_index.db``. Searches return BM25-ranked snippets
+with file and line references, so the agent can answer fact-finding
+questions without reading whole files.
+
+The index is incremental: files are re-indexed only when their size or
+mtime changed. Uploads, conversions and README saves update it right away
+(``index_paths``), and every search first picks up anything changed on
+disk since (``refresh``).
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "doc_index.db"
+DEFAULT_EXTENSIONS = (".md", ".txt", ".csv", ".tsv", ".json", ".yaml", ".yml", ".log")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+    content,
+    path UNINDEXED,
+    start_line UNINDEXED,
+    end_line UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def split_lines(text: str, chunk_lines: int):
+    """Split text into (start_line, end_line, content) chunks of ``chunk_lines`` lines."""
+    lines = text.splitlines()
+    for start in range(0, len(lines), chunk_lines):
+        block = lines[start:start + chunk_lines]
+        content = "\n".join(block).strip()
+        if content:
+            yield start + 1, start + len(block), content
+
+
+class DocIndex:
+    """SQLite FTS5 index of the text documents in one project."""
+
+    def __init__(self, project_root: str, extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+                 max_file_bytes: int = 5 * 1024 * 1024, chunk_lines: int = 20):
+        """Initialize the index.
+
+        Args:
+            project_root: Root folder of the project
+            extensions: File extensions to index
+            max_file_bytes: Larger files are skipped
+            chunk_lines: Lines per indexed chunk
+        """
+        self.project_root = Path(project_root).resolve()
+        self.db_path = self.project_root / ".labacc" / INDEX_NAME
+        self.extensions = {e.lower() for e in extensions}
+        self.max_file_bytes = max_file_bytes
+        self.chunk_lines = chunk_lines
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _relative(self, path: Path) -> Optional[str]:
+        try:
+            return str(Path(path).resolve().relative_to(self.project_root))
+        except ValueError:
+            return None
+
+    def is_indexable(self, path: Path) -> bool:
+        """Whether a file is one of the indexed document types, outside hidden folders."""
+        rel = self._relative(path)
+        if rel is None or any(part.startswith(".") for part in Path(rel).parts):
+            return False
+        return Path(path).suffix.lower() in self.extensions
+
+    def _index_file(self, conn: sqlite3.Connection, path: Path, rel: str, stat: os.stat_result):
+        conn.execute("DELETE FROM chunks WHERE path = ?", (rel,))
+        if stat.st_size <= self.max_file_bytes:
+            try:
+                text = path.read_text(encoding="utf-8", errors="replace")
+            except OSError as e:
+                logger.warning(f"Could not index {rel}: {e}")
+                text = ""
+            conn.executemany(
+                "INSERT INTO chunks (content, path, start_line, end_line) VALUES (?, ?, ?, ?)",
+                [(content, rel, start, end) for start, end, content in split_lines(text, self.chunk_lines)],
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime, size) VALUES (?, ?, ?)",
+            (rel, stat.st_mtime, stat.st_size),
+        )
+
+    def index_paths(self, paths: Iterable[Path]) -> int:
+        """Index (or re-index) specific files, e.g. right after an upload or save.
+
+        Non-indexable paths are ignored; missing files are removed from the index.
+
+        Returns:
+            Number of files (re)indexed
+        """
+        indexed = 0
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    for path in paths:
+                        path = Path(path)
+                        if not self.is_indexable(path):
+                            continue
+                        rel = self._relative(path)
+                        if not path.exists():
+                            conn.execute("DELETE FROM chunks WHERE path = ?", (rel,))
+                            conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                            continue
+                        self._index_file(conn, path, rel, path.stat())
+                        indexed += 1
+            finally:
+                conn.close()
+        return indexed
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the index up to date with the files on disk.
+
+        Only files whose size or mtime changed are re-read.
+
+        Returns:
+            Counts of ``indexed``, ``removed`` and ``unchanged`` files
+        """
+        counts = {"indexed": 0, "removed": 0, "unchanged": 0}
+        with self._lock:
+            conn = self._connect()
+            try:
+                known = {row[0]: (row[1], row[2]) for row in conn.execute("SELECT path, mtime, size FROM files")}
+                seen = set()
+                with conn:
+                    for root, dirs, files in os.walk(self.project_root):
+                        dirs[:] = [d for d in dirs if not d.startswith(".")]
+                        for name in files:
+                            path = Path(root) / name
+                            if path.suffix.lower() not in self.extensions:
+                                continue
+                            rel = str(path.relative_to(self.project_root))
+                            try:
+                                stat = path.stat()
+                            except OSError:
+                                continue
+                            seen.add(rel)
+                            if known.get(rel) == (stat.st_mtime, stat.st_size):
+                                counts["unchanged"] += 1
+                                continue
+                            self._index_file(conn, path, rel, stat)
+                            counts["indexed"] += 1
+
+                    for rel in known.keys() - seen:
+                        conn.execute("DELETE FROM chunks WHERE path = ?", (rel,))
+                        conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                        counts["removed"] += 1
+            finally:
+                conn.close()
+
+        if counts["indexed"] or counts["removed"]:
+            logger.info(f"Document index for {self.project_root.name}: {counts}")
+        return counts
+
+    @staticmethod
+    def _match_expression(query: str, any_term: bool) -> Optional[str]:
+        """Build an FTS5 query from free text, quoting terms so user input is never syntax."""
+        terms = re.findall(r"\w+", query, flags=re.UNICODE)
+        if not terms:
+            return None
+        quoted = [f'"{t}"' + ("*" if len(t) > 3 else "") for t in terms]
+        return (" OR " if any_term else " AND ").join(quoted)
+
+    def search(self, query: str, limit: int = 10, path_prefix: Optional[str] = None) -> List[Dict]:
+        """Find the chunks best matching a query.
+
+        All terms are required first; if nothing matches, any term will do.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            path_prefix: Only search files under this project-relative folder
+
+        Returns:
+            Results with ``path``, ``start_line``, ``end_line``, ``snippet`` and
+            ``score`` (higher is better), best first
+        """
+        sql = (
+            "SELECT path, start_line, end_line, snippet(chunks, 0, '**', '**', ' … ', 24), bm25(chunks) "
+            "FROM chunks WHERE chunks MATCH ?"
+        )
+        prefix = path_prefix.strip("/") if path_prefix else ""
+        if prefix:
+            sql += " AND (path = ? OR path LIKE ?)"
+        sql += " ORDER BY bm25(chunks) LIMIT ?"
+
+        conn = self._connect()
+        try:
+            for any_term in (False, True):
+                expression = self._match_expression(query, any_term)
+                if expression is None:
+                    return []
+                params = [expression] + ([prefix, f"{prefix}/%"] if prefix else []) + [limit]
+                rows = conn.execute(sql, params).fetchall()
+                if rows:
+                    break
+        finally:
+            conn.close()
+
+        return [
+            {
+                "path": path,
+                "start_line": int(start),
+                "end_line": int(end),
+                "snippet": " ".join(snippet.split()),
+                "score": round(-rank, 3),
+            }
+            for path, start, end, snippet, rank in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """Number of indexed files and chunks."""
+        conn = self._connect()
+        try:
+            files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            chunks = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        finally:
+            conn.close()
+        return {"files": files, "chunks": chunks}
+
+
+# Per-project index instances
+_indexes: Dict[str, DocIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_doc_index(project_root: str) -> DocIndex:
+    """Get the document index for a project, configured from ``doc_index``."""
+    key = str(Path(project_root).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            from src.config.config import config
+
+            index = _indexes[key] = DocIndex(
+                key,
+                extensions=config.get("doc_index.extensions", DEFAULT_EXTENSIONS),
+                max_file_bytes=int(float(config.get("doc_index.max_file_mb", 5)) * 1024 * 1024),
+                chunk_lines=int(config.get("doc_index.chunk_lines", 20)),
+            )
+        return index
+
+
+def index_changed_files(project_root: str, paths: Iterable[Path]):
+    """Update the project's index for files just written; never raises.
+
+    Blocking - call via ``asyncio.to_thread`` from async code.
+    """
+    try:
+        get_doc_index(project_root).index_paths([Path(p) for p in paths if p])
+    except Exception as e:
+        logger.warning(f"Could not update document index: {e}")
@@ -5,12 +5,16 @@ No parsing, no patterns, just raw README storage with LLM-based extraction.
 Philosophy: Trust the LLM. Keep it simple.
 """
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import logging
 
+from src.memory.doc_index import index_changed_files
+from src.memory.project_insights import schedule_insights_refresh
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,6 +164,8 @@ Be factual and accurate - only include what is explicitly provided."""
             new_content = response.content if hasattr(response, 'content') else str(response)
             
             memory.save(new_content)
+            await asyncio.to_thread(index_changed_files, self.project_root, [memory.file_path])
+            schedule_insights_refresh(self.project_root, llm)
             return f"Updated README for {experiment_id}"
         except Exception as e:
             logger.error(f"Failed to update README for {experiment_id}: {e}")
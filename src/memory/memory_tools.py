@@ -7,6 +7,7 @@ from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage
 from typing import Optional
 from pathlib import Path
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -112,6 +113,23 @@ def list_all_experiments() -> str:
 scan_project = list_all_experiments
 
 
+def _format_chunks(chunks: list) -> str:
+    """Render retrieved chunks with their file and line references."""
+    return "\n---\n".join(
+        f"{c['path']}:{c['start_line']}-{c['end_line']}\n{c['text']}" for c in chunks
+    )
+
+
+async def _retrieve(query: str, k: int, per_file: int = 2) -> list:
+    """Retrieve the chunks of the project's documents most relevant to a query."""
+    from src.memory.vector_index import get_vector_index
+    
+    index = get_vector_index(str(_memory_manager.project_root))
+    # Re-embeds only files changed since the last call
+    await asyncio.to_thread(index.refresh)
+    return await asyncio.to_thread(index.search, query, k, None, per_file)
+
+
 @tool
 async def search_experiments(search_query: str) -> str:
     """Search across all experiments using semantic search.
@@ -126,34 +144,20 @@ async def search_experiments(search_query: str) -> str:
     if not _memory_manager or not _llm_instance:
         return "Memory system not initialized"
     
-    experiments = _memory_manager.list_experiments()
-    if not experiments:
-        return "No experiments to search"
+    chunks = await _retrieve(search_query, k=12)
+    if not chunks:
+        return "No experiment documents match the search"
     
-    # Collect all README contents
-    all_readmes = []
-    for exp in experiments:
-        memory = _memory_manager.read_memory(exp['name'])
-        if memory:
-            all_readmes.append({
-                'name': exp['name'],
-                'content': memory.raw_content[:1000]  # First 1000 chars
-            })
-    
-    if not all_readmes:
-        return "No experiment READMEs found"
-    
-    # Use LLM to search
+    # Use LLM to explain the retrieved passages
     prompt = f"""Search query: {search_query}
 
-Experiments:
-"""
-    for exp in all_readmes:
-        prompt += f"\n{exp['name']}:\n{exp['content']}\n---\n"
-    
-    prompt += f"\nFind experiments relevant to the search query and explain why they match."
+Most relevant passages from the project's experiments (file:lines, then text):
+{_format_chunks(chunks)}
+
+Find experiments relevant to the search query and explain why they match.
+Cite the file:line references you rely on."""
     
-    response = _llm_instance.invoke([HumanMessage(content=prompt)])
+    response = await _llm_instance.ainvoke([HumanMessage(content=prompt)])
     return response.content
 
 
@@ -206,7 +210,10 @@ Add this file to the file registry:
 - Summary: {summary}
 """
     
-    return await update_experiment_readme(experiment_id, update_text)
+    return await update_experiment_readme.ainvoke({
+        "experiment_id": experiment_id,
+        "updates": update_text
+    })
 
 
 @tool
@@ -264,7 +271,13 @@ None reported.
         readme_path = exp_path / "README.md"
         readme_path.write_text(readme_content)
         
-        return f"Created experiment: {exp_folder}"
+        from src.memory.doc_index import index_changed_files
+        await asyncio.to_thread(index_changed_files, session.project_path, [readme_path])
+        if _llm_instance:
+            from src.memory.project_insights import schedule_insights_refresh
+            schedule_insights_refresh(session.project_path, _llm_instance)
+        
+        return f"Created experiment: {exp_folder_name}"
         
     except Exception as e:
         logger.error(f"Failed to create experiment: {e}")
@@ -272,38 +285,42 @@ None reported.
 
 
 @tool
-async def get_project_insights() -> str:
+async def get_project_insights(focus: str = "") -> str:
     """Get insights across all experiments in the project.
     
+    Reads the project's cached insights artifact; no LLM call unless it
+    has never been built.
+    
+    Args:
+        focus: Optional problem or aspect to draw insights for
+    
     Returns:
         Cross-experiment patterns and learnings
     """
     if not _memory_manager or not _llm_instance:
         return "Memory system not initialized"
     
-    experiments = _memory_manager.list_experiments()
-    if not experiments:
-        return "No experiments found"
+    from src.memory.project_insights import get_project_insights_store
     
-    # Collect successful patterns
-    all_insights = []
-    for exp in experiments[:5]:  # Limit to 5 for performance
-        memory = _memory_manager.read_memory(exp['name'])
-        if memory and len(memory.raw_content) > 100:
-            all_insights.append(f"{exp['name']}: {memory.raw_content[:500]}")
+    insights = get_project_insights_store(str(_memory_manager.project_root))
+    artifact = await asyncio.to_thread(insights.load)
+    if artifact is None:
+        # First use builds the artifact; later calls read it
+        artifact = await insights.refresh(_llm_instance)
+    elif await asyncio.to_thread(insights.is_stale):
+        # READMEs edited outside the app - serve what we have, rebuild behind
+        insights.schedule_refresh(_llm_instance, delay=0)
     
-    if not all_insights:
+    if not artifact.get("synthesis"):
         return "No experiment data available for insights"
     
-    prompt = f"""Based on these experiments, identify:
-1. Common successful approaches
-2. Recurring issues and solutions
-3. Best practices emerging
-
-Experiments:
-{chr(10).join(all_insights)}
-
-Provide actionable insights for future experiments."""
-    
-    response = _llm_instance.invoke([HumanMessage(content=prompt)])
-    return response.content
\ No newline at end of file
+    result = f"Insights across {len(artifact['experiments'])} experiments:\n{artifact['synthesis']}"
+    if focus:
+        chunks = await _retrieve(focus, k=6)
+        related = [e for e in artifact["experiments"] if any(c["path"].startswith(f"{e}/") for c in chunks)]
+        digests = insights.format_digests(artifact["experiments"], only=related)
+        if digests:
+            result += f"\n\nExperiments related to {focus}:\n{digests}"
+        if chunks:
+            result += f"\n\nRelevant passages:\n{_format_chunks(chunks)}"
+    return result
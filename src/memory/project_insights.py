@@ -0,0 +1,273 @@
+"""
+Cached cross-experiment insights for a project.
+
+Instead of asking the LLM for insights on every ``diagnose_issue`` or
+``suggest_optimization`` call, the project keeps an insights artifact at
+``<project>/.labacc/insights.json``:
+
+    - one short digest per experiment, keyed by the SHA-256 of its README,
+      so only experiments whose README changed are re-digested;
+    - a rolled-up synthesis of all digests, rebuilt only when a digest
+      changed or an experiment was added or removed.
+
+README saves schedule a debounced background rebuild; readers load the
+artifact from disk (cached by mtime) without any LLM call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+logger = logging.getLogger(__name__)
+
+INSIGHTS_NAME = "insights.json"
+INSIGHTS_VERSION = 1
+
+DIGEST_PROMPT = """Summarize this experiment README as a digest of at most 80 words.
+Cover: goal, methods and key conditions, results, issues and how they were solved.
+Only use facts stated in the README. Write in the README's language.
+
+Experiment: {experiment_id}
+
+README:
+{readme}"""
+
+SYNTHESIS_PROMPT = """Based on these per-experiment digests, identify:
+1. Common successful approaches
+2. Recurring issues and solutions
+3. Best practices emerging
+
+Digests:
+{digests}
+
+Provide actionable insights for future experiments. Name the experiments you draw on."""
+
+
+class ProjectInsights:
+    """Insights artifact of one project: per-experiment digests plus a synthesis."""
+
+    def __init__(self, project_root: str, max_readme_chars: int = 6000, max_concurrent: int = 4):
+        """Initialize the artifact.
+
+        Args:
+            project_root: Root folder of the project
+            max_readme_chars: README text sent to the LLM per digest
+            max_concurrent: Digest LLM calls run at once
+        """
+        self.project_root = Path(project_root).resolve()
+        self.path = self.project_root / ".labacc" / INSIGHTS_NAME
+        self.max_readme_chars = max_readme_chars
+        self.max_concurrent = max_concurrent
+        self._cached: Optional[Dict] = None
+        self._cached_mtime: Optional[int] = None
+        self._cache_lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._rerun = False
+
+    def load(self) -> Optional[Dict]:
+        """Read the artifact, or None if it was never built. Cached until the file changes."""
+        with self._cache_lock:
+            try:
+                mtime = self.path.stat().st_mtime_ns
+            except OSError:
+                return None
+            if self._cached is None or mtime != self._cached_mtime:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        artifact = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    logger.warning(f"Insights artifact unreadable, will rebuild: {e}")
+                    return None
+                if artifact.get("version") != INSIGHTS_VERSION:
+                    return None
+                self._cached, self._cached_mtime = artifact, mtime
+            return self._cached
+
+    def _save(self, artifact: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(artifact, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _readmes(self) -> Dict[str, Path]:
+        """Experiment id -> README path for every experiment in the project."""
+        from src.memory.memory import SimpleMemoryManager
+
+        return {
+            experiment_id: self.project_root / experiment_id / "README.md"
+            for experiment_id in SimpleMemoryManager(str(self.project_root)).list_experiments()
+        }
+
+    @staticmethod
+    def _signature(path: Path) -> List:
+        stat = path.stat()
+        return [stat.st_mtime, stat.st_size]
+
+    def is_stale(self) -> bool:
+        """Whether any README was added, removed or touched since the last build (stat only)."""
+        artifact = self.load()
+        if artifact is None:
+            return True
+        readmes = self._readmes()
+        known = artifact["experiments"]
+        if readmes.keys() != known.keys():
+            return True
+        try:
+            return any(self._signature(path) != known[exp]["signature"] for exp, path in readmes.items())
+        except OSError:
+            return True
+
+    async def refresh(self, llm) -> Dict:
+        """Rebuild the artifact where READMEs changed.
+
+        Concurrent callers share one rebuild.
+
+        Returns:
+            The up-to-date artifact
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            # A scheduled rebuild is pending or running - wait for it instead
+            await asyncio.shield(self._refresh_task)
+            artifact = await asyncio.to_thread(self.load)
+            if artifact is not None:
+                return artifact
+        self._refresh_task = asyncio.ensure_future(self._refresh(llm))
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self, llm) -> Dict:
+        previous = await asyncio.to_thread(self.load) or {}
+        known = previous.get("experiments", {})
+        readmes = await asyncio.to_thread(self._readmes)
+
+        experiments: Dict[str, Dict] = {}
+        to_digest: Dict[str, str] = {}
+        for experiment_id, path in readmes.items():
+            try:
+                signature = self._signature(path)
+                entry = known.get(experiment_id)
+                if entry and entry["signature"] == signature:
+                    experiments[experiment_id] = entry
+                    continue
+                readme = await asyncio.to_thread(path.read_text, encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Skipping {experiment_id} in project insights: {e}")
+                continue
+            sha = hashlib.sha256(readme.encode("utf-8")).hexdigest()
+            if entry and entry["readme_sha256"] == sha:
+                # Touched but unchanged - keep the digest
+                experiments[experiment_id] = {**entry, "signature": signature}
+                continue
+            experiments[experiment_id] = {"readme_sha256": sha, "signature": signature}
+            to_digest[experiment_id] = readme
+
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def digest(experiment_id: str, readme: str):
+            async with semaphore:
+                prompt = DIGEST_PROMPT.format(experiment_id=experiment_id, readme=readme[:self.max_readme_chars])
+                response = await llm.ainvoke([HumanMessage(content=prompt)])
+            experiments[experiment_id].update(
+                digest=response.content.strip(),
+                updated_at=datetime.now().isoformat(),
+            )
+
+        await asyncio.gather(*(digest(e, r) for e, r in to_digest.items()))
+
+        changed = bool(to_digest) or experiments.keys() != known.keys()
+        synthesis = previous.get("synthesis")
+        if experiments and (changed or not synthesis):
+            response = await llm.ainvoke([HumanMessage(content=SYNTHESIS_PROMPT.format(
+                digests=self.format_digests(experiments)
+            ))])
+            synthesis = response.content.strip()
+        elif not experiments:
+            synthesis = None
+
+        artifact = {
+            "version": INSIGHTS_VERSION,
+            "experiments": experiments,
+            "synthesis": synthesis,
+            "updated_at": datetime.now().isoformat() if changed else previous.get("updated_at"),
+        }
+        if changed or artifact != previous:
+            await asyncio.to_thread(self._save, artifact)
+        if to_digest:
+            logger.info(f"Project insights for {self.project_root.name}: re-digested {len(to_digest)} of "
+                        f"{len(experiments)} experiment(s)")
+        return artifact
+
+    def schedule_refresh(self, llm, delay: float = 5.0):
+        """Rebuild in the background after ``delay`` seconds; bursts of saves share one rebuild.
+
+        Does nothing outside a running event loop.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._rerun = True
+            return
+
+        async def run():
+            await asyncio.sleep(delay)
+            while True:
+                self._rerun = False
+                try:
+                    await self._refresh(llm)
+                except Exception as e:
+                    logger.warning(f"Background project insights rebuild failed: {e}")
+                if not self._rerun:
+                    break
+
+        self._refresh_task = loop.create_task(run())
+
+    @staticmethod
+    def format_digests(experiments: Dict[str, Dict], only: Optional[List[str]] = None) -> str:
+        """Render digests as ``- experiment: digest`` lines."""
+        return "\n".join(
+            f"- {experiment_id}: {entry['digest']}"
+            for experiment_id, entry in sorted(experiments.items())
+            if entry.get("digest") and (only is None or experiment_id in only)
+        )
+
+
+# Per-project artifacts
+_insights: Dict[str, ProjectInsights] = {}
+_insights_lock = threading.Lock()
+
+
+def get_project_insights_store(project_root: str) -> ProjectInsights:
+    """Get the insights artifact of a project, configured from ``insights``."""
+    key = str(Path(project_root).resolve())
+    with _insights_lock:
+        insights = _insights.get(key)
+        if insights is None:
+            from src.config.config import config
+
+            insights = _insights[key] = ProjectInsights(
+                key,
+                max_readme_chars=int(config.get("insights.max_readme_chars", 6000)),
+                max_concurrent=int(config.get("insights.max_concurrent", 4)),
+            )
+        return insights
+
+
+def schedule_insights_refresh(project_root: str, llm):
+    """Schedule a debounced rebuild after a README change; never raises."""
+    try:
+        from src.config.config import config
+
+        delay = float(config.get("insights.refresh_delay_seconds", 5))
+        get_project_insights_store(project_root).schedule_refresh(llm, delay)
+    except Exception as e:
+        logger.warning(f"Could not schedule project insights rebuild: {e}")
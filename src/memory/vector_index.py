@@ -0,0 +1,271 @@
+"""
+Local vector index for semantic retrieval across a project's experiments.
+
+Experiment READMEs and converted documents are split into chunks and
+embedded offline with the hashing trick: word unigrams and bigrams are
+hashed into a fixed number of signed buckets, weighted by log term
+frequency and L2-normalized. At query time the buckets are re-weighted by
+their inverse document frequency over the index, so rare lab-specific
+terms count for more than common words.
+
+The vectors are kept in ``<project>/.labacc/vector_index/vectors.npy``
+(memory-mapped on load) with the chunk metadata in ``meta.json``.
+``refresh`` re-embeds only files whose size or mtime changed; the vectors
+of unchanged files are carried over.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.memory.doc_index import split_lines
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = Path(".labacc") / "vector_index"
+INDEX_VERSION = 1
+DEFAULT_EXTENSIONS = (".md", ".txt")
+
+_TOKEN = re.compile(r"\w+", flags=re.UNICODE)
+
+
+def embed(text: str, dim: int) -> np.ndarray:
+    """Hashing-trick embedding of text (unigrams and bigrams), L2-normalized."""
+    tokens = [t for t in _TOKEN.findall(text.lower()) if len(t) > 1]
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    vector = np.zeros(dim, dtype=np.float32)
+    counts: Dict[str, int] = {}
+    for feature in features:
+        counts[feature] = counts.get(feature, 0) + 1
+    for feature, count in counts.items():
+        h = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % dim] += sign * (1.0 + np.log(count))
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Hashed-embedding chunk index of the documents in one project."""
+
+    def __init__(self, project_root: str, extensions=DEFAULT_EXTENSIONS, dim: int = 2048,
+                 chunk_lines: int = 12, max_file_bytes: int = 2 * 1024 * 1024):
+        """Initialize the index.
+
+        Args:
+            project_root: Root folder of the project
+            extensions: File extensions to index
+            dim: Number of hash buckets per vector
+            chunk_lines: Lines per chunk
+            max_file_bytes: Larger files are skipped
+        """
+        self.project_root = Path(project_root).resolve()
+        self.index_dir = self.project_root / INDEX_DIR
+        self.extensions = {e.lower() for e in extensions}
+        self.dim = dim
+        self.chunk_lines = chunk_lines
+        self.max_file_bytes = max_file_bytes
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._meta: Optional[Dict] = None
+        self._idf: Optional[np.ndarray] = None
+        self._row_norms: Optional[np.ndarray] = None
+
+    def _load(self):
+        """Load the index from disk (vectors memory-mapped), or start empty."""
+        if self._meta is not None:
+            return
+        meta_path = self.index_dir / "meta.json"
+        vectors_path = self.index_dir / "vectors.npy"
+        meta, vectors = None, None
+        if meta_path.exists() and vectors_path.exists():
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                vectors = np.load(vectors_path, mmap_mode="r")
+                if (meta.get("version") != INDEX_VERSION or meta.get("dim") != self.dim
+                        or vectors.shape != (len(meta["chunks"]), self.dim)):
+                    logger.info(f"Vector index for {self.project_root.name} is stale, rebuilding")
+                    meta, vectors = None, None
+            except (json.JSONDecodeError, OSError, ValueError, KeyError) as e:
+                logger.warning(f"Vector index unreadable, rebuilding: {e}")
+                meta, vectors = None, None
+        if meta is None:
+            meta = {"version": INDEX_VERSION, "dim": self.dim, "files": {}, "chunks": []}
+            vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._meta, self._vectors, self._idf = meta, vectors, None
+
+    def _save(self, meta: Dict, vectors: np.ndarray):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        tmp_vectors = self.index_dir / f"vectors.{pid}.tmp.npy"
+        tmp_meta = self.index_dir / f"meta.{pid}.tmp"
+        np.save(tmp_vectors, vectors)
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_vectors, self.index_dir / "vectors.npy")
+        os.replace(tmp_meta, self.index_dir / "meta.json")
+        self._meta, self._vectors, self._idf = meta, vectors, None
+
+    def _documents(self) -> Dict[str, os.stat_result]:
+        """Indexable files under the project, outside hidden folders."""
+        found = {}
+        for root, dirs, files in os.walk(self.project_root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                path = Path(root) / name
+                if path.suffix.lower() not in self.extensions:
+                    continue
+                try:
+                    found[str(path.relative_to(self.project_root))] = path.stat()
+                except OSError:
+                    continue
+        return found
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the index up to date with the files on disk.
+
+        Only new or changed files are re-read and re-embedded.
+
+        Returns:
+            Counts of ``indexed``, ``removed`` and ``unchanged`` files
+        """
+        with self._lock:
+            self._load()
+            old_meta, old_vectors = self._meta, self._vectors
+            documents = self._documents()
+
+            unchanged = {
+                rel for rel, stat in documents.items()
+                if old_meta["files"].get(rel) == [stat.st_mtime, stat.st_size]
+            }
+            counts = {
+                "indexed": len(documents) - len(unchanged),
+                "removed": len(old_meta["files"].keys() - documents.keys()),
+                "unchanged": len(unchanged),
+            }
+            if not counts["indexed"] and not counts["removed"]:
+                return counts
+
+            # Carry over the vectors of unchanged files, embed the rest
+            keep = [i for i, chunk in enumerate(old_meta["chunks"]) if chunk["path"] in unchanged]
+            chunks = [old_meta["chunks"][i] for i in keep]
+            new_vectors = [np.asarray(old_vectors[keep], dtype=np.float32)] if keep else []
+            files = {rel: old_meta["files"][rel] for rel in unchanged}
+
+            for rel in sorted(documents.keys() - unchanged):
+                stat = documents[rel]
+                files[rel] = [stat.st_mtime, stat.st_size]
+                if stat.st_size > self.max_file_bytes:
+                    continue
+                try:
+                    text = (self.project_root / rel).read_text(encoding="utf-8", errors="replace")
+                except OSError as e:
+                    logger.warning(f"Could not embed {rel}: {e}")
+                    continue
+                embedded = []
+                for start, end, content in split_lines(text, self.chunk_lines):
+                    chunks.append({"path": rel, "start_line": start, "end_line": end, "text": content})
+                    embedded.append(embed(content, self.dim))
+                if embedded:
+                    new_vectors.append(np.vstack(embedded))
+
+            vectors = np.vstack(new_vectors) if new_vectors else np.zeros((0, self.dim), dtype=np.float32)
+            self._save({"version": INDEX_VERSION, "dim": self.dim, "files": files, "chunks": chunks}, vectors)
+
+        logger.info(f"Vector index for {self.project_root.name}: {counts}")
+        return counts
+
+    def _weights(self):
+        """IDF bucket weights and the norms of the IDF-weighted chunk vectors (cached)."""
+        if self._idf is None:
+            vectors = np.asarray(self._vectors)
+            df = np.count_nonzero(vectors, axis=0)
+            self._idf = np.log((1 + len(vectors)) / (1 + df)).astype(np.float32) + 1.0
+            norms = np.linalg.norm(vectors * self._idf, axis=1)
+            norms[norms == 0] = 1.0
+            self._row_norms = norms
+        return self._idf, self._row_norms
+
+    def search(self, query: str, k: int = 8, path_prefix: Optional[str] = None,
+               per_file: Optional[int] = None, min_score: float = 0.05) -> List[Dict]:
+        """Find the chunks most similar to a query (cosine similarity).
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+            path_prefix: Only return chunks of files under this project-relative folder
+            per_file: At most this many chunks per file
+            min_score: Drop chunks scoring below this
+
+        Returns:
+            Chunks (``path``, ``start_line``, ``end_line``, ``text``, ``score``), best first
+        """
+        with self._lock:
+            self._load()
+            if not len(self._vectors):
+                return []
+            idf, row_norms = self._weights()
+            q = embed(query, self.dim) * idf
+            norm = np.linalg.norm(q)
+            if not norm:
+                return []
+            # cos(v * idf, q) without materializing the weighted matrix
+            scores = (self._vectors @ (q * idf / norm)) / row_norms
+            chunks = self._meta["chunks"]
+
+        prefix = path_prefix.strip("/") + "/" if path_prefix else ""
+        results: List[Dict] = []
+        taken: Dict[str, int] = {}
+        for i in np.argsort(-scores):
+            score = float(scores[i])
+            if score < min_score:
+                break
+            chunk = chunks[i]
+            if prefix and not chunk["path"].startswith(prefix):
+                continue
+            if per_file and taken.get(chunk["path"], 0) >= per_file:
+                continue
+            taken[chunk["path"]] = taken.get(chunk["path"], 0) + 1
+            results.append({**chunk, "score": round(score, 3)})
+            if len(results) >= k:
+                break
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Number of indexed files and chunks."""
+        with self._lock:
+            self._load()
+            return {"files": len(self._meta["files"]), "chunks": len(self._meta["chunks"])}
+
+
+# Per-project index instances
+_indexes: Dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(project_root: str) -> VectorIndex:
+    """Get the vector index for a project, configured from ``vector_index``."""
+    key = str(Path(project_root).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            from src.config.config import config
+
+            index = _indexes[key] = VectorIndex(
+                key,
+                extensions=config.get("vector_index.extensions", DEFAULT_EXTENSIONS),
+                dim=int(config.get("vector_index.dim", 2048)),
+                chunk_lines=int(config.get("vector_index.chunk_lines", 12)),
+                max_file_bytes=int(float(config.get("vector_index.max_file_mb", 2)) * 1024 * 1024),
+            )
+        return index
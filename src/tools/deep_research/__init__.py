@@ -1,7 +1,9 @@
-from .api import run_deep_research
+from .api import arun_deep_research, describe_stop_reason, run_deep_research
+from .budget import ResearchBudget
 
 __all__ = [
+    "ResearchBudget",
+    "arun_deep_research",
+    "describe_stop_reason",
     "run_deep_research",
 ]
-
-
@@ -3,16 +3,162 @@ Programmatic API for the deep research graph.
 
 Provides a simple function for agents/workflows to invoke deep research
 and get back a final markdown report string (and raw AI message content).
+
+The graph is fully async. ``arun_deep_research`` is the entry point for
+code running on the event loop; the number of research runs executing at
+once is capped by ``deep_research.max_concurrent_runs`` so several users
+researching together cannot flood the LLM and search providers.
+Finished reports are cached for ``deep_research.result_cache.freshness_hours``
+(unless a budget limit cut the run short) and identical requests arriving
+while one is running share that run.
+Given a project, reports are kept in its ``.labacc/research`` store (see
+report_store.py) and reused from there first.
+``run_deep_research`` is a blocking wrapper for scripts.
 """
 
+import asyncio
+import logging
+import time
+import uuid
+import weakref
+from datetime import timedelta
 from typing import Any
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config.config import config
+
+from .budget import BUDGET_STOPS, STOP_REASON_TEXT, ResearchBudget
+from .consolidate import release_consolidator
+from .graph import deep_research_graph, harvest_markdown
+from .report_store import ReportStore
+from .result_cache import get_result_cache, make_research_key
+from .search_cache import get_search_cache
+
+logger = logging.getLogger(__name__)
+
+# One semaphore per event loop - asyncio primitives cannot be shared across loops
+_run_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_run_slots() -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent research runs on the running loop."""
+    loop = asyncio.get_running_loop()
+    slots = _run_slots.get(loop)
+    if slots is None:
+        limit = max(1, int(config.get("deep_research.max_concurrent_runs", 2)))
+        slots = _run_slots[loop] = asyncio.Semaphore(limit)
+    return slots
+
+
+# In-flight research runs per event loop, keyed like the result cache
+_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _run_graph(state: dict[str, Any], key: str) -> dict[str, Any]:
+    """Run the graph in a research slot and cache the finished report."""
+    slots = _get_run_slots()
+    if slots.locked():
+        logger.info(f"Deep research queued, all research slots busy: {state['messages'][0].content[:80]}")
+    # Our own run id, so the run's consolidator is released even if the graph fails
+    state = {**state, "research_id": state.get("research_id") or uuid.uuid4().hex}
+    async with slots:
+        # The time budget counts from here, not from when the run was queued
+        if state.get("research_budget"):
+            state["research_budget"] = {**state["research_budget"], "started_at": time.time()}
+        try:
+            result = await deep_research_graph.ainvoke(state)
+        finally:
+            release_consolidator(state["research_id"])
+    logger.info(f"Search cache: {get_search_cache().stats_line()}")
+
+    messages = result.get("messages", [])
+    final_text = messages[-1].content if messages else ""
+    saved_path = result.get("saved_path")
+    stop_reason = result.get("stop_reason")
+    sources = list(dict.fromkeys(s["value"] for s in result.get("sources_gathered", []) if s.get("value")))
+    budget = result.get("research_budget") or {}
+    usage = {
+        "searches": result.get("searches_used", 0),
+        "tokens": result.get("tokens_used", 0),
+        "tokens_saved": result.get("tokens_saved", 0),
+        "seconds": round(time.time() - budget["started_at"], 1) if budget.get("started_at") else None,
+    }
+    logger.info(f"Deep research stopped ({stop_reason}): {usage['searches']} searches, "
+                f"~{usage['tokens']} tokens (~{usage['tokens_saved']} saved by consolidation), "
+                f"{usage['seconds']}s")
+
+    # Budget-truncated reports are not cached: the key does not include the budget
+    cache = get_result_cache()
+    if cache is not None and final_text and stop_reason not in BUDGET_STOPS:
+        await asyncio.to_thread(cache.set, key, final_text, saved_path, stop_reason, sources)
+
+    return {
+        "messages": messages,
+        "final_text": final_text,
+        "saved_path": saved_path,
+        "stop_reason": stop_reason,
+        "sources": sources,
+        "usage": usage,
+    }
+
 
-from .graph import deep_research_graph
+def describe_stop_reason(stop_reason: str | None) -> str:
+    """Human-readable explanation of why a research run stopped."""
+    return STOP_REASON_TEXT.get(stop_reason, "research completed")
 
 
-def run_deep_research(
+def _reuse_window() -> timedelta:
+    """How old a project's stored report may be and still answer a repeated question."""
+    days = float(config.get("deep_research.report_store.reuse_days", 30))
+    return timedelta(days=days) if days > 0 else timedelta(0)
+
+
+def _save_to_project(store: ReportStore, key: str, query: str, result: dict[str, Any]) -> str:
+    """Store a research result in the project's report store, returning its path."""
+    try:
+        title, markdown = harvest_markdown(result["final_text"])
+    except ValueError:
+        title, markdown = query[:80], result["final_text"]
+    entry = store.save(key, query, title, markdown, result.get("sources", []), result.get("stop_reason"))
+    return entry["full_path"]
+
+
+async def _obtain_result(state: dict[str, Any], key: str, query: str) -> dict[str, Any]:
+    """Get a research result from the result cache, an identical in-flight run, or a new run."""
+    cache = get_result_cache()
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            logger.info(f"Serving cached deep research report for: {query[:80]}")
+            return {
+                "messages": [AIMessage(content=cached["final_text"])],
+                "final_text": cached["final_text"],
+                "saved_path": cached.get("saved_path"),
+                "stop_reason": cached.get("stop_reason"),
+                "sources": cached.get("sources", []),
+                "usage": {"searches": 0, "tokens": 0, "tokens_saved": 0, "seconds": 0},
+                "cache": "hit",
+            }
+
+    inflight = _inflight.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(key)
+    if task is not None:
+        logger.info(f"Joining in-flight deep research for: {query[:80]}")
+        # Shielded so one caller giving up does not cancel the run for the others
+        return {**await asyncio.shield(task), "cache": "coalesced"}
+
+    task = asyncio.create_task(_run_graph(state, key))
+    inflight[key] = task
+    task.add_done_callback(lambda _: inflight.pop(key, None))
+    return {**await asyncio.shield(task), "cache": "miss"}
+
+
+async def arun_deep_research(
     query: str,
     *,
     initial_search_query_count: int = 10,
@@ -20,9 +166,21 @@ def run_deep_research(
     verbose: bool = True,
     response_language: str | None = None,
     output_dir: str | None = None,
+    budget: ResearchBudget | None = None,
+    project_root: str | None = None,
 ) -> dict[str, Any]:
     """
-    Execute the deep research workflow and return the final result.
+    Execute the deep research workflow on the running event loop.
+
+    With a ``project_root``, the project's report store is checked first and
+    a report for the same question younger than
+    ``deep_research.report_store.reuse_days`` is returned without any web
+    calls, unless a budget limit cut that report short; new reports are
+    saved there. Otherwise a fresh cached report for
+    the same normalized query, language and settings is returned without
+    running the graph, and a request identical to one already running waits
+    for that run instead of starting another. New runs wait for a free slot
+    if ``deep_research.max_concurrent_runs`` research runs are in progress.
 
     Args:
         query: Research question/topic.
@@ -30,32 +188,64 @@ def run_deep_research(
         max_research_loops: Maximum reflection/search loops.
         verbose: Whether to log progress.
         response_language: Force response language; if None, model decides.
+        output_dir: Directory for the saved report when not using a project.
+        budget: Time, token and search limits; defaults to ``deep_research.budget``.
+        project_root: Project whose ``.labacc/research`` store is used.
 
     Returns:
         Dict with keys:
             - messages: List of messages from the graph, last one contains final content
             - final_text: Raw text content from the final AI message
+            - saved_path: Path of the saved markdown report
+            - stop_reason: Why the research loop stopped (see budget.py)
+            - sources: URLs cited in the report
+            - usage: Searches, estimated LLM tokens, tokens saved by search
+              result consolidation, and seconds used
+            - cache: "project", "hit", "coalesced" or "miss"
     """
+    key = make_research_key(query, response_language, initial_search_query_count, max_research_loops)
+
+    store = ReportStore(project_root) if project_root else None
+    if store is not None:
+        stored = await asyncio.to_thread(store.get, key, _reuse_window())
+        # A budget-truncated report stays readable in the store but is researched again
+        if stored is not None and stored.get("stop_reason") not in BUDGET_STOPS:
+            logger.info(f"Reusing project research report {stored['id']} for: {query[:80]}")
+            return {
+                "messages": [AIMessage(content=stored["markdown"])],
+                "final_text": stored["markdown"],
+                "saved_path": stored["full_path"],
+                "stop_reason": stored.get("stop_reason"),
+                "sources": stored.get("sources", []),
+                "usage": {"searches": 0, "tokens": 0, "tokens_saved": 0, "seconds": 0},
+                "cache": "project",
+            }
 
     state: dict[str, Any] = {
         "messages": [HumanMessage(content=query)],
         "initial_search_query_count": int(initial_search_query_count),
         "max_research_loops": int(max_research_loops),
         "verbose": bool(verbose),
+        "research_budget": (budget or ResearchBudget.from_config()).start(),
     }
     if response_language:
         state["response_language"] = response_language
     if output_dir:
         state["output_dir"] = output_dir
 
-    result = deep_research_graph.invoke(state)
-    messages = result.get("messages", [])
-    final_text = messages[-1].content if messages else ""
+    result = await _obtain_result(state, key, query)
 
-    return {
-        "messages": messages,
-        "final_text": final_text,
-        "saved_path": result.get("saved_path"),
-    }
+    if store is not None and result["final_text"]:
+        result = {**result, "saved_path": await asyncio.to_thread(_save_to_project, store, key, query, result)}
+    return result
 
 
+def run_deep_research(query: str, **kwargs) -> dict[str, Any]:
+    """
+    Execute the deep research workflow and return the final result.
+
+    Blocking wrapper around ``arun_deep_research`` for scripts and tests;
+    must not be called from a running event loop. Accepts the same keyword
+    arguments.
+    """
+    return asyncio.run(arun_deep_research(query, **kwargs))
@@ -0,0 +1,141 @@
+"""
+Research budget and follow-up query scheduling for the deep research graph.
+
+A budget caps wall-clock time, LLM tokens and search calls for one research
+run. It travels through the graph as a plain dict in ``OverallState``
+(``research_budget``) next to the running totals ``searches_used`` and
+``tokens_used``; a limit of 0 means unlimited. When a limit is reached the
+reflection node stops the loop and the report is written from the
+summaries gathered so far. The reason is kept in ``stop_reason``.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Why a research run stopped
+STOP_SUFFICIENT = "sufficient"
+STOP_MAX_LOOPS = "max_loops"
+STOP_NO_NEW_QUERIES = "no_new_queries"
+STOP_TIME_BUDGET = "time_budget"
+STOP_TOKEN_BUDGET = "token_budget"
+STOP_SEARCH_BUDGET = "search_budget"
+
+# Reports cut short by a budget limit; a run with a larger budget may do better
+BUDGET_STOPS = frozenset({STOP_TIME_BUDGET, STOP_TOKEN_BUDGET, STOP_SEARCH_BUDGET})
+
+STOP_REASON_TEXT = {
+    STOP_SUFFICIENT: "the gathered sources were judged sufficient",
+    STOP_MAX_LOOPS: "the maximum number of research loops was reached",
+    STOP_NO_NEW_QUERIES: "all follow-up queries duplicated earlier searches",
+    STOP_TIME_BUDGET: "the time budget ran out",
+    STOP_TOKEN_BUDGET: "the LLM token budget ran out",
+    STOP_SEARCH_BUDGET: "the search budget ran out",
+}
+
+
+@dataclass
+class ResearchBudget:
+    """Limits for one research run; 0 means unlimited."""
+    max_seconds: float = 0
+    max_tokens: int = 0
+    max_searches: int = 0
+
+    @classmethod
+    def from_config(cls) -> "ResearchBudget":
+        """Build the budget from ``deep_research.budget``."""
+        from src.config.config import config
+
+        return cls(
+            max_seconds=float(config.get("deep_research.budget.max_seconds", 0) or 0),
+            max_tokens=int(config.get("deep_research.budget.max_tokens", 0) or 0),
+            max_searches=int(config.get("deep_research.budget.max_searches", 0) or 0),
+        )
+
+    def start(self) -> Dict:
+        """State representation of the budget, with the run's start time."""
+        return {
+            "max_seconds": self.max_seconds,
+            "max_tokens": self.max_tokens,
+            "max_searches": self.max_searches,
+            "started_at": time.time(),
+        }
+
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for text (about four characters per token)."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def message_tokens(prompt: str, response) -> int:
+    """Tokens used by one LLM call, from usage metadata when the model reports it."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    if hasattr(response, "model_dump_json"):
+        output = response.model_dump_json()
+    else:
+        output = str(getattr(response, "content", response))
+    return estimate_tokens(str(prompt)) + estimate_tokens(output)
+
+
+def time_exhausted(budget: Optional[Dict]) -> bool:
+    """Whether the run has used up its time budget."""
+    if not budget or not budget.get("max_seconds"):
+        return False
+    return time.time() - budget["started_at"] >= budget["max_seconds"]
+
+
+def exhausted_reason(budget: Optional[Dict], searches_used: int, tokens_used: int) -> Optional[str]:
+    """Get the stop reason if any budget limit has been reached, else None."""
+    if not budget:
+        return None
+    if time_exhausted(budget):
+        return STOP_TIME_BUDGET
+    if budget.get("max_tokens") and tokens_used >= budget["max_tokens"]:
+        return STOP_TOKEN_BUDGET
+    if budget.get("max_searches") and searches_used >= budget["max_searches"]:
+        return STOP_SEARCH_BUDGET
+    return None
+
+
+def remaining_searches(budget: Optional[Dict], searches_used: int) -> Optional[int]:
+    """Searches left in the budget, or None if unlimited."""
+    if not budget or not budget.get("max_searches"):
+        return None
+    return max(0, budget["max_searches"] - searches_used)
+
+
+def _terms(query: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", query.lower()))
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the word sets of two queries."""
+    terms_a, terms_b = _terms(a), _terms(b)
+    if not terms_a or not terms_b:
+        return 0.0
+    return len(terms_a & terms_b) / len(terms_a | terms_b)
+
+
+def dedupe_queries(queries: List[str], already_run: List[str], threshold: float = 0.8) -> List[str]:
+    """Drop queries that are near-duplicates of each other or of queries already run.
+
+    Args:
+        queries: Candidate queries, in priority order
+        already_run: Queries searched earlier in this run
+        threshold: Word-set similarity at or above which two queries count as duplicates
+
+    Returns:
+        The candidates to keep, in their original order
+    """
+    kept: List[str] = []
+    for query in queries:
+        if any(similarity(query, other) >= threshold for other in list(already_run) + kept):
+            continue
+        kept.append(query)
+    return kept
@@ -0,0 +1,185 @@
+"""
+Consolidate search results before they are summarized.
+
+Each ``web_research`` node used to paste the full Tavily response into its
+prompt, so a page returned by several of the parallel queries was read and
+summarized once per query, boilerplate chunks included. Consolidation runs
+per query, before the LLM call:
+
+    1. Drop results whose URL was already handed to another query of the
+       same research run (the first query to see a URL keeps it).
+    2. Split the remaining content into chunks and drop boilerplate ones
+       (cookie banners, newsletter prompts, navigation) and fragments.
+    3. Keep the chunks that share the most terms with the query until the
+       per-query character budget is used.
+
+The characters removed are converted to an estimated token count and
+reported per run.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .budget import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+# Tavily joins the chunks of one source with "[...]"
+_CHUNK_SPLIT = re.compile(r"\s*\[\.\.\.\]\s*|\n{2,}")
+
+_BOILERPLATE = re.compile(
+    r"cookie|subscribe|newsletter|sign (?:in|up)|log in|all rights reserved|privacy policy|"
+    r"terms of (?:use|service)|advertisement|javascript|download (?:on|the) app|"
+    r"tells the innovative stories|data:image/",
+    re.IGNORECASE,
+)
+
+_TRACKING_PARAMS = {"ref", "fbclid", "gclid"}
+
+# Consolidators of recent research runs, keyed by research id
+_MAX_RUNS = 64
+_consolidators: "OrderedDict[str, SearchConsolidator]" = OrderedDict()
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so trivially different links to one page compare equal."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not (k.lower().startswith("utm_") or k.lower() in _TRACKING_PARAMS)
+    ])
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def _terms(text: str) -> set:
+    return {t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 2}
+
+
+def _score(chunk: str, query_terms: set) -> float:
+    """Share of query terms found in the chunk."""
+    if not query_terms:
+        return 0.0
+    return len(query_terms & _terms(chunk)) / len(query_terms)
+
+
+class SearchConsolidator:
+    """Tracks URLs already used in one research run and the characters saved."""
+
+    def __init__(self, max_chars_per_query: int = 6000, min_chunk_chars: int = 40):
+        """Initialize the consolidator.
+
+        Args:
+            max_chars_per_query: Character budget for the results of one query (0 = unlimited)
+            min_chunk_chars: Chunks shorter than this are dropped as fragments
+        """
+        self.max_chars_per_query = max_chars_per_query
+        self.min_chunk_chars = min_chunk_chars
+        self.seen_urls: set = set()
+        self.chars_in = 0
+        self.chars_out = 0
+        self.duplicate_results = 0
+        self.dropped_chunks = 0
+
+    def consolidate(self, query: str, results: List[Dict]) -> Tuple[List[Dict], int]:
+        """Dedupe, filter and trim the search results for one query.
+
+        Args:
+            query: The search query, used to score chunks
+            results: Tavily results (``title``, ``url``, ``content``, ``score``)
+
+        Returns:
+            Consolidated results (``title``, ``url``, ``content``) and the
+            estimated tokens saved for this query
+        """
+        chars_in = sum(len(str(r)) for r in results)
+        query_terms = _terms(query)
+
+        # Candidate chunks: (score, result index, chunk index, text)
+        fresh: List[Dict] = []
+        candidates = []
+        for result in results:
+            url = normalize_url(result.get("url", ""))
+            if url in self.seen_urls:
+                self.duplicate_results += 1
+                continue
+            self.seen_urls.add(url)
+
+            index = len(fresh)
+            fresh.append(result)
+            for chunk_index, chunk in enumerate(_CHUNK_SPLIT.split(result.get("content") or "")):
+                chunk = chunk.strip()
+                if len(chunk) < self.min_chunk_chars or _BOILERPLATE.search(chunk):
+                    self.dropped_chunks += 1
+                    continue
+                # Ties keep the search engine's ranking
+                weight = _score(chunk, query_terms) + 0.1 * float(result.get("score") or 0)
+                candidates.append((weight, index, chunk_index, chunk))
+
+        # Best chunks first until the budget is spent
+        candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+        kept: Dict[int, List[Tuple[int, str]]] = {}
+        used = 0
+        for weight, index, chunk_index, chunk in candidates:
+            if self.max_chars_per_query and used + len(chunk) > self.max_chars_per_query:
+                self.dropped_chunks += 1
+                continue
+            kept.setdefault(index, []).append((chunk_index, chunk))
+            used += len(chunk)
+
+        consolidated = [
+            {
+                "title": fresh[index].get("title", ""),
+                "url": fresh[index].get("url", ""),
+                "content": " [...] ".join(chunk for _, chunk in sorted(kept[index])),
+            }
+            for index in sorted(kept)
+        ]
+
+        chars_out = sum(len(str(r)) for r in consolidated)
+        self.chars_in += chars_in
+        self.chars_out += chars_out
+        return consolidated, max(0, chars_in - chars_out) // CHARS_PER_TOKEN
+
+    def stats(self) -> Dict:
+        """Characters in and out, duplicates and dropped chunks for the run so far."""
+        return {
+            "chars_in": self.chars_in,
+            "chars_out": self.chars_out,
+            "duplicate_results": self.duplicate_results,
+            "dropped_chunks": self.dropped_chunks,
+        }
+
+
+def get_consolidator(research_id: Optional[str]) -> SearchConsolidator:
+    """Get the consolidator shared by all queries of a research run.
+
+    Runs without an id get a private consolidator, so results are still
+    filtered and trimmed but not deduplicated across queries.
+    """
+    from src.config.config import config
+
+    def create():
+        return SearchConsolidator(
+            max_chars_per_query=int(config.get("deep_research.consolidation.max_chars_per_query", 6000)),
+            min_chunk_chars=int(config.get("deep_research.consolidation.min_chunk_chars", 40)),
+        )
+
+    if not research_id:
+        return create()
+    consolidator = _consolidators.get(research_id)
+    if consolidator is None:
+        consolidator = _consolidators[research_id] = create()
+        while len(_consolidators) > _MAX_RUNS:
+            _consolidators.popitem(last=False)
+    return consolidator
+
+
+def release_consolidator(research_id: Optional[str]) -> Optional[Dict]:
+    """Forget a finished run's consolidator, returning its final stats."""
+    consolidator = _consolidators.pop(research_id, None) if research_id else None
+    return consolidator.stats() if consolidator else None
@@ -1,5 +1,6 @@
 import os
 import re
+import uuid
 
 from langchain_core.messages import AIMessage
 from langgraph.graph import END, START, StateGraph
@@ -16,6 +17,19 @@ _dr_config = config.get_deep_research_config()
 FAN_OUT_QUERIES = _dr_config["initial_search_query_count"]
 MAX_RESEARCH_LOOPS = _dr_config["max_research_loops"]
 SEARCH_RESULTS_PER_QUERY = _dr_config.get("search_results_per_query", 5)
+FOLLOW_UP_SIMILARITY = config.get("deep_research.budget.follow_up_similarity", 0.8)
+from .budget import (
+    STOP_MAX_LOOPS,
+    STOP_NO_NEW_QUERIES,
+    STOP_SEARCH_BUDGET,
+    STOP_SUFFICIENT,
+    dedupe_queries,
+    exhausted_reason,
+    message_tokens,
+    remaining_searches,
+    time_exhausted,
+)
+from .consolidate import get_consolidator, release_consolidator
 from .prompts import (
     answer_instructions,
     get_current_date,
@@ -29,12 +43,12 @@ from .state import (
     ReflectionState,
     WebSearchState,
 )
-from .tools_and_schemas import Reflection, SearchQueryList, search_with_tavily
+from .tools_and_schemas import Reflection, SearchQueryList, asearch_with_tavily
 from .utils import get_research_topic
 
 
 # Nodes
-def generate_query(state: OverallState) -> QueryGenerationState:
+async def generate_query(state: OverallState) -> QueryGenerationState:
     """LangGraph node that generates search queries based on the User's question.
 
     Use query writer LLM to create an optimized search queries for web research based on
@@ -63,15 +77,24 @@ def generate_query(state: OverallState) -> QueryGenerationState:
         # language_mode=state.get("language_mode", "query_in_english"),
     )
     # Generate the search queries
-    result = structured_llm.invoke(formatted_prompt)
+    result = await structured_llm.ainvoke(formatted_prompt)
     if state.get("verbose", False):
         # print(f"[bold green]Formatted prompt:[/bold green]\n\t{formatted_prompt}")
         print(f"[bold orange]Search queries:[/bold orange]\n\t{result}")
+
+    # Near-duplicate queries would only fetch the same sources again
+    queries = dedupe_queries(result.query, [], FOLLOW_UP_SIMILARITY)
+    remaining = remaining_searches(state.get("research_budget"), 0)
+    if remaining is not None:
+        queries = queries[:max(1, remaining)]
     return {
-        "search_query": result.query,
+        "search_query": queries,
         "verbose": state.get("verbose", False),
         "response_language": result.response_language,
         "language_mode": state.get("language_mode", "english"),
+        "research_budget": state.get("research_budget"),
+        "research_id": state.get("research_id") or uuid.uuid4().hex,
+        "tokens_used": message_tokens(formatted_prompt, result),
     }
 
 
@@ -88,13 +111,15 @@ def continue_to_web_research(state: QueryGenerationState):
                 "id": int(idx),
                 "verbose": state.get("verbose", False),
                 "response_language": state.get("response_language", "English"),
+                "research_budget": state.get("research_budget"),
+                "research_id": state.get("research_id"),
             },
         )
         for idx, search_query in enumerate(state["search_query"])
     ]
 
 
-def web_research(state: WebSearchState) -> OverallState:
+async def web_research(state: WebSearchState) -> OverallState:
     """LangGraph node that performs web research using Tavily Search API.
 
     Args:
@@ -107,11 +132,23 @@ def web_research(state: WebSearchState) -> OverallState:
         print(
             f"[bold blue]Web Query:[/bold blue]\n\t{state['search_query']}"
         )
+    # Out of time - skip the search and let reflection wrap up with what we have
+    if time_exhausted(state.get("research_budget")):
+        return {"search_query": [state["search_query"]]}
+
     # do the search using Tavily Search API
-    tavily_response = search_with_tavily(
+    tavily_response = await asearch_with_tavily(
         state["search_query"], count=SEARCH_RESULTS_PER_QUERY
     )
 
+    # Drop sources another query of this run already covers, boilerplate and overflow
+    tavily_response, tokens_saved = get_consolidator(state.get("research_id")).consolidate(
+        state["search_query"], tavily_response
+    )
+    if not tavily_response:
+        # Nothing new to read - skip the LLM call
+        return {"search_query": [state["search_query"]], "searches_used": 1, "tokens_saved": tokens_saved}
+
     web_search_prompt = web_searcher_instructions.format(
         current_date=get_current_date(),
         research_topic=state["search_query"],
@@ -122,7 +159,7 @@ def web_research(state: WebSearchState) -> OverallState:
     # send this to the LLM TRIAGE
     if state.get("verbose", False):
         print("[bold blue]Reading Tavily[/bold blue]")
-    llm_response = LLM_SMALL.invoke(web_search_prompt)
+    llm_response = await LLM_SMALL.ainvoke(web_search_prompt)
     content = llm_response.content
     if not content:
         raise ValueError(
@@ -154,6 +191,9 @@ def web_research(state: WebSearchState) -> OverallState:
         "sources_gathered": sources_gathered,
         "search_query": [state["search_query"]],
         "web_research_result": [content],
+        "searches_used": 1,
+        "tokens_used": message_tokens(web_search_prompt, llm_response),
+        "tokens_saved": tokens_saved,
     }
     # If verbose mode is enabled, add the verbose flag to the result
     # if state.get("verbose", False):
@@ -162,7 +202,7 @@ def web_research(state: WebSearchState) -> OverallState:
     return result
 
 
-def reflection(state: OverallState) -> ReflectionState:
+async def reflection(state: OverallState) -> ReflectionState:
     """LangGraph node that identifies knowledge gaps and generates potential follow-up queries.
 
     Analyzes the current summary to identify areas for further research and generates
@@ -181,6 +221,23 @@ def reflection(state: OverallState) -> ReflectionState:
     state["research_loop_count"] = state.get("research_loop_count", 0) + 1
     reasoning_model = LLM_TRIAGE
 
+    budget = state.get("research_budget")
+    searches_used = state.get("searches_used", 0)
+    tokens_used = state.get("tokens_used", 0)
+    stop_reason = exhausted_reason(budget, searches_used, tokens_used)
+    if stop_reason:
+        # Budget spent - skip reflecting and finalize with the summaries so far
+        print(f"[bold orange]Research budget reached:[/bold orange] {stop_reason}")
+        return {
+            "is_sufficient": False,
+            "knowledge_gap": "",
+            "useful_expansion": "",
+            "follow_up_queries": [],
+            "research_loop_count": state["research_loop_count"],
+            "number_of_ran_queries": len(state["search_query"]),
+            "stop_reason": stop_reason,
+        }
+
     # Format the prompt
     current_date = get_current_date()
     formatted_prompt = reflection_instructions.format(
@@ -194,7 +251,7 @@ def reflection(state: OverallState) -> ReflectionState:
     while counter < 3:
         try:
             # Invoke the LLM with structured output
-            result = reasoning_model.with_structured_output(Reflection).invoke(
+            result = await reasoning_model.with_structured_output(Reflection).ainvoke(
                 formatted_prompt
             )
             break  # Exit loop if successful
@@ -209,13 +266,42 @@ def reflection(state: OverallState) -> ReflectionState:
         )
     else:
         print(f"[bold green]Sufficient[/bold green]\n{result.knowledge_gap}")
+    tokens = message_tokens(formatted_prompt, result)
+
+    max_research_loops = (
+        state.get("max_research_loops")
+        if state.get("max_research_loops") is not None
+        else MAX_RESEARCH_LOOPS
+    )
+    follow_up_queries = []
+    if result.is_sufficient:
+        stop_reason = STOP_SUFFICIENT
+    elif state["research_loop_count"] >= max_research_loops:
+        stop_reason = STOP_MAX_LOOPS
+    else:
+        stop_reason = exhausted_reason(budget, searches_used, tokens_used + tokens)
+        if not stop_reason:
+            # Skip follow-ups that repeat earlier searches, and fit the rest in the budget
+            follow_up_queries = dedupe_queries(
+                result.follow_up_queries, state["search_query"], FOLLOW_UP_SIMILARITY
+            )
+            remaining = remaining_searches(budget, searches_used)
+            if remaining is not None:
+                follow_up_queries = follow_up_queries[:remaining]
+            if not follow_up_queries:
+                stop_reason = STOP_SEARCH_BUDGET if remaining == 0 else STOP_NO_NEW_QUERIES
+            elif len(follow_up_queries) < len(result.follow_up_queries):
+                print(f"[bold orange]Follow-up queries after pruning:[/bold orange] {follow_up_queries}")
+
     return {
         "is_sufficient": result.is_sufficient,
         "knowledge_gap": result.knowledge_gap,
         "useful_expansion": result.useful_expansion,
-        "follow_up_queries": result.follow_up_queries,
+        "follow_up_queries": follow_up_queries,
         "research_loop_count": state["research_loop_count"],
         "number_of_ran_queries": len(state["search_query"]),
+        "tokens_used": tokens,
+        "stop_reason": stop_reason,
     }
 
 
@@ -224,21 +310,17 @@ def evaluate_research(
 ) -> OverallState:
     """LangGraph routing function that determines the next step in the research flow.
 
-    Controls the research loop by deciding whether to continue gathering information
-    or to finalize the summary based on the configured maximum number of research loops.
+    Follows the decision made by ``reflection``: finalize once it set a stop
+    reason (sufficient, loop limit, budget, or no new queries), otherwise fan
+    out the pruned follow-up queries.
 
     Args:
-        state: Current graph state containing the research loop count
+        state: Current graph state containing the stop reason and follow-up queries
 
     Returns:
-        String literal indicating the next node to visit ("web_research" or "finalize_summary")
+        "finalize_answer" or a list of Sends to "web_research"
     """
-    max_research_loops = (
-        state.get("max_research_loops")
-        if state.get("max_research_loops") is not None
-        else MAX_RESEARCH_LOOPS
-    )
-    if state["is_sufficient"] or state["research_loop_count"] >= max_research_loops:
+    if state.get("stop_reason") or not state["follow_up_queries"]:
         return "finalize_answer"
     else:
         return [
@@ -247,13 +329,16 @@ def evaluate_research(
                 {
                     "search_query": follow_up_query,
                     "id": state["number_of_ran_queries"] + int(idx),
+                    "verbose": state.get("verbose", False),
+                    "research_budget": state.get("research_budget"),
+                    "research_id": state.get("research_id"),
                 },
             )
             for idx, follow_up_query in enumerate(state["follow_up_queries"])
         ]
 
 
-def finalize_answer(state: OverallState):
+async def finalize_answer(state: OverallState):
     """LangGraph node that finalizes the research summary.
 
     Prepares the final output by deduplicating and formatting sources, then
@@ -278,7 +363,7 @@ def finalize_answer(state: OverallState):
         response_language=state.get("response_language", "English"),
     )
 
-    result = reasoning_model.invoke(formatted_prompt)
+    result = await reasoning_model.ainvoke(formatted_prompt)
 
     # Replace the short urls with the original urls and add all used urls to the sources_gathered
     # unique_sources = []
@@ -288,16 +373,22 @@ def finalize_answer(state: OverallState):
 
     # write the final message to a proper markdown
     title, markdown_content = harvest_markdown(result.content)
-    # decide output directory
-    base_dir = state.get("output_dir") or "deep_research/generated_reports"
-    os.makedirs(base_dir, exist_ok=True)
-    saved_path = os.path.join(base_dir, f"DeepResearch_{title}.md")
-    with open(saved_path, "w", encoding="utf-8") as f:
-        f.write(markdown_content)
-    print(f"[bold green]Final Answer Saved at {saved_path}.[/bold green]")
+    # Callers with a project store the report there (see report_store.py);
+    # an explicit output_dir is for scripts and benchmarks
+    saved_path = None
+    if state.get("output_dir"):
+        os.makedirs(state["output_dir"], exist_ok=True)
+        saved_path = os.path.join(state["output_dir"], f"DeepResearch_{title}.md")
+        with open(saved_path, "w", encoding="utf-8") as f:
+            f.write(markdown_content)
+        print(f"[bold green]Final Answer Saved at {saved_path}.[/bold green]")
+    release_consolidator(state.get("research_id"))
     return {
         "messages": [AIMessage(content=result.content)],
         "saved_path": saved_path,
+        "report_title": title,
+        "report_markdown": markdown_content,
+        "tokens_used": message_tokens(formatted_prompt, result),
     }
 
 def harvest_markdown(response: str) -> tuple[str, str]:
@@ -0,0 +1,185 @@
+"""
+Offline replay backend for the deep research graph.
+
+Serves recorded search results and LLM responses instead of calling Tavily
+and the ``LLM_*`` role models, with configurable simulated latency, so the
+graph can be run and measured in CI without API keys.
+
+Fixture format (JSON)::
+
+    {
+        "search": {
+            "default": [{"title": ..., "url": ..., "content": ..., "score": ...}],
+            "queries": {"<exact query>": [...]}
+        },
+        "llm": {
+            "query_writer": {"rationale": ..., "query": [...], "response_language": ...},
+            "web_research": "<summary with [label](url) citations>",
+            "reflection": {"knowledge_gap": ..., "is_sufficient": false,
+                           "useful_expansion": ..., "follow_up_queries": [...]},
+            "finalize": "```markdown\\n# Title\\n...\\n```"
+        }
+    }
+
+Query lists are repeated or trimmed to the requested fan-out, and every
+search also returns one result unique to its query, so the results look
+like a real fan-out with both shared and distinct sources.
+
+Usage::
+
+    with replay_backend(load_fixture(path), search_latency=0.2, llm_latency=0.5):
+        await deep_research_graph.ainvoke(state)
+"""
+
+import asyncio
+import json
+import random
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage
+
+from . import graph
+
+
+def load_fixture(path: str) -> Dict:
+    """Load a replay fixture from a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class ReplayStats:
+    """Counts of replayed calls, for benchmarks and assertions."""
+    searches: int = 0
+    llm_calls: Dict[str, int] = field(default_factory=dict)
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class ReplayBackend:
+    """Recorded responses plus simulated latency for one or more graph runs."""
+
+    def __init__(self, fixture: Dict, search_latency: float = 0.0, llm_latency: float = 0.0,
+                 jitter: float = 0.0, fan_out: Optional[int] = None, seed: int = 0):
+        """Initialize the backend.
+
+        Args:
+            fixture: Recorded responses (see module docstring)
+            search_latency: Seconds each search takes
+            llm_latency: Seconds each LLM call takes
+            jitter: Random extra latency, as a fraction of the base latency
+            fan_out: Number of queries the query writer and reflection return
+                (defaults to the fixture's lists)
+            seed: Seed for the jitter
+        """
+        self.fixture = fixture
+        self.search_latency = search_latency
+        self.llm_latency = llm_latency
+        self.jitter = jitter
+        self.fan_out = fan_out
+        self.stats = ReplayStats()
+        self._random = random.Random(seed)
+
+    async def _sleep(self, base: float):
+        if base > 0:
+            await asyncio.sleep(base * (1 + self._random.uniform(0, self.jitter)))
+
+    def _fit(self, queries: List[str], prefix: str) -> List[str]:
+        """Repeat or trim recorded queries to the requested fan-out."""
+        if not self.fan_out:
+            return list(queries)
+        return [
+            f"{queries[i % len(queries)]} ({prefix} {i + 1})" if i >= len(queries) else queries[i]
+            for i in range(self.fan_out)
+        ]
+
+    async def search(self, query: str, count: int = 10) -> List[Dict]:
+        """Replay a Tavily search."""
+        await self._sleep(self.search_latency)
+        self.stats.searches += 1
+        search = self.fixture.get("search", {})
+        results = list(search.get("queries", {}).get(query, search.get("default", [])))
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")[:60]
+        results.insert(0, {
+            "title": f"Result for {query}",
+            "url": f"https://replay.example.org/{slug}",
+            "content": f"Replayed search result for {query}.",
+            "score": 0.5,
+        })
+        return results[:count]
+
+    async def respond(self, role: str, prompt: str, schema: Any = None):
+        """Replay one LLM call for a role."""
+        await self._sleep(self.llm_latency)
+        self.stats.llm_calls[role] = self.stats.llm_calls.get(role, 0) + 1
+        self.stats.input_tokens += _estimate_tokens(str(prompt))
+
+        llm = self.fixture.get("llm", {})
+        if schema is not None:
+            name = "query_writer" if schema.__name__ == "SearchQueryList" else "reflection"
+            data = dict(llm[name])
+            if name == "query_writer":
+                data["query"] = self._fit(data["query"], "angle")
+            else:
+                data["follow_up_queries"] = self._fit(data["follow_up_queries"], "follow-up")
+            result = schema(**data)
+            self.stats.output_tokens += _estimate_tokens(result.model_dump_json())
+            return result
+
+        # Plain text: the summarizer reads search results, the triage model writes the report
+        text = llm["web_research"] if role == "small" else llm["finalize"]
+        output_tokens = _estimate_tokens(text)
+        self.stats.output_tokens += output_tokens
+        return AIMessage(content=text, usage_metadata={
+            "input_tokens": _estimate_tokens(str(prompt)),
+            "output_tokens": output_tokens,
+            "total_tokens": _estimate_tokens(str(prompt)) + output_tokens,
+        })
+
+
+class ReplayChatModel:
+    """Stands in for a role model: supports ``ainvoke`` and ``with_structured_output``."""
+
+    def __init__(self, backend: ReplayBackend, role: str, schema: Any = None):
+        self.backend = backend
+        self.role = role
+        self.schema = schema
+
+    def with_structured_output(self, schema):
+        return ReplayChatModel(self.backend, self.role, schema)
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        return await self.backend.respond(self.role, prompt, self.schema)
+
+
+@contextmanager
+def replay_backend(fixture: Dict, **kwargs):
+    """Run the deep research graph against recorded responses.
+
+    Patches the graph module's search function and role models for the
+    duration of the block and yields the ``ReplayBackend`` (see its
+    ``stats``). Not safe to combine with live research in the same process.
+    """
+    backend = ReplayBackend(fixture, **kwargs)
+    patched = {
+        "asearch_with_tavily": backend.search,
+        "LLM_QUERY_WRITER": ReplayChatModel(backend, "query_writer"),
+        "LLM_SMALL": ReplayChatModel(backend, "small"),
+        "LLM_TRIAGE": ReplayChatModel(backend, "triage"),
+    }
+    originals = {name: getattr(graph, name) for name in patched}
+    for name, value in patched.items():
+        setattr(graph, name, value)
+    try:
+        yield backend
+    finally:
+        for name, value in originals.items():
+            setattr(graph, name, value)
@@ -0,0 +1,159 @@
+"""
+Project-local store of deep research reports.
+
+Reports are saved in the active project under ``.labacc/research/`` as
+``<report_id>.md``, where the id is a hash of the research key (normalized
+query, language and research settings), so different questions never
+overwrite each other and re-asking a question replaces its own report.
+``index.json`` records the query, title, date and sources of every report,
+which lets the agent reuse or look up earlier research without new web
+calls.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RESEARCH_DIR = Path(".labacc") / "research"
+INDEX_NAME = "index.json"
+
+_index_lock = threading.Lock()
+
+
+def _terms(text: str) -> set:
+    return {t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 2}
+
+
+class ReportStore:
+    """Deep research reports of one project, indexed by research key."""
+
+    def __init__(self, project_root: str):
+        """Initialize the store.
+
+        Args:
+            project_root: Root folder of the project
+        """
+        self.project_root = Path(project_root)
+        self.research_dir = self.project_root / RESEARCH_DIR
+        self.index_path = self.research_dir / INDEX_NAME
+
+    @staticmethod
+    def report_id(key: str) -> str:
+        """Stable report id for a research key."""
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    def _load_index(self) -> Dict:
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Research index unreadable, starting fresh: {e}")
+        return {"version": "1.0", "reports": {}}
+
+    def _save_index(self, index: Dict):
+        self.research_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _with_content(self, entry: Dict) -> Optional[Dict]:
+        path = self.project_root / entry["path"]
+        if not path.exists():
+            return None
+        return {**entry, "markdown": path.read_text(encoding="utf-8"), "full_path": str(path)}
+
+    def get(self, key: str, max_age: Optional[timedelta] = None) -> Optional[Dict]:
+        """Get the stored report for a research key.
+
+        Blocking file I/O - call via ``asyncio.to_thread``.
+
+        Args:
+            key: Research key (see ``result_cache.make_research_key``)
+            max_age: Ignore reports older than this
+
+        Returns:
+            Index entry plus ``markdown`` and ``full_path``, or None
+        """
+        entry = self._load_index()["reports"].get(self.report_id(key))
+        if not entry:
+            return None
+        if max_age is not None and datetime.now() - datetime.fromisoformat(entry["created_at"]) > max_age:
+            return None
+        return self._with_content(entry)
+
+    def save(self, key: str, query: str, title: str, markdown: str, sources: List[str],
+             stop_reason: Optional[str] = None) -> Dict:
+        """Save a report and record it in the index.
+
+        Blocking file I/O - call via ``asyncio.to_thread``.
+
+        Returns:
+            The index entry, with ``full_path`` added
+        """
+        report_id = self.report_id(key)
+        path = self.research_dir / f"{report_id}.md"
+        self.research_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(markdown, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        entry = {
+            "id": report_id,
+            "query": query,
+            "title": title,
+            "created_at": datetime.now().isoformat(),
+            "path": str(path.relative_to(self.project_root)),
+            "sources": sources,
+            "stop_reason": stop_reason,
+            "key": json.loads(key),
+        }
+        with _index_lock:
+            index = self._load_index()
+            index["reports"][report_id] = entry
+            self._save_index(index)
+
+        logger.info(f"Saved deep research report {report_id} ({title}) to {path}")
+        return {**entry, "full_path": str(path)}
+
+    def find_related(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Dict]:
+        """Find earlier reports related to a question.
+
+        Reports are ranked by the share of the question's terms that appear
+        in their query or title.
+
+        Returns:
+            Index entries with a ``score``, best first
+        """
+        query_terms = _terms(query)
+        if not query_terms:
+            return []
+
+        matches = []
+        for entry in self._load_index()["reports"].values():
+            entry_terms = _terms(f"{entry.get('query', '')} {entry.get('title', '')}")
+            score = len(query_terms & entry_terms) / len(query_terms)
+            if score >= min_score:
+                matches.append({**entry, "score": round(score, 2)})
+
+        # Best match first, newest first among equals
+        matches.sort(key=lambda e: (e["score"], e["created_at"]), reverse=True)
+        return matches[:limit]
+
+    def read(self, report_id: str) -> Optional[str]:
+        """Read a stored report by id."""
+        entry = self._load_index()["reports"].get(report_id)
+        if not entry:
+            return None
+        content = self._with_content(entry)
+        return content["markdown"] if content else None
@@ -0,0 +1,102 @@
+"""
+Cache of finished deep research reports.
+
+Reports are keyed by the normalized query, the response language and the
+research settings that shape the report (``initial_search_query_count``,
+``max_research_loops``). A cached report is served as long as it is within
+the freshness window; storage, expiry and eviction are handled by a
+``SearchCache`` in its own directory.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+from .search_cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a research question so trivially different phrasings share a key."""
+    return " ".join(query.lower().split()).rstrip("?.! ")
+
+
+def make_research_key(
+    query: str,
+    response_language: Optional[str],
+    initial_search_query_count: int,
+    max_research_loops: int,
+) -> str:
+    """Build the cache key text for a research request."""
+    return json.dumps(
+        {
+            "query": normalize_query(query),
+            "language": (response_language or "auto").lower(),
+            "initial_search_query_count": int(initial_search_query_count),
+            "max_research_loops": int(max_research_loops),
+        },
+        sort_keys=True,
+    )
+
+
+class ResearchResultCache:
+    """Freshness-bounded store of final research reports."""
+
+    def __init__(self, cache_dir: str = "research_cache", freshness_seconds: float = 24 * 3600,
+                 max_entries: int = 500):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached reports
+            freshness_seconds: How long a report is served from cache
+            max_entries: Maximum number of reports kept
+        """
+        self.freshness_seconds = freshness_seconds
+        self._store = SearchCache(
+            cache_dir,
+            ttl_seconds=freshness_seconds,
+            max_entries=max_entries,
+            memory_entries=min(max_entries, 64),
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a fresh cached report (``final_text``, ``saved_path``, ``stop_reason``, ``sources``) or None."""
+        return self._store.get(key, 0)
+
+    def set(self, key: str, final_text: str, saved_path: Optional[str], stop_reason: Optional[str] = None,
+            sources: Optional[List[str]] = None):
+        """Store a finished report."""
+        self._store.set(key, 0, {
+            "final_text": final_text,
+            "saved_path": saved_path,
+            "stop_reason": stop_reason,
+            "sources": sources or [],
+            "created_at": time.time(),
+        })
+
+    def stats(self) -> Dict:
+        """Get hit, miss and eviction counts."""
+        return self._store.stats()
+
+
+# Global research result cache instance (singleton pattern)
+_global_result_cache = None
+
+
+def get_result_cache() -> Optional[ResearchResultCache]:
+    """Get the global report cache, or None if ``deep_research.result_cache.freshness_hours`` is 0."""
+    global _global_result_cache
+    if _global_result_cache is None:
+        from src.config.config import config
+
+        freshness_hours = float(config.get("deep_research.result_cache.freshness_hours", 24))
+        if freshness_hours <= 0:
+            return None
+        _global_result_cache = ResearchResultCache(
+            cache_dir=config.get("deep_research.result_cache.path", "research_cache"),
+            freshness_seconds=freshness_hours * 3600,
+            max_entries=int(config.get("deep_research.result_cache.max_entries", 500)),
+        )
+    return _global_result_cache
@@ -0,0 +1,295 @@
+"""
+Bounded, TTL-aware cache for web search results.
+
+Two tiers:
+    - an in-memory LRU of recently used results, per process
+    - JSON files on disk (one per query), shared by all workers
+
+Each entry expires ``ttl_seconds`` after it was written. The disk tier is
+capped at ``max_entries`` files; when it grows past the cap the least
+recently used entries (by file mtime, refreshed on every disk hit) are
+evicted. Entries are written to a unique temporary file and moved into
+place with ``os.replace``, so concurrent workers never see partial files.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class SearchCache:
+    """Search result cache with an in-memory front tier and a JSON disk tier."""
+
+    def __init__(
+        self,
+        cache_dir: str = "search_cache",
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        memory_entries: int = 256,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the JSON entries
+            ttl_seconds: Lifetime of an entry; 0 disables expiry
+            max_entries: Maximum number of entries kept on disk
+            memory_entries: Maximum number of entries kept in memory
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count: Optional[int] = None
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "writes": 0,
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_legacy_pickles()
+
+    @staticmethod
+    def make_key(query: str, count: int) -> str:
+        """Build the cache key for a query and result count."""
+        return hashlib.sha256(f"{count}\0{query}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remove_legacy_pickles(self):
+        """Drop entries written by the old pickle-based cache; they are never read."""
+        legacy = list(self.cache_dir.glob("*.pkl"))
+        for path in legacy:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        if legacy:
+            logger.info(f"Removed {len(legacy)} legacy pickle entries from {self.cache_dir}")
+
+    def _expired(self, entry: Dict) -> bool:
+        expires_at = entry.get("expires_at")
+        return expires_at is not None and expires_at <= time.time()
+
+    def _remember(self, key: str, entry: Dict):
+        """Put an entry in the memory tier, evicting the least recently used."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, query: str, count: int, default: Any = None) -> Any:
+        """Look up cached results for a query.
+
+        Returns:
+            The cached result, or ``default`` on a miss or expired entry
+        """
+        key = self.make_key(query, count)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry["result"]
+                del self._memory[key]
+
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            entry = None
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Unreadable search cache entry {path.name}, ignoring it: {e}")
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+
+            if self._expired(entry):
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                self._unlink(path)
+                return default
+
+            self._stats["disk_hits"] += 1
+            self._remember(key, entry)
+
+        # Refresh mtime so disk eviction is least-recently-used, not oldest-written
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["result"]
+
+    def set(self, query: str, count: int, result: Any):
+        """Store results for a query in both tiers.
+
+        ``result`` must be JSON-serializable.
+        """
+        key = self.make_key(query, count)
+        now = time.time()
+        entry = {
+            "query": query,
+            "count": count,
+            "created_at": now,
+            "expires_at": now + self.ttl_seconds if self.ttl_seconds else None,
+            "result": result,
+        }
+
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        is_new = not path.exists()
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write search cache entry: {e}")
+            self._unlink(tmp_path)
+            return
+
+        with self._lock:
+            self._stats["writes"] += 1
+            self._remember(key, entry)
+            if self._disk_count is not None and is_new:
+                self._disk_count += 1
+            needs_eviction = self._disk_count is None or self._disk_count > self.max_entries
+
+        if needs_eviction:
+            self._evict()
+
+    def _unlink(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove expired entries, then least recently used ones, down to ``max_entries``."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                # Removed by another worker meanwhile
+                continue
+
+        removed = 0
+        if len(entries) > self.max_entries:
+            entries.sort()
+            excess = len(entries) - self.max_entries
+            for _, path in entries[:excess]:
+                self._unlink(path)
+                removed += 1
+
+        with self._lock:
+            self._disk_count = len(entries) - removed
+            self._stats["evictions"] += removed
+            if removed:
+                # Evicted entries must not be served from memory by stale keys
+                evicted = {path.stem for _, path in entries[:removed]}
+                for key in evicted & self._memory.keys():
+                    del self._memory[key]
+
+        if removed:
+            logger.info(f"Evicted {removed} search cache entries ({self.stats_line()})")
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._disk_count = 0
+        for path in self.cache_dir.glob("*.json"):
+            self._unlink(path)
+
+    def stats(self) -> Dict:
+        """Get hit, miss and eviction counts plus current tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["disk_entries"] = sum(1 for _ in self.cache_dir.glob("*.json"))
+        return stats
+
+    def stats_line(self) -> str:
+        """One-line summary of the counters for log messages."""
+        with self._lock:
+            s = self._stats
+            return (
+                f"hits={s['memory_hits'] + s['disk_hits']} (memory {s['memory_hits']}), "
+                f"misses={s['misses']}, expired={s['expired']}, evictions={s['evictions']}"
+            )
+
+    def __call__(self, func):
+        """Decorate a ``(query, count)`` search function, sync or async."""
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(query: str, count: int = 10):
+                cached = await asyncio.to_thread(self.get, query, count, _MISSING)
+                if cached is not _MISSING:
+                    return cached
+
+                result = await func(query, count)
+                await asyncio.to_thread(self.set, query, count, result)
+                return result
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(query: str, count: int = 10):
+            cached = self.get(query, count, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+            result = func(query, count)
+            self.set(query, count, result)
+            return result
+
+        return wrapper
+
+
+# Global search cache instance (singleton pattern)
+_global_search_cache = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get global search cache instance configured from ``deep_research.search_cache``."""
+    global _global_search_cache
+    if _global_search_cache is None:
+        from src.config.config import config
+
+        _global_search_cache = SearchCache(
+            cache_dir=config.get("deep_research.search_cache.path", "search_cache"),
+            ttl_seconds=float(config.get("deep_research.search_cache.ttl_hours", 168)) * 3600,
+            max_entries=int(config.get("deep_research.search_cache.max_entries", 5000)),
+            memory_entries=int(config.get("deep_research.search_cache.memory_entries", 256)),
+        )
+    return _global_search_cache
@@ -20,16 +20,29 @@ class OverallState(TypedDict):
     verbose: bool
     response_language: str
     language_mode: str  # "english" or "mix"
+    saved_path: str
+    report_title: str
+    report_markdown: str
+    research_budget: dict  # see budget.py
+    searches_used: Annotated[int, operator.add]
+    tokens_used: Annotated[int, operator.add]
+    stop_reason: str
+    research_id: str
+    tokens_saved: Annotated[int, operator.add]
 
 
 class ReflectionState(TypedDict):
     knowledge_gap: str
     useful_expansion: str
     is_sufficient: bool
-    follow_up_queries: Annotated[list, operator.add]
+    follow_up_queries: list
     research_loop_count: int
+    max_research_loops: int
     number_of_ran_queries: int
     verbose: bool
+    research_budget: dict
+    stop_reason: str
+    research_id: str
 
 
 class Query(TypedDict):
@@ -44,6 +57,8 @@ class QueryGenerationState(TypedDict):
     verbose: bool
     response_language: str
     language_mode: str
+    research_budget: dict
+    research_id: str
 
 
 class WebSearchState(TypedDict):
@@ -51,6 +66,8 @@ class WebSearchState(TypedDict):
     id: str
     verbose: bool
     response_language: str
+    research_budget: dict
+    research_id: str
 
 
 @dataclass(kw_only=True)
@@ -5,11 +5,11 @@ LangChain Tool wrappers for deep_research so ReAct-style agents can call it.
 
 from langchain_core.tools import tool
 
-from .api import run_deep_research
+from .api import arun_deep_research
 
 
 @tool("deep_research", return_direct=False)
-def deep_research_tool(
+async def deep_research_tool(
     query: str,
     initial_search_query_count: int = 10,
     max_research_loops: int = 5,
@@ -27,7 +27,7 @@ def deep_research_tool(
     Returns:
         Markdown string containing the research report with citations.
     """
-    result = run_deep_research(
+    result = await arun_deep_research(
         query,
         initial_search_query_count=initial_search_query_count,
         max_research_loops=max_research_loops,
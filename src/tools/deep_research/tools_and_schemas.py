@@ -1,14 +1,13 @@
-import hashlib
-import os
-import pickle
-from functools import wraps
-
 from pydantic import BaseModel, Field
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient, TavilyClient
 
 from src.config.keys import API_KEYS
 
+from .search_cache import get_search_cache
+
 client = TavilyClient(API_KEYS["tavily"]["api_key"])
+async_client = AsyncTavilyClient(API_KEYS["tavily"]["api_key"])
+search_cache = get_search_cache()
 
 
 class SearchQueryList(BaseModel):
@@ -38,34 +37,7 @@ class Reflection(BaseModel):
     )
 
 
-class SearchCache:
-    def __init__(self, cache_dir: str = "search_cache"):
-        self.cache_dir = cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
-
-    def __call__(self, func):
-        @wraps(func)
-        def wrapper(query: str, count: int = 10):
-            # Create hex hash of query and count
-            query_hash = hashlib.md5(f"{query}_{count}".encode()).hexdigest()
-            cache_file = os.path.join(self.cache_dir, f"{query_hash}.pkl")
-
-            # Try to load from cache
-            if os.path.exists(cache_file):
-                with open(cache_file, "rb") as f:
-                    return pickle.load(f)
-
-            # If not cached, call the function and cache result
-            result = func(query, count)
-            with open(cache_file, "wb") as f:
-                pickle.dump(result, f)
-
-            return result
-
-        return wrapper
-
-
-@SearchCache()
+@search_cache
 def search_with_tavily(query: str, count: int = 10) -> list[str]:
     """
     Perform a web search using the Tavily API and return a list of URLs.
@@ -105,3 +77,30 @@ def search_with_tavily(query: str, count: int = 10) -> list[str]:
     #   "response_time": 2.65
     # }
     return response["results"]
+
+
+@search_cache
+async def asearch_with_tavily(query: str, count: int = 10) -> list[dict]:
+    """
+    Async variant of ``search_with_tavily`` used by the research graph.
+
+    Shares the same cache entries, so a query searched either way is only
+    sent to Tavily once.
+
+    Args:
+        query (str): The search query to use.
+        count (int): The number of search results to return.
+
+    Returns:
+        List[dict]: Tavily search results.
+    """
+    if len(query) > 400:
+        query = query[:397] + "..."
+
+    response = await async_client.search(
+        query=query,
+        max_results=count,
+        search_depth="advanced",
+        chunks_per_source=5
+    )
+    return response["results"]
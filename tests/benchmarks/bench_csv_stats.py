@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming CSV statistics on large plate-reader style exports.
+
+Generates a synthetic CSV of the requested size, then compares the previous
+analysis (first 1,000 rows, one column) with the full-file streaming pass,
+cold and cached. Reports throughput, peak RSS and how far the head-only
+estimate is from the true mean.
+
+Run with:
+    python -m tests.benchmarks.bench_csv_stats --size-mb 1024
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.data_stats import DataStatsCache
+
+
+def _generate(path: Path, size_mb: int, block_rows: int = 50_000, seed: int = 0):
+    """Write plate-reader style rows until the file reaches ``size_mb``; drift makes the head unrepresentative."""
+    rng = np.random.default_rng(seed)
+    target = size_mb * 1024 * 1024
+    offset = 0
+    with open(path, 'w', newline='') as f:
+        f.write("well,cycle,time_s,temperature,fluorescence,ct\n")
+        while f.tell() < target:
+            index = np.arange(offset, offset + block_rows)
+            block = pd.DataFrame({
+                "well": np.char.add("A", (index % 384).astype(str)),
+                "cycle": index % 40,
+                "time_s": index * 0.5,
+                "temperature": 60 + rng.normal(0, 0.2, block_rows),
+                "fluorescence": 1000 + index * 1e-4 + rng.gamma(2.0, 150.0, block_rows),
+                "ct": rng.normal(24, 3, block_rows).round(3),
+            })
+            block.to_csv(f, header=False, index=False, float_format="%.4f")
+            offset += block_rows
+    return offset
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024, help="Size of the generated CSV")
+    parser.add_argument("--chunk-rows", type=int, default=200_000)
+    parser.add_argument("--sample-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_csv_stats_") as tmp:
+        root = Path(tmp)
+        path = root / "plate_reader_export.csv"
+        start = time.perf_counter()
+        rows = _generate(path, args.size_mb)
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"Generated {size_mb:,.0f} MB, {rows:,} rows in {time.perf_counter() - start:.1f}s\n")
+        rss_before = _peak_rss_mb()
+
+        start = time.perf_counter()
+        head = pd.read_csv(path, nrows=1000)
+        head_time = time.perf_counter() - start
+
+        cache = DataStatsCache(str(root / "stats"), chunk_rows=args.chunk_rows, sample_size=args.sample_size)
+        start = time.perf_counter()
+        stats = cache.get_stats(str(path))
+        cold_time = time.perf_counter() - start
+        peak_rss = _peak_rss_mb()
+
+        start = time.perf_counter()
+        cache.get_stats(str(path))
+        warm_time = time.perf_counter() - start
+
+        # A new process must re-hash the file before it can use the cache
+        start = time.perf_counter()
+        DataStatsCache(str(root / "stats"), sample_size=args.sample_size).get_stats(str(path))
+        rehash_time = time.perf_counter() - start
+
+        print(f"  {'previous: first 1,000 rows':<40} {head_time * 1000:9.1f} ms")
+        print(f"  {'streaming, cold (hash + full pass)':<40} {cold_time * 1000:9.1f} ms "
+              f"({size_mb / cold_time:,.0f} MB/s)")
+        print(f"  {'streaming, cached (same process)':<40} {warm_time * 1000:9.1f} ms")
+        print(f"  {'streaming, cached (new process)':<40} {rehash_time * 1000:9.1f} ms")
+        print(f"  peak RSS during full pass: {peak_rss:,.0f} MB (before: {rss_before:,.0f} MB)\n")
+
+        print("Accuracy (fluorescence drifts over the run)")
+        full = stats["numeric"]["fluorescence"]
+        print(f"  rows analysed:  head {len(head):,}  vs  full {stats['rows']:,}")
+        print(f"  mean:           head {head['fluorescence'].mean():,.2f}  vs  full {full['mean']:,.2f}")
+        print(f"  max:            head {head['fluorescence'].max():,.2f}  vs  full {full['max']:,.2f}")
+        print(f"  numeric columns with stats: head 1  vs  full {len(stats['numeric'])}")
+
+
+if __name__ == "__main__":
+    main()
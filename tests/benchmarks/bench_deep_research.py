@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark the deep research graph offline.
+
+Runs ``deep_research_graph`` against recorded search results and LLM
+responses (see src/tools/deep_research/replay.py) with simulated latency,
+for each combination of fan-out (initial search queries) and research
+loops. Reports wall time, time spent per node, and the parallelism
+achieved: total node time divided by wall time, and the peak number of
+web_research nodes running at once.
+
+Run with:
+    python -m tests.benchmarks.bench_deep_research --fan-out 1,3,5 --loops 1,2
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from langchain_core.messages import HumanMessage
+
+from src.tools.deep_research.graph import deep_research_graph
+from src.tools.deep_research.replay import load_fixture, replay_backend
+
+FIXTURE = Path(__file__).parent / "fixtures" / "deep_research_replay.json"
+NODES = ("generate_query", "web_research", "reflection", "finalize_answer")
+
+
+async def run_once(fan_out: int, loops: int, output_dir: str):
+    """Run the graph once, timing each node from the event stream."""
+    state = {
+        "messages": [HumanMessage(content="PCR optimization for GC-rich templates")],
+        "initial_search_query_count": fan_out,
+        "max_research_loops": loops,
+        "verbose": False,
+        "output_dir": output_dir,
+    }
+
+    started = {}
+    node_time = defaultdict(float)
+    node_count = defaultdict(int)
+    running = peak = 0
+
+    start = time.perf_counter()
+    async for event in deep_research_graph.astream_events(state, version="v2"):
+        name = event["name"]
+        if name not in NODES:
+            continue
+        if event["event"] == "on_chain_start":
+            started[event["run_id"]] = time.perf_counter()
+            if name == "web_research":
+                running += 1
+                peak = max(peak, running)
+        elif event["event"] == "on_chain_end" and event["run_id"] in started:
+            node_time[name] += time.perf_counter() - started.pop(event["run_id"])
+            node_count[name] += 1
+            if name == "web_research":
+                running -= 1
+    wall = time.perf_counter() - start
+    return wall, node_time, node_count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fan-out", default="1,3,5", help="Comma-separated initial query counts")
+    parser.add_argument("--loops", default="1,2", help="Comma-separated max research loops")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Seconds per search")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per LLM call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Extra random latency fraction")
+    parser.add_argument("--fixture", default=str(FIXTURE))
+    args = parser.parse_args()
+
+    fixture = load_fixture(args.fixture)
+    fan_outs = [int(v) for v in args.fan_out.split(",")]
+    loop_counts = [int(v) for v in args.loops.split(",")]
+
+    print(f"Latency: search {args.search_latency}s, LLM {args.llm_latency}s (+{args.jitter:.0%} jitter)\n")
+    header = f"{'fan-out':>7} {'loops':>5} {'wall s':>7} {'nodes s':>8} {'parallel':>8} {'peak':>4} {'search':>6} {'llm':>4}"
+    print(header + "  time per node (count)")
+    print("-" * (len(header) + 40))
+
+    with tempfile.TemporaryDirectory(prefix="bench_research_") as output_dir:
+        for fan_out in fan_outs:
+            for loops in loop_counts:
+                with replay_backend(fixture, search_latency=args.search_latency, llm_latency=args.llm_latency,
+                                    jitter=args.jitter, fan_out=fan_out) as backend:
+                    wall, node_time, node_count, peak = asyncio.run(run_once(fan_out, loops, output_dir))
+
+                total = sum(node_time.values())
+                per_node = ", ".join(
+                    f"{name} {node_time[name]:.2f}s ({node_count[name]})" for name in NODES if node_count[name]
+                )
+                print(f"{fan_out:>7} {loops:>5} {wall:>7.2f} {total:>8.2f} {total / wall:>7.1f}x {peak:>4} "
+                      f"{backend.stats.searches:>6} {sum(backend.stats.llm_calls.values()):>4}  {per_node}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark FileRegistry on large registries.
+
+Compares the cached registry against the previous behaviour of re-reading
+(and rewriting) file_registry.json on every call.
+
+Run with:
+    python -m tests.benchmarks.bench_file_registry --files 10000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.file_registry import FileRegistry
+
+
+def _seed(project_root: Path, experiment_id: str, n_files: int):
+    files = {
+        f"file_{i:05d}.pdf": {
+            "original_path": f"{experiment_id}/originals/file_{i:05d}.pdf",
+            "converted_path": f"{experiment_id}/file_{i:05d}.md",
+            "upload_time": "2025-01-01T00:00:00",
+            "file_size": 1024,
+            "conversion": {"status": "success", "method": "MinerU", "timestamp": None},
+            "analysis": {"analyzed": False, "summary": None, "context": None}
+        }
+        for i in range(n_files)
+    }
+    registry_path = project_root / experiment_id / ".labacc" / "file_registry.json"
+    registry_path.parent.mkdir(parents=True)
+    registry_path.write_text(json.dumps({"version": "3.0", "experiment_id": experiment_id, "files": files}))
+    return registry_path
+
+
+def _uncached_lookup(registry_path: Path, file_path: str):
+    """Previous get_file_by_path: load JSON and scan linearly."""
+    registry = json.loads(registry_path.read_text())
+    for filename, info in registry["files"].items():
+        if info.get("original_path") == file_path or info.get("converted_path") == file_path:
+            return filename
+    return None
+
+
+def _uncached_add(registry_path: Path, filename: str, entry: dict):
+    """Previous add_file: load JSON, update, rewrite the whole file."""
+    registry = json.loads(registry_path.read_text())
+    registry["files"][filename] = entry
+    registry_path.write_text(json.dumps(registry, indent=2))
+
+
+def _timed(label: str, fn, repeat: int):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<42} {elapsed * 1000:9.1f} ms total  {elapsed / repeat * 1e6:10.1f} µs/op")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10000, help="Entries in the registry")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--adds", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_registry_") as tmp:
+        root = Path(tmp)
+        registry_path = _seed(root, "exp_bench", args.files)
+        size_mb = registry_path.stat().st_size / 1e6
+        print(f"Registry: {args.files} files, {size_mb:.1f} MB\n")
+
+        registry = FileRegistry(str(root), flush_delay=0)
+        entry = {"original_path": "x", "converted_path": None, "conversion": {"status": "not_needed"}}
+
+        print("get_file_by_path")
+        old = _timed("uncached (load + linear scan)", lambda i: _uncached_lookup(
+            registry_path, f"exp_bench/file_{(i * 37) % args.files:05d}.md"), args.lookups)
+        new = _timed("cached (mtime check + reverse index)", lambda i: registry.get_file_by_path(
+            "exp_bench", f"exp_bench/file_{(i * 37) % args.files:05d}.md"), args.lookups)
+        print(f"  speedup: {old / new:.0f}x\n")
+
+        print(f"add_file x{args.adds}")
+        old = _timed("uncached (load + rewrite each)", lambda i: _uncached_add(
+            registry_path, f"old_{i}.csv", entry), args.adds)
+        new_through = _timed("cached, write-through", lambda i: registry.add_file(
+            "exp_bench", f"through_{i}.csv", f"exp_bench/through_{i}.csv"), args.adds)
+
+        def batched(_):
+            with registry.batch():
+                for j in range(args.adds):
+                    registry.add_file("exp_bench", f"batch_{j}.csv", f"exp_bench/batch_{j}.csv")
+
+        batch = _timed("cached, one batch (single write)", batched, 1)
+        print(f"  speedup write-through: {old / new_through:.1f}x, batched: {old / batch:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark shrinking images before upload to a vision model.
+
+Generates a 16-bit multi-page microscopy-style TIFF and a large RGB photo,
+and reports the base64 payload that used to be posted (the raw file)
+against the preprocessed one, with the time spent preprocessing.
+
+Run with:
+    python -m tests.benchmarks.bench_image_preprocess --tiff-pages 8 --tiff-edge 2048
+"""
+
+import argparse
+import base64
+import io
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.image_preprocess import prepare_image
+
+
+def _report(label: str, data: bytes, **options):
+    start = time.perf_counter()
+    prepared = prepare_image(data, **options)
+    seconds = time.perf_counter() - start
+
+    before = 4 * math.ceil(len(data) / 3)
+    after = len(base64.b64encode(prepared["bytes"]))
+    print(f"{label}:")
+    print(f"  {'raw file, base64':<28} {before / 1e6:10.2f} MB")
+    print(f"  {'preprocessed, base64':<28} {after / 1e6:10.2f} MB   "
+          f"{prepared['width']}x{prepared['height']} {prepared['mime_type']}, "
+          f"{prepared['frames']} frame(s), {before / after:,.0f}x smaller")
+    print(f"  {'preprocessing time':<28} {seconds * 1000:10.1f} ms\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiff-pages", type=int, default=8, help="Pages in the generated TIFF stack")
+    parser.add_argument("--tiff-edge", type=int, default=2048, help="Edge of each TIFF page in pixels")
+    parser.add_argument("--photo-edge", type=int, default=6000, help="Edge of the generated RGB photo")
+    parser.add_argument("--max-edge", type=int, default=2048)
+    parser.add_argument("--max-payload-mb", type=float, default=4)
+    args = parser.parse_args()
+
+    options = {"max_edge": args.max_edge, "max_bytes": int(args.max_payload_mb * 1024 * 1024)}
+    rng = np.random.default_rng(0)
+
+    # Smooth signal plus shot noise, using a narrow slice of the 16-bit range
+    y, x = np.mgrid[0:args.tiff_edge, 0:args.tiff_edge]
+    pages = []
+    for page in range(args.tiff_pages):
+        signal = 2000 + 1500 * np.sin((x + page * 40) / 90.0) * np.cos(y / 70.0)
+        pages.append(Image.fromarray((signal + rng.normal(0, 60, signal.shape)).astype(np.uint16)))
+    buffer = io.BytesIO()
+    pages[0].save(buffer, format="TIFF", save_all=True, append_images=pages[1:])
+    _report(f"16-bit TIFF stack, {args.tiff_pages} pages", buffer.getvalue(), **options)
+
+    edge = args.photo_edge
+    gradient = np.linspace(0, 255, edge, dtype=np.float32)
+    photo = np.stack([np.add.outer(gradient, gradient) / 2, np.tile(gradient, (edge, 1)),
+                      np.tile(gradient[:, None], (1, edge))], axis=-1)
+    photo = np.clip(photo + rng.normal(0, 8, photo.shape), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(photo).save(buffer, format="PNG")
+    _report(f"RGB PNG, {edge}x{edge}", buffer.getvalue(), **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading tabular data through columnar sidecars.
+
+Compares parsing a CSV and an XLSX workbook with pandas (what every
+analysis used to do) against loading the memory-mapped sidecar, and a
+typical analysis step (means of all numeric columns) on each.
+
+Run with:
+    python -m tests.benchmarks.bench_table_sidecar --csv-mb 256 --xlsx-rows 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.table_sidecar import TableSidecar
+from tests.benchmarks.bench_csv_stats import _generate
+
+
+def _timed(fn, repeat: int = 3):
+    """Best of ``repeat`` runs, in seconds, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _report(label: str, source: Path, parse):
+    sidecar = TableSidecar(str(source))
+    build_time, _ = _timed(sidecar.build, repeat=1)
+    parse_time, parsed = _timed(parse, repeat=1)
+    load_time, loaded = _timed(sidecar.load)
+    assert len(parsed) == len(loaded)
+
+    def means(frame):
+        return frame.select_dtypes("number").mean()
+
+    parsed_analysis, _ = _timed(lambda: means(parse()), repeat=1)
+    sidecar_analysis, _ = _timed(lambda: means(TableSidecar(str(source)).load()))
+
+    size_mb = source.stat().st_size / 1024 / 1024
+    print(f"{label}: {size_mb:,.1f} MB, {len(loaded):,} rows x {loaded.shape[1]} columns")
+    print(f"  {'build sidecar (once, on upload)':<36} {build_time * 1000:10.1f} ms")
+    print(f"  {'parse with pandas':<36} {parse_time * 1000:10.1f} ms")
+    print(f"  {'load memory-mapped sidecar':<36} {load_time * 1000:10.1f} ms   "
+          f"speedup {parse_time / load_time:,.0f}x")
+    print(f"  {'parse + column means':<36} {parsed_analysis * 1000:10.1f} ms")
+    print(f"  {'sidecar + column means':<36} {sidecar_analysis * 1000:10.1f} ms   "
+          f"speedup {parsed_analysis / sidecar_analysis:,.0f}x\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv-mb", type=int, default=256, help="Size of the generated CSV")
+    parser.add_argument("--xlsx-rows", type=int, default=100_000, help="Rows in the generated workbook")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_sidecar_") as tmp:
+        root = Path(tmp)
+
+        csv_path = root / "plate_reader_export.csv"
+        _generate(csv_path, args.csv_mb)
+        _report("CSV", csv_path, lambda: pd.read_csv(csv_path))
+
+        xlsx_path = root / "plate_reader_export.xlsx"
+        rng = np.random.default_rng(0)
+        pd.DataFrame({
+            "well": np.char.add("A", (np.arange(args.xlsx_rows) % 384).astype(str)),
+            "cycle": np.arange(args.xlsx_rows) % 40,
+            "fluorescence": rng.gamma(2.0, 150.0, args.xlsx_rows),
+            "ct": rng.normal(24, 3, args.xlsx_rows),
+        }).to_excel(xlsx_path, index=False)
+        _report("XLSX", xlsx_path, lambda: pd.read_excel(xlsx_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit tests for resumable chunked upload staging.
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.chunked_upload import ChunkedUploadManager
+
+
+async def _stream(data: bytes, piece: int = 3):
+    for i in range(0, len(data), piece):
+        yield data[i:i + piece]
+
+
+async def test_chunks_out_of_order_assemble_with_checksum(temp_dir):
+    """Chunks sent in any order are assembled and verified on commit."""
+    payload = b"0123456789abcdefghij-tail"
+    manager = ChunkedUploadManager(str(temp_dir), min_chunk_size=1)
+    manifest = manager.create_upload("run.fastq", "exp_001", len(payload), chunk_size=10)
+    upload_id = manifest["upload_id"]
+
+    assert manifest["total_chunks"] == 3
+    assert (temp_dir / ".labacc" / "uploads" / upload_id).is_dir()
+
+    await manager.write_chunk(upload_id, 2, _stream(payload[20:]))
+    await manager.write_chunk(upload_id, 0, _stream(payload[:10]))
+
+    # Resume point: only chunk 1 is missing
+    status = manager.get_status(upload_id)
+    assert status["received_chunks"] == [0, 2]
+    assert status["missing_chunks"] == [1]
+
+    await manager.write_chunk(upload_id, 1, _stream(payload[10:20]))
+
+    target = temp_dir / "exp_001" / "run.fastq"
+    size, digest = manager.assemble(upload_id, target, hashlib.sha256(payload).hexdigest())
+
+    assert size == len(payload)
+    assert target.read_bytes() == payload
+    assert digest == hashlib.sha256(payload).hexdigest()
+
+
+async def test_rejects_bad_chunks_and_checksum(temp_dir):
+    """Wrong-sized chunks are not kept and a checksum mismatch leaves no file."""
+    payload = b"x" * 15
+    manager = ChunkedUploadManager(str(temp_dir), min_chunk_size=1)
+    upload_id = manager.create_upload("a.bin", "/", len(payload), chunk_size=10)["upload_id"]
+
+    with pytest.raises(ValueError):
+        await manager.write_chunk(upload_id, 0, _stream(b"short"))
+    with pytest.raises(ValueError):
+        await manager.write_chunk(upload_id, 5, _stream(b"x"))
+    assert manager.received_chunks(upload_id) == []
+
+    await manager.write_chunk(upload_id, 0, _stream(payload[:10]))
+    await manager.write_chunk(upload_id, 1, _stream(payload[10:]))
+
+    target = temp_dir / "a.bin"
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        manager.assemble(upload_id, target, "0" * 64)
+    assert not target.exists()
+
+    # Chunks are kept so the commit can be retried
+    assert manager.get_status(upload_id)["complete"]
+    assert manager.discard(upload_id)
+
+
+def test_invalid_upload_id_rejected(temp_dir):
+    """Upload IDs cannot be used to escape the staging area."""
+    manager = ChunkedUploadManager(str(temp_dir))
+    with pytest.raises(ValueError):
+        manager.get_status("../../etc")
+
+
+def test_chunking_limits(temp_dir):
+    """Tiny chunks and too many chunks are refused; a small file may be one small chunk."""
+    manager = ChunkedUploadManager(str(temp_dir), min_chunk_size=1024, max_chunks=4)
+
+    with pytest.raises(ValueError, match="at least 1024"):
+        manager.create_upload("a.bin", "/", 4096, chunk_size=10)
+    with pytest.raises(ValueError, match="limit is 4"):
+        manager.create_upload("a.bin", "/", 5 * 1024, chunk_size=1024)
+    assert manager.create_upload("a.bin", "/", 100, chunk_size=100)["total_chunks"] == 1
+    assert manager.create_upload("a.bin", "/", 4 * 1024, chunk_size=1024)["total_chunks"] == 4
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed conversion store.
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.conversion_store import ConversionStore, hash_file
+
+
+def _stored(temp_dir, link_mode="copy"):
+    store = ConversionStore(str(temp_dir / "store"), link_mode=link_mode)
+    original = temp_dir / "protocol.pdf"
+    original.write_bytes(b"%PDF-1.4 shared lab protocol")
+    converted = temp_dir / "project_a" / "protocol.md"
+    converted.parent.mkdir()
+    converted.write_text("# Protocol\n\nStep 1")
+
+    sha = hash_file(original)
+    store.put(sha, "MinerU", "2.1.0", converted)
+    return store, sha, converted
+
+
+def test_hit_reuses_conversion_across_projects(temp_dir):
+    """Same bytes and converter version reuse the stored Markdown."""
+    store, sha, _ = _stored(temp_dir)
+    target = temp_dir / "project_b" / "protocol.md"
+
+    assert store.materialize(sha, "MinerU", "2.1.0", target)
+    assert target.read_text() == "# Protocol\n\nStep 1"
+
+    # A different converter version is a miss
+    assert not store.materialize(sha, "MinerU", "2.2.0", temp_dir / "other.md")
+    assert store.stats()["hits"] == 1
+
+
+def test_modified_object_is_not_served(temp_dir):
+    """Hardlinked copies are read-only; one edited anyway invalidates the entry."""
+    store, sha, _ = _stored(temp_dir, link_mode="hardlink")
+    target = temp_dir / "project_b" / "protocol.md"
+    assert store.materialize(sha, "MinerU", "2.1.0", target)
+
+    # The temp dir is one filesystem, so the object is hardlinked, not copied
+    assert target.stat().st_nlink > 1
+    assert not target.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+    # Permission bits don't stop root, which is how an edit could still write through
+    os.chmod(target, 0o644)
+    with open(target, "a") as f:
+        f.write("\nlocal edit")
+
+    assert not store.materialize(sha, "MinerU", "2.1.0", temp_dir / "project_c" / "protocol.md")
+    assert store.stats()["entries"] == 0
+
+
+def test_edited_copy_leaves_object_intact(temp_dir):
+    """By default cached files are copied, so editing one does not touch the stored object."""
+    store, sha, _ = _stored(temp_dir)
+    target = temp_dir / "project_b" / "protocol.md"
+    assert store.materialize(sha, "MinerU", "2.1.0", target)
+    assert target.stat().st_nlink == 1
+
+    with open(target, "a") as f:
+        f.write("\nlocal edit")
+
+    other = temp_dir / "project_c" / "protocol.md"
+    assert store.materialize(sha, "MinerU", "2.1.0", other)
+    assert other.read_text() == "# Protocol\n\nStep 1"
+
+
+def test_garbage_collection_by_references(temp_dir):
+    """Entries are removed only once every referencing file is gone."""
+    store, sha, converted = _stored(temp_dir)
+    target = temp_dir / "project_b" / "protocol.md"
+    store.materialize(sha, "MinerU", "2.1.0", target)
+
+    converted.unlink()
+    assert store.collect_garbage() == 0
+    assert store.stats()["entries"] == 1
+
+    target.unlink()
+    assert store.collect_garbage() == 1
+    assert store.stats()["entries"] == 0
+    assert not list((temp_dir / "store" / "objects").rglob("*.md"))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cross-experiment data comparison.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.data_compare import compare_files, find_data_files, format_comparison
+
+
+def _write(path: Path, ct: float, extra: dict = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame = pd.DataFrame({"well": ["A1", "A2", "A3", "A4"], "ct": [ct - 1, ct, ct, ct + 1],
+                          "efficiency": [0.9, 1.0, 1.0, 1.1], **(extra or {})})
+    frame.to_csv(path, index=False)
+
+
+def test_find_data_files_matches_names_and_paths(temp_dir):
+    """Plain patterns match anywhere in the path; hidden folders and non-tables are skipped."""
+    _write(temp_dir / "pcr_run1" / "results.csv", 20)
+    _write(temp_dir / "western" / "qpcr_export.csv", 20)
+    _write(temp_dir / ".labacc" / "pcr_cache.csv", 20)
+    (temp_dir / "pcr_run1" / "notes.md").write_text("pcr notes")
+
+    found = [str(p.relative_to(temp_dir)) for p in find_data_files(str(temp_dir), "PCR")]
+    assert found == ["pcr_run1/results.csv", "western/qpcr_export.csv"]
+    found = [p.name for p in find_data_files(str(temp_dir), "results*.csv")]
+    assert found == ["results.csv"]
+
+
+async def test_compare_files_aggregates_and_deltas(temp_dir):
+    """Files are aligned on shared numeric columns, with deltas against the baseline."""
+    _write(temp_dir / "pcr_a" / "ct.csv", 20)
+    _write(temp_dir / "pcr_b" / "ct.csv", 25, {"only_here": [1, 2, 3, 4]})
+    (temp_dir / "pcr_c").mkdir()
+    pd.DataFrame({"well": ["A1"], "note": ["failed"]}).to_csv(temp_dir / "pcr_c" / "ct.csv", index=False)
+
+    result = await compare_files(str(temp_dir), "pcr_*/ct.csv")
+
+    assert result["files"] == ["pcr_a/ct.csv", "pcr_b/ct.csv", "pcr_c/ct.csv"]
+    assert result["columns"] == ["ct", "efficiency"]
+    assert result["baseline"] == "pcr_a/ct.csv"
+    assert result["skipped"] == {"pcr_c/ct.csv": "no numeric columns"}
+
+    summary = result["summary"]
+    assert summary.loc[("pcr_b/ct.csv", "ct"), "mean"] == pytest.approx(25)
+    assert summary.loc[("pcr_b/ct.csv", "ct"), "count"] == 4
+    assert summary.loc[("pcr_a/ct.csv", "ct"), "std"] == pytest.approx(np.std([19, 20, 20, 21], ddof=1))
+    assert result["delta"].loc["pcr_b/ct.csv", "ct"] == pytest.approx(5)
+    assert result["delta_pct"].loc["pcr_b/ct.csv", "ct"] == pytest.approx(25)
+
+    table = format_comparison(result)
+    assert "pcr_a/ct.csv (baseline)" in table
+    assert "+25.0%" in table
+    assert "only_here" not in table
+
+
+async def test_compare_files_requested_columns_and_baseline(temp_dir):
+    """Requested columns may be missing from some files; any file can be the baseline."""
+    _write(temp_dir / "pcr_a" / "ct.csv", 20)
+    _write(temp_dir / "pcr_b" / "ct.csv", 25, {"only_here": [1, 2, 3, 4]})
+
+    result = await compare_files(str(temp_dir), "ct.csv", columns=["ct", "only_here", "absent"],
+                                 baseline="pcr_b/ct.csv")
+
+    assert result["columns"] == ["ct", "only_here"]
+    assert result["delta"].loc["pcr_a/ct.csv", "ct"] == pytest.approx(-5)
+    assert np.isnan(result["summary"].loc[("pcr_a/ct.csv", "only_here"), "mean"])
+    assert result["summary"].loc[("pcr_a/ct.csv", "only_here"), "count"] == 0
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming data file statistics.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.data_stats import DataStatsCache, compute_csv_stats, detect_separator
+
+
+def _frame(rows=25_000, seed=1):
+    rng = np.random.default_rng(seed)
+    ct = rng.normal(24, 3, rows)
+    ct[::97] = np.nan
+    return pd.DataFrame({
+        "well": [f"A{i % 96}" for i in range(rows)],
+        "cycle": np.arange(rows) % 40,
+        "ct": ct,
+    })
+
+
+def test_exact_moments_match_pandas_across_chunks(temp_dir):
+    """Chunked count, mean, variance, min and max equal the in-memory values."""
+    df = _frame()
+    path = temp_dir / "qpcr.csv"
+    df.to_csv(path, index=False)
+
+    stats = compute_csv_stats(str(path), chunk_rows=3_000, sample_size=2_000)
+    assert stats["rows"] == len(df)
+    assert stats["columns"] == ["well", "cycle", "ct"]
+    assert set(stats["numeric"]) == {"cycle", "ct"}
+
+    ct = stats["numeric"]["ct"]
+    assert ct["count"] == df["ct"].count()
+    assert ct["nulls"] == df["ct"].isna().sum()
+    assert np.isclose(ct["mean"], df["ct"].mean())
+    assert np.isclose(ct["variance"], df["ct"].var())
+    assert ct["min"] == df["ct"].min() and ct["max"] == df["ct"].max()
+
+    # Quantiles come from a 2,000-value sample: approximate but close
+    assert not ct["quantiles_exact"]
+    assert abs(ct["quantiles"]["p50"] - df["ct"].median()) < 0.3
+    assert abs(ct["quantiles"]["p95"] - df["ct"].quantile(0.95)) < 0.5
+
+
+def test_small_files_get_exact_quantiles(temp_dir):
+    """When every value fits in the sample, quantiles are exact."""
+    path = temp_dir / "plate.tsv"
+    pd.DataFrame({"od600": [0.1, 0.2, 0.3, 0.4, 0.5]}).to_csv(path, sep="\t", index=False)
+
+    assert detect_separator(str(path)) == "\t"
+    od = compute_csv_stats(str(path))["numeric"]["od600"]
+    assert od["quantiles_exact"]
+    assert od["quantiles"]["p50"] == 0.3
+
+
+def test_late_non_numeric_values_count_as_missing(temp_dir):
+    """A column numeric in the first chunk stays numeric; stray text is counted as missing."""
+    path = temp_dir / "reader.csv"
+    path.write_text("signal\n" + "\n".join(["1.5"] * 10 + ["overflow"] + ["2.5"] * 10) + "\n")
+
+    signal = compute_csv_stats(str(path), chunk_rows=10)["numeric"]["signal"]
+    assert signal["count"] == 20 and signal["nulls"] == 1
+    assert signal["mean"] == 2.0
+
+
+def test_cache_keyed_by_content(temp_dir):
+    """Identical content is served from cache, changed content is recomputed."""
+    cache = DataStatsCache(str(temp_dir / "stats"), sample_size=500)
+    path = temp_dir / "qpcr.csv"
+    _frame(rows=2_000).to_csv(path, index=False)
+
+    first = cache.get_stats(str(path))
+    assert first["cached"] is False
+
+    copy = temp_dir / "copy.csv"
+    copy.write_bytes(path.read_bytes())
+    again = cache.get_stats(str(copy))
+    assert again["cached"] is True
+    assert again["numeric"] == first["numeric"]
+
+    _frame(rows=2_000, seed=2).to_csv(path, index=False)
+    assert cache.get_stats(str(path))["cached"] is False
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the project document index.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.memory.doc_index import DocIndex
+
+
+def _project(temp_dir):
+    exp = temp_dir / "experiments" / "exp_001_pcr"
+    exp.mkdir(parents=True)
+    (exp / "README.md").write_text(
+        "# PCR optimization\n\nAnnealing temperature 58C gave a clean band.\n"
+        + "\n".join(f"filler line {i}" for i in range(40))
+        + "\nPrimer dimers appeared at 52C.\n"
+    )
+    (exp / "samples.csv").write_text("sample,od600\nwt,0.42\nmutant,0.17\n")
+    (exp / "gel.png").write_bytes(b"\x89PNG not text")
+    hidden = temp_dir / ".labacc"
+    hidden.mkdir()
+    (hidden / "notes.md").write_text("annealing secret")
+    return DocIndex(str(temp_dir), chunk_lines=20), exp
+
+
+def test_search_returns_ranked_snippets_with_lines(temp_dir):
+    """Matches point at the file and line range of the chunk."""
+    index, _ = _project(temp_dir)
+    assert index.refresh()["indexed"] == 2
+
+    results = index.search("primer dimers")
+    assert results[0]["path"] == "experiments/exp_001_pcr/README.md"
+    assert results[0]["start_line"] == 41
+    assert "**Primer**" in results[0]["snippet"]
+
+    assert index.search("mutant")[0]["path"].endswith("samples.csv")
+    # Hidden folders and binary types are not indexed
+    assert all(".labacc" not in r["path"] for r in index.search("annealing"))
+    assert index.stats()["files"] == 2
+
+
+def test_search_falls_back_to_any_term_and_tolerates_syntax(temp_dir):
+    """Unmatched terms don't empty the results; FTS operators in the query are plain text."""
+    index, _ = _project(temp_dir)
+    index.refresh()
+
+    assert index.search("annealing unobtainium")
+    assert index.search('annealing" NEAR( -temperature*')[0]["path"].endswith("README.md")
+    assert index.search("***") == []
+
+
+def test_refresh_is_incremental(temp_dir):
+    """Unchanged files are skipped, edited ones re-indexed, deleted ones removed."""
+    index, exp = _project(temp_dir)
+    index.refresh()
+
+    assert index.refresh() == {"indexed": 0, "removed": 0, "unchanged": 2}
+
+    readme = exp / "README.md"
+    readme.write_text("# PCR optimization\n\nSwitched to touchdown PCR.\n")
+    stat = readme.stat()
+    os.utime(readme, (stat.st_atime, stat.st_mtime + 5))
+    (exp / "samples.csv").unlink()
+
+    assert index.refresh() == {"indexed": 1, "removed": 1, "unchanged": 0}
+    assert index.search("touchdown")
+    assert index.search("dimers") == []
+    assert index.search("mutant") == []
+
+
+def test_index_paths_updates_single_files(temp_dir):
+    """Uploads and README saves index just the files written."""
+    index, exp = _project(temp_dir)
+    notes = exp / "protocol.md"
+    notes.write_text("Use Phusion polymerase.")
+
+    assert index.index_paths([notes, exp / "gel.png", temp_dir / ".labacc" / "notes.md"]) == 1
+    assert index.search("phusion")[0]["path"].endswith("protocol.md")
+
+    notes.unlink()
+    index.index_paths([notes])
+    assert index.search("phusion") == []
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for all-sheet Excel profiling.
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components import excel_profile
+from src.components.excel_profile import format_workbook_profile, profile_workbook
+from src.components.table_sidecar import TableSidecar
+
+
+@pytest.fixture
+def workbook(temp_dir):
+    path = temp_dir / "assay.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"well": [f"A{i}" for i in range(50)], "od600": np.linspace(0.1, 1.0, 50)}).to_excel(
+            writer, sheet_name="raw", index=False)
+        pd.DataFrame({c: [f"S{r}{c}" for r in range(8)] for c in "ABC"}).to_excel(
+            writer, sheet_name="plate map", index=False)
+        pd.DataFrame().to_excel(writer, sheet_name="notes", index=False)
+    return path
+
+
+def test_every_sheet_is_profiled(workbook):
+    """All sheets are parsed in worker processes and summarized together."""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        profile = asyncio.run(profile_workbook(str(workbook), executor=executor))
+
+    raw, plate_map, notes = profile["sheets"]
+    assert [s["sheet"] for s in profile["sheets"]] == ["raw", "plate map", "notes"]
+    assert raw["rows"] == 50 and raw["columns"][1] == {"name": "od600", "dtype": "floating", "non_null": 50}
+    assert np.isclose(raw["numeric"]["od600"]["mean"], 0.55)
+    assert plate_map["columns"][0]["dtype"] == "string" and plate_map["columns"][0]["unique"] == 8
+    assert notes["rows"] == 0
+
+    summary = format_workbook_profile(profile)
+    assert "Excel workbook with 3 sheets" in summary
+    assert "Sheet 'plate map': 8 rows x 3 columns" in summary
+    assert "od600: n=50" in summary
+
+
+def test_large_sheets_are_truncated(workbook):
+    """Sheets beyond max_rows are profiled from their first rows and flagged."""
+    with ThreadPoolExecutor() as executor:
+        profile = asyncio.run(profile_workbook(str(workbook), max_rows=10, executor=executor))
+    raw = profile["sheets"][0]
+    assert raw["rows"] == 10 and raw["truncated"]
+    assert "first 10 rows of ~51" in format_workbook_profile(profile)
+
+    # A sheet of exactly max_rows rows is complete
+    with ThreadPoolExecutor() as executor:
+        profile = asyncio.run(profile_workbook(str(workbook), max_rows=50, executor=executor))
+    assert profile["sheets"][0]["rows"] == 50 and not profile["sheets"][0]["truncated"]
+
+
+def test_time_budget_skips_unfinished_sheets(workbook, monkeypatch):
+    """Sheets that don't finish within the budget are reported, not awaited."""
+    real = excel_profile.profile_sheet
+
+    def slow_on_plate_map(file_path, sheet, *args):
+        if sheet == "plate map":
+            import time
+            time.sleep(1.0)
+        return real(file_path, sheet, *args)
+
+    monkeypatch.setattr(excel_profile, "profile_sheet", slow_on_plate_map)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        profile = asyncio.run(profile_workbook(str(workbook), time_budget=0.5, executor=executor))
+
+    assert profile["sheets"][1]["skipped"] == excel_profile.SKIPPED_TIME_BUDGET
+    assert "skipped" not in profile["sheets"][0]
+    assert "Sheet 'plate map' (~9 rows): skipped, time budget exceeded" in format_workbook_profile(profile)
+
+
+def test_sidecar_used_when_current(workbook):
+    """A workbook with a current sidecar is profiled from it, without the pool."""
+    TableSidecar(str(workbook)).build()
+    profile = asyncio.run(profile_workbook(str(workbook), executor=None))
+    assert profile["source"] == "sidecar"
+    assert [s["rows"] for s in profile["sheets"]] == [50, 8, 0]
+    assert profile["sheets"][1]["columns"][0]["unique"] == 8
+
+
+def test_first_analysis_builds_sidecar(workbook, monkeypatch):
+    """Analyzing a large workbook builds its sidecar and profiles from it."""
+    from src.components.file_analyzer import QuickFileAnalyzer
+    from src.config.config import config
+
+    monkeypatch.setitem(config._config["analysis"]["sidecar"], "min_size_kb", 0)
+    analysis = asyncio.run(QuickFileAnalyzer(llm=None)._analyze_excel(str(workbook), workbook.name, 0))
+
+    assert TableSidecar(str(workbook)).is_fresh()
+    assert analysis.statistics["source"] == "sidecar"
+    assert analysis.data_points == 50 * 2 + 8 * 3
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent multi-file analysis.
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.data_stats import DataStatsCache
+from src.components.file_analyzer import QuickFileAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def stats_cache(temp_dir, monkeypatch):
+    """Keep CSV statistics out of the shared cache."""
+    cache = DataStatsCache(str(temp_dir / "stats_cache"))
+    monkeypatch.setattr("src.components.file_analyzer.get_data_stats_cache", lambda: cache)
+    return cache
+
+
+class BatchLLM:
+    """Summarizes each file in a prompt by name, tracking calls and concurrency."""
+
+    def __init__(self, skip: str = None):
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.skip = skip
+
+    async def ainvoke(self, messages):
+        prompt = messages[0].content
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        sections = re.findall(r"\[(\d+)\] Filename: (\S+)", prompt)
+        if sections:
+            lines = [f"[{i}] notes about {name}" for i, name in sections if name != self.skip]
+            return SimpleNamespace(content="\n".join(lines))
+        name = re.search(r"Filename: (\S+)", prompt).group(1)
+        return SimpleNamespace(content=f"single summary of {name}")
+
+
+def _files(temp_dir: Path, texts: int = 5):
+    paths = []
+    for i in range(texts):
+        path = temp_dir / f"note_{i}.md"
+        path.write_text(f"# Note {i}\n\nProtocol step {i}")
+        paths.append(str(path))
+    csv_path = temp_dir / "data.csv"
+    pd.DataFrame({"x": range(10), "y": [v * 2.0 for v in range(10)]}).to_csv(csv_path, index=False)
+    paths.insert(2, str(csv_path))
+    return paths
+
+
+async def test_text_previews_are_batched(temp_dir):
+    """Text files share LLM requests; results come back in input order."""
+    llm = BatchLLM()
+    paths = _files(temp_dir)
+
+    analyses = await QuickFileAnalyzer(llm).analyze_multiple_files(paths)
+
+    assert [a.file_path for a in analyses] == paths
+    assert len(llm.prompts) == 1
+    assert analyses[0].content_summary == "notes about note_0.md"
+    assert analyses[0].analysis_confidence == 0.8
+    assert analyses[2].file_type == "csv" and analyses[2].statistics["rows"] == 10
+
+
+async def test_missing_batch_answers_fall_back_to_single_requests(temp_dir):
+    """Files the batched reply skipped are summarized on their own, within the LLM limit."""
+    llm = BatchLLM(skip="note_3.md")
+    paths = _files(temp_dir, texts=6)
+
+    analyzer = QuickFileAnalyzer(llm)
+    streamed = [a async for a in analyzer.iter_analyses(paths, llm_concurrency=2, text_batch_size=3)]
+
+    assert sorted(a.file_path for a in streamed) == sorted(paths)
+    summaries = {Path(a.file_path).name: a.content_summary for a in streamed}
+    assert summaries["note_3.md"] == "single summary of note_3.md"
+    assert summaries["note_4.md"] == "notes about note_4.md"
+    assert len(llm.prompts) == 3
+    assert llm.max_in_flight <= 2
+
+
+async def test_unreadable_text_file_is_reported(temp_dir):
+    """A missing file in a batch gets an error analysis without failing the others."""
+    llm = BatchLLM()
+    paths = _files(temp_dir, texts=2) + [str(temp_dir / "gone.md")]
+
+    analyses = await QuickFileAnalyzer(llm).analyze_multiple_files(paths)
+
+    assert analyses[-1].error_message is not None
+    assert analyses[-1].analysis_confidence == 0.1
+    assert analyses[0].content_summary == "notes about note_0.md"
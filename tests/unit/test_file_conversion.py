@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for page-range parallel PDF conversion.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api import file_conversion
+from src.api.conversion_store import ConversionStore, hash_file
+from src.api.file_conversion import FileConversionPipeline
+from src.config.config import config
+from src.memory.doc_index import get_doc_index
+
+
+def _pipeline(temp_dir, monkeypatch, fail_ranges=()):
+    pipeline = FileConversionPipeline(str(temp_dir))
+    pipeline._mineru_available = True
+    monkeypatch.setitem(config._config["conversion"], "pdf_pages_per_range", 10)
+    monkeypatch.setitem(config._config["conversion"], "pdf_parallel_ranges", 3)
+    monkeypatch.setattr(pipeline, "_count_pdf_pages", lambda path: 25)
+
+    def fake_mineru(path, start_page=None, end_page=None):
+        if start_page in fail_ranges:
+            raise RuntimeError("timeout")
+        return f"pages {start_page + 1}-{end_page + 1}"
+
+    monkeypatch.setattr(pipeline, "_run_mineru", fake_mineru)
+    return pipeline
+
+
+def test_ranges_stitched_in_order(temp_dir, monkeypatch):
+    """Page ranges are converted separately and joined in page order."""
+    pipeline = _pipeline(temp_dir, monkeypatch)
+    output = temp_dir / "thesis.md"
+
+    assert asyncio.run(pipeline.convert_pdf_to_markdown(temp_dir / "thesis.pdf", output))
+    assert output.read_text() == "pages 1-10\n\npages 11-20\n\npages 21-25"
+
+
+def test_partial_output_and_failed_range(temp_dir, monkeypatch):
+    """A failed range leaves a visible gap; leading ranges are written early."""
+    pipeline = _pipeline(temp_dir, monkeypatch, fail_ranges=(10,))
+    output = temp_dir / "sop.md"
+
+    pipeline._write_stitched(output, [(0, 9), (10, 19), (20, 24)], {0: "pages 1-10"}, 25)
+    assert "pages 1-10 of 25 are available" in output.read_text()
+
+    assert asyncio.run(pipeline.convert_pdf_to_markdown(temp_dir / "sop.pdf", output))
+    content = output.read_text()
+    assert content.startswith("pages 1-10")
+    assert "Conversion failed for pages 11-20" in content
+    assert content.endswith("pages 21-25")
+
+
+def test_upload_registered_once_with_full_record(temp_dir):
+    """process_upload writes one complete registry entry in a single write."""
+    exp_dir = temp_dir / "exp_001"
+    (exp_dir / "originals").mkdir(parents=True)
+    data_file = exp_dir / "originals" / "plate.csv"
+    data_file.write_text("well,od\nA1,0.5\n")
+
+    pipeline = FileConversionPipeline(str(temp_dir))
+    result = asyncio.run(pipeline.process_upload(data_file, "exp_001", file_size=17))
+    assert result["file_size"] == 17
+
+    registry = json.loads((exp_dir / ".labacc" / "file_registry.json").read_text())
+    entry = registry["files"]["plate.csv"]
+    assert entry["original_path"] == "exp_001/originals/plate.csv"
+    assert entry["file_size"] == 17
+    assert entry["conversion"]["status"] == "not_needed"
+    assert entry["analysis"]["analyzed"] is False
+
+
+def test_upload_is_searchable(temp_dir):
+    """Uploaded text files go straight into the project's document index."""
+    exp_dir = temp_dir / "exp_001"
+    exp_dir.mkdir()
+    data_file = exp_dir / "plate.csv"
+    data_file.write_text("well,od\nA1,0.5\nB7,contaminated\n")
+
+    pipeline = FileConversionPipeline(str(temp_dir))
+    asyncio.run(pipeline.process_upload(data_file, "exp_001"))
+
+    results = get_doc_index(str(temp_dir)).search("contaminated")
+    assert results[0]["path"] == "exp_001/plate.csv"
+
+
+def test_imported_file_indexed_in_its_project(temp_dir):
+    """Imports pass full experiment paths and land in the project's own index."""
+    project = temp_dir / "admin_projects" / "project_x"
+    exp_dir = project / "experiments" / "imported_files"
+    exp_dir.mkdir(parents=True)
+    data_file = exp_dir / "plate.csv"
+    data_file.write_text("well,od\nB7,contaminated\n")
+
+    pipeline = FileConversionPipeline(str(project))
+    asyncio.run(pipeline.process_upload(data_file, str(exp_dir)))
+
+    results = get_doc_index(str(project)).search("contaminated")
+    assert results[0]["path"] == "experiments/imported_files/plate.csv"
+    assert not (temp_dir / "admin_projects" / ".labacc").exists()
+
+
+def test_markitdown_fallback_is_cached_under_markitdown(temp_dir, monkeypatch):
+    """Output MarkItDown produced after MinerU failed is not filed under MinerU's key."""
+    store = ConversionStore(str(temp_dir / "store"))
+    monkeypatch.setattr(file_conversion, "get_conversion_store", lambda: store)
+    pipeline = _pipeline(temp_dir, monkeypatch, fail_ranges=(0, 10, 20))
+    monkeypatch.setattr(pipeline, "_get_markitdown",
+                        lambda: SimpleNamespace(convert=lambda path: SimpleNamespace(text_content="plain text")))
+
+    pdf = temp_dir / "exp_001" / "paper.pdf"
+    pdf.parent.mkdir()
+    pdf.write_bytes(b"%PDF-1.4 fake")
+    result = asyncio.run(pipeline.process_upload(pdf, "exp_001"))
+
+    assert result["conversion_status"] == "success"
+    assert result["conversion_method"] == "MarkItDown"
+    sha256 = hash_file(pdf)
+    markitdown, version = pipeline._markitdown_converter()
+    assert store.materialize(sha256, markitdown, version, temp_dir / "a.md")
+    assert not store.materialize(sha256, "MinerU", pipeline._mineru_version, temp_dir / "b.md")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared image analyzer and its result cache.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.image_analyzer import ImageAnalyzer, ImageResultCache
+
+REPLY = """**Content Description**
+An agarose gel with six lanes.
+
+**Experimental Context**
+PCR product check.
+
+**Key Features**
+- Ladder in lane 1
+- Single band at 500 bp
+
+**Suggested Tags**
+- gel
+- pcr
+"""
+
+
+class CountingVision:
+    """Vision client stand-in that records the images it is sent."""
+
+    def __init__(self):
+        self.urls = []
+
+    async def ainvoke(self, messages):
+        self.urls.append(messages[0].content[1]["image_url"]["url"])
+        return SimpleNamespace(content=REPLY)
+
+
+def _analyzer(temp_dir, vision):
+    analyzer = ImageAnalyzer(vision_model_name="no-such-model", cache=ImageResultCache(str(temp_dir / "cache")))
+    analyzer.vision_llm = vision
+    return analyzer
+
+
+def _gel(path: Path, value: int = 200):
+    Image.fromarray(np.full((60, 80, 3), value, dtype=np.uint8)).save(path)
+
+
+async def test_repeat_analysis_is_served_from_cache(temp_dir):
+    """The same image and prompt cost one vision call, even under another file name."""
+    vision = CountingVision()
+    _gel(temp_dir / "gel.png")
+    (temp_dir / "copy").mkdir()
+    _gel(temp_dir / "copy" / "gel.png")
+
+    first = await _analyzer(temp_dir, vision).analyze_image(str(temp_dir / "gel.png"), context="PCR")
+    second = await _analyzer(temp_dir, vision).analyze_image(str(temp_dir / "copy" / "gel.png"), context="PCR")
+
+    assert len(vision.urls) == 1
+    assert vision.urls[0].startswith("data:image/png;base64,")
+    assert first.content_description == "An agarose gel with six lanes."
+    assert first.key_features == ["Ladder in lane 1", "Single band at 500 bp"]
+    assert second.success and second.key_features == first.key_features
+    assert second.file_path == str(temp_dir / "copy" / "gel.png")
+    assert second.image_size == (80, 60) and second.format == "PNG"
+
+
+async def test_changed_image_or_prompt_misses_cache(temp_dir):
+    """The cache key covers the image content, the prompt and the model."""
+    vision = CountingVision()
+    path = temp_dir / "gel.png"
+    _gel(path)
+    analyzer = _analyzer(temp_dir, vision)
+
+    await analyzer.analyze_image(str(path))
+    await analyzer.analyze_image(str(path), context="western blot")
+    _gel(path, value=10)
+    await analyzer.analyze_image(str(path))
+    analyzer.model_name = "another-model"
+    await analyzer.analyze_image(str(path))
+
+    assert len(vision.urls) == 4
+
+
+async def test_failed_analysis_is_not_cached(temp_dir):
+    """Errors are retried on the next call instead of being cached."""
+    class FailingVision:
+        async def ainvoke(self, messages):
+            raise ConnectionError("vision service down")
+
+    path = temp_dir / "gel.png"
+    _gel(path)
+
+    failed = await _analyzer(temp_dir, FailingVision()).analyze_image(str(path))
+    vision = CountingVision()
+    retried = await _analyzer(temp_dir, vision).analyze_image(str(path))
+
+    assert not failed.success and "vision service down" in failed.error_message
+    assert retried.success and len(vision.urls) == 1
+
+
+class BatchVision:
+    """Answers multi-image messages with one section per image, optionally leaving some out."""
+
+    def __init__(self, skip=()):
+        self.image_counts = []
+        self.skip = set(skip)
+
+    async def ainvoke(self, messages):
+        images = [part for part in messages[0].content if part["type"] == "image_url"]
+        self.image_counts.append(len(images))
+        if len(images) == 1:
+            return SimpleNamespace(content=REPLY)
+        sections = [f"### Image {i}: file\n{REPLY.replace('six lanes', f'{i} lanes')}"
+                    for i in range(1, len(images) + 1) if i not in self.skip]
+        return SimpleNamespace(content="\n".join(sections))
+
+
+async def test_batch_shares_requests_and_fills_cache(temp_dir, monkeypatch):
+    """Images are sent several per request; a missed image is retried alone; batch results are cached."""
+    paths = []
+    for i in range(5):
+        paths.append(str(temp_dir / f"gel_{i}.png"))
+        _gel(Path(paths[-1]), value=40 * i)
+    vision = BatchVision(skip={2})
+    analyzer = _analyzer(temp_dir, vision)
+    analyzer.max_images_per_request = 3
+
+    results = await analyzer.analyze_images(paths, context="PCR")
+
+    # Two shared requests (3 + 2 images), then the second image of each is retried alone
+    assert sorted(vision.image_counts) == [1, 1, 2, 3]
+    assert [r.file_path for r in results] == paths
+    assert [r.content_description for r in results] == [
+        "An agarose gel with 1 lanes.", "An agarose gel with six lanes.", "An agarose gel with 3 lanes.",
+        "An agarose gel with 1 lanes.", "An agarose gel with six lanes.",
+    ]
+    assert results[0].key_features == ["Ladder in lane 1", "Single band at 500 bp"]
+
+    # Analyzing the folder again is served from the cache, without reading the images into memory
+    vision.image_counts.clear()
+    loads = []
+    original_load = analyzer.load_image
+    monkeypatch.setattr(analyzer, "load_image", lambda path: loads.append(path) or original_load(path))
+    again = await analyzer.analyze_images(paths, context="PCR")
+    assert vision.image_counts == [] and loads == []
+    assert [r.content_description for r in again] == [r.content_description for r in results]
+
+    # Batched answers were made at a lower resolution and are not served to single-image calls
+    alone = await analyzer.analyze_image(paths[3], context="PCR")
+    assert vision.image_counts == [1]
+    assert alone.content_description == "An agarose gel with six lanes."
+
+
+async def test_single_image_models_fan_out(temp_dir):
+    """Models without multi-image support get one request per image."""
+    paths = []
+    for i in range(3):
+        paths.append(str(temp_dir / f"blot_{i}.png"))
+        _gel(Path(paths[-1]), value=10 + i)
+    paths.append(str(temp_dir / "missing.png"))
+    vision = BatchVision()
+
+    results = await _analyzer(temp_dir, vision).analyze_images(paths, max_concurrent=2)
+
+    assert vision.image_counts == [1, 1, 1]
+    assert all(r.success for r in results[:3])
+    assert not results[3].success and "not found" in results[3].error_message
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unit tests for vision payload preprocessing.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.image_preprocess import prepare_image
+
+
+def _encode(frames, format="TIFF", **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format=format, save_all=len(frames) > 1, append_images=frames[1:], **kwargs)
+    return buffer.getvalue()
+
+
+def _microscopy(width=3000, height=2000, seed=0) -> Image.Image:
+    """16-bit frame using a narrow slice of the range, as camera exports do."""
+    rng = np.random.default_rng(seed)
+    values = rng.integers(1000, 5000, size=(height, width), dtype=np.uint16)
+    return Image.fromarray(values)
+
+
+def test_small_images_pass_through():
+    """A small 8-bit PNG is sent as is."""
+    data = _encode([Image.new("RGB", (200, 100), (10, 20, 30))], format="PNG")
+    prepared = prepare_image(data)
+    assert prepared["bytes"] == data
+    assert prepared["mime_type"] == "image/png"
+    assert not prepared["reencoded"]
+
+
+def test_16bit_tiff_is_downscaled_and_stretched():
+    """High bit depth becomes full-range 8-bit, within the edge and byte limits."""
+    data = _encode([_microscopy()])
+    prepared = prepare_image(data, max_edge=1024, max_bytes=512 * 1024)
+
+    assert prepared["reencoded"] and prepared["mime_type"] == "image/jpeg"
+    assert (prepared["width"], prepared["height"]) == (1024, 683)
+    assert len(prepared["bytes"]) <= 512 * 1024 < prepared["original_bytes"]
+    with Image.open(io.BytesIO(prepared["bytes"])) as img:
+        assert img.mode == "L"
+        values = np.asarray(img)
+    assert values.min() < 30 and values.max() > 225
+
+
+def test_multipage_montage_and_representative_frame():
+    """Multi-page stacks become a tiled montage, or a single frame on request."""
+    frames = [_microscopy(400, 300, seed=i) for i in range(5)]
+    data = _encode(frames)
+
+    montage = prepare_image(data, max_edge=900, output_format="webp")
+    assert montage["frames"] == 5 and montage["mime_type"] == "image/webp"
+    # 5 frames tile into 3 columns x 2 rows, scaled to fit the edge
+    assert (montage["width"], montage["height"]) == (900, 450)
+
+    middle = prepare_image(data, multipage="middle")
+    assert middle["frames"] == 1
+    assert (middle["width"], middle["height"]) == (400, 300)
+
+
+def test_byte_budget_lowers_quality_then_size():
+    """Noise does not compress, so the image shrinks until it fits the budget."""
+    noise = np.random.default_rng(1).integers(0, 256, size=(2000, 2000, 3), dtype=np.uint8)
+    data = _encode([Image.fromarray(noise)], format="PNG")
+    prepared = prepare_image(data, max_edge=2048, max_bytes=200 * 1024)
+
+    assert len(prepared["bytes"]) <= 200 * 1024
+    assert prepared["width"] < 2000
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent background job queue.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import job_routes
+from src.api.job_queue import FAILED, PENDING, SUCCEEDED, JobQueue
+
+
+async def test_priority_order_and_result(temp_dir):
+    """Higher priority jobs are claimed first and results are stored."""
+    queue = JobQueue(str(temp_dir / "jobs.db"))
+    seen = []
+
+    async def handler(job):
+        seen.append(job["payload"]["n"])
+        return {"double": job["payload"]["n"] * 2}
+
+    queue.register("work", handler)
+    low = queue.enqueue("work", {"n": 1}, priority=0)
+    high = queue.enqueue("work", {"n": 2}, priority=10)
+
+    while (job := queue._claim("work")) is not None:
+        await queue.run_job(job)
+
+    assert seen == [2, 1]
+    assert queue.get(low["id"])["status"] == SUCCEEDED
+    assert queue.get(high["id"])["result"] == {"double": 4}
+
+
+async def test_retry_with_backoff_then_fail(temp_dir):
+    """Failing jobs are re-queued with backoff until attempts run out."""
+    queue = JobQueue(str(temp_dir / "jobs.db"), max_attempts=2, backoff_seconds=0)
+
+    async def handler(job):
+        raise RuntimeError("provider overloaded")
+
+    queue.register("flaky", handler)
+    job_id = queue.enqueue("flaky", {})["id"]
+
+    await queue.run_job(queue._claim("flaky"))
+    job = queue.get(job_id)
+    assert job["status"] == PENDING
+    assert job["attempts"] == 1
+    assert "provider overloaded" in job["error"]
+
+    await queue.run_job(queue._claim("flaky"))
+    job = queue.get(job_id)
+    assert job["status"] == FAILED
+    assert job["attempts"] == 2
+
+
+async def test_running_jobs_recovered_after_restart(temp_dir):
+    """Jobs interrupted mid-run are picked up again by a new queue."""
+    db_path = str(temp_dir / "jobs.db")
+    queue = JobQueue(db_path)
+    job_id = queue.enqueue("convert", {"file": "a.pdf"}, session_id="s1")["id"]
+    queue._claim("convert")
+
+    restarted = JobQueue(db_path)
+    await restarted.start()
+    await restarted.stop()
+
+    assert restarted.get(job_id)["status"] == PENDING
+    assert restarted.list_jobs(session_id="s1")[0]["id"] == job_id
+
+
+def test_job_status_is_private_to_its_session(temp_dir, monkeypatch):
+    """A job can only be read with the session ID it was enqueued for."""
+    queue = JobQueue(str(temp_dir / "jobs.db"))
+    monkeypatch.setattr(job_routes, "get_job_queue", lambda: queue)
+    job_id = queue.enqueue("work", {"file": "plate.csv"}, session_id="session_a")["id"]
+
+    app = FastAPI()
+    app.include_router(job_routes.router)
+    client = TestClient(app)
+
+    assert client.get(f"/api/jobs/{job_id}", headers={"X-Session-ID": "session_a"}).json()["id"] == job_id
+    assert client.get(f"/api/jobs/{job_id}", headers={"X-Session-ID": "session_b"}).status_code == 404
+    assert client.get(f"/api/jobs/{job_id}").status_code == 401
+
+
+async def test_retry_skips_completed_steps(temp_dir, monkeypatch):
+    """Steps recorded by a failed attempt are not repeated when the job is retried."""
+    from src.api import upload_jobs
+
+    queue = JobQueue(str(temp_dir / "jobs.db"), max_attempts=2, backoff_seconds=0)
+    monkeypatch.setattr(upload_jobs, "get_job_queue", lambda: queue)
+    posted = []
+
+    async def post(message):
+        posted.append(message)
+
+    async def handler(job):
+        await upload_jobs._run_step(job, "notified", lambda: post("uploaded"))
+        answer = await upload_jobs._run_step(job, "analysis", lambda: asyncio.sleep(0, result=f"try {job['attempts']}"))
+        if job["attempts"] == 1:
+            raise ConnectionError("chat server restarting")
+        await upload_jobs._run_step(job, "analysis_sent", lambda: post(answer))
+        return {"answer": answer}
+
+    queue.register("analyze", handler)
+    job_id = queue.enqueue("analyze", {})["id"]
+    await queue.run_job(queue._claim("analyze"))
+    await queue.run_job(queue._claim("analyze"))
+
+    job = queue.get(job_id)
+    assert job["status"] == SUCCEEDED
+    assert job["result"] == {"answer": "try 1"}
+    assert posted == ["uploaded", "try 1"]
+
+
+async def test_rerun_conversion_does_not_enqueue_follow_ups_twice(temp_dir, monkeypatch):
+    """A conversion job re-run after a crash reuses the follow-up jobs it already queued."""
+    from src.api import file_routes, upload_jobs
+
+    queue = JobQueue(str(temp_dir / "jobs.db"))
+    monkeypatch.setattr(upload_jobs, "get_job_queue", lambda: queue)
+
+    async def convert(*args):
+        return {"conversion_status": "not_needed"}
+
+    monkeypatch.setattr(file_routes, "convert_and_register_upload", convert)
+    upload = temp_dir / "exp_001" / "notes.txt"
+    upload.parent.mkdir()
+    upload.write_text("notes")
+    job_id = upload_jobs.enqueue_upload_processing(upload, "notes.txt", 5, "exp_001", str(temp_dir),
+                                                   session_id="session_a")["id"]
+
+    # The first run is interrupted after queuing its follow-ups; the restart runs the job again
+    first = await upload_jobs.run_conversion_job(queue._claim(upload_jobs.CONVERT_UPLOAD))
+    second = await upload_jobs.run_conversion_job(queue.get(job_id))
+
+    assert second["follow_up_jobs"] == first["follow_up_jobs"]
+    assert set(first["follow_up_jobs"]) == {upload_jobs.SUMMARIZE_UPLOAD, upload_jobs.ANALYZE_UPLOAD}
+    assert len(queue.list_jobs(session_id="session_a")) == 3
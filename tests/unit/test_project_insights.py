@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the cached project insights artifact.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.memory.project_insights import ProjectInsights
+
+
+class CountingLLM:
+    """Answers digests with the experiment name and counts calls."""
+
+    def __init__(self):
+        self.digests = []
+        self.syntheses = 0
+
+    async def ainvoke(self, messages):
+        prompt = messages[0].content
+        if prompt.startswith("Summarize"):
+            name = prompt.split("Experiment: ")[1].split("\n")[0]
+            self.digests.append(name)
+            return SimpleNamespace(content=f"digest of {name}")
+        self.syntheses += 1
+        return SimpleNamespace(content=f"synthesis #{self.syntheses}")
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    # Distinct mtimes even on coarse-grained filesystems
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def _project(temp_dir):
+    for i in range(7):
+        _write(temp_dir / "experiments" / f"exp_{i:03d}" / "README.md", f"# Experiment {i}\n\nResult {i}")
+    return ProjectInsights(str(temp_dir))
+
+
+def test_build_covers_every_experiment(temp_dir):
+    """All experiments are digested, not just the first five, and synthesized once."""
+    insights, llm = _project(temp_dir), CountingLLM()
+    artifact = asyncio.run(insights.refresh(llm))
+
+    assert len(artifact["experiments"]) == 7
+    assert len(llm.digests) == 7 and llm.syntheses == 1
+    assert artifact["synthesis"] == "synthesis #1"
+    assert "experiments/exp_006: digest of experiments/exp_006" in insights.format_digests(artifact["experiments"])
+    assert not insights.is_stale()
+
+
+def test_rebuild_is_incremental(temp_dir):
+    """Only changed READMEs are re-digested; untouched projects cost no LLM calls."""
+    insights, llm = _project(temp_dir), CountingLLM()
+    asyncio.run(insights.refresh(llm))
+
+    asyncio.run(insights.refresh(llm))
+    assert len(llm.digests) == 7 and llm.syntheses == 1
+
+    readme = temp_dir / "experiments" / "exp_003" / "README.md"
+    _write(readme, "# Experiment 3\n\nNew result")
+    assert insights.is_stale()
+    artifact = asyncio.run(insights.refresh(llm))
+    assert llm.digests[7:] == ["experiments/exp_003"]
+    assert artifact["synthesis"] == "synthesis #2"
+
+    # Touched but identical content keeps the digest and synthesis
+    _write(readme, "# Experiment 3\n\nNew result")
+    asyncio.run(insights.refresh(llm))
+    assert len(llm.digests) == 8 and llm.syntheses == 2
+
+
+def test_removed_experiment_dropped(temp_dir):
+    """Deleting an experiment removes its digest and re-synthesizes."""
+    insights, llm = _project(temp_dir), CountingLLM()
+    asyncio.run(insights.refresh(llm))
+
+    (temp_dir / "experiments" / "exp_000" / "README.md").unlink()
+    artifact = asyncio.run(insights.refresh(llm))
+    assert "experiments/exp_000" not in artifact["experiments"]
+    assert llm.syntheses == 2
+
+
+def test_scheduled_refreshes_are_debounced(temp_dir):
+    """A burst of README saves triggers a single background rebuild."""
+    insights, llm = _project(temp_dir), CountingLLM()
+
+    async def burst():
+        for _ in range(5):
+            insights.schedule_refresh(llm, delay=0.05)
+        await insights._refresh_task
+
+    asyncio.run(burst())
+    assert llm.syntheses == 1
+    assert insights.load()["synthesis"] == "synthesis #1"
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory FileRegistry cache and batched writes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.file_registry import FileRegistry
+
+
+def test_path_index_follows_updates(temp_dir):
+    """Lookups by original or converted path use the reverse index."""
+    registry = FileRegistry(str(temp_dir), flush_delay=0)
+    registry.add_file("exp_001", "doc.pdf", "exp_001/originals/doc.pdf", "exp_001/doc.md",
+                      conversion_status="success")
+
+    assert registry.get_file_by_path("exp_001", "exp_001/doc.md")["filename"] == "doc.pdf"
+
+    # Re-adding without a conversion drops the stale converted path
+    registry.add_file("exp_001", "doc.pdf", "exp_001/originals/doc.pdf")
+    assert registry.get_file_by_path("exp_001", "exp_001/doc.md") is None
+    assert registry.get_file_by_path("exp_001", "exp_001/originals/doc.pdf") is not None
+
+
+def test_batch_writes_once_and_merges_external_edits(temp_dir):
+    """A batch is one write, and entries written by others meanwhile are kept."""
+    registry = FileRegistry(str(temp_dir), flush_delay=0)
+    registry.add_file("exp_001", "a.csv", "exp_001/a.csv")
+    registry_path = registry.get_registry_path("exp_001")
+
+    writes = []
+    real_replace = os.replace
+
+    def counting_replace(src, dst):
+        writes.append(dst)
+        real_replace(src, dst)
+
+    os.replace = counting_replace
+    try:
+        with registry.batch():
+            for i in range(20):
+                registry.add_file("exp_001", f"b{i}.csv", f"exp_001/b{i}.csv")
+
+            # Another writer adds an entry while our changes are pending
+            data = json.loads(registry_path.read_text())
+            data["files"]["external.csv"] = {"original_path": "exp_001/external.csv"}
+            registry_path.write_text(json.dumps(data))
+    finally:
+        os.replace = real_replace
+
+    assert len(writes) == 1
+    saved = json.loads(registry_path.read_text())
+    assert "external.csv" in saved["files"]
+    assert "b19.csv" in saved["files"]
+    assert saved["total_files"] == 22
+
+
+def test_external_change_invalidates_cache(temp_dir):
+    """The cache is re-read when the file changes on disk."""
+    registry = FileRegistry(str(temp_dir), flush_delay=0)
+    registry.add_file("exp_001", "a.csv", "exp_001/a.csv")
+    registry_path = registry.get_registry_path("exp_001")
+
+    data = json.loads(registry_path.read_text())
+    data["files"]["added_elsewhere.csv"] = {"original_path": "exp_001/added_elsewhere.csv"}
+    registry_path.write_text(json.dumps(data, indent=4))
+
+    assert registry.get_file("exp_001", "added_elsewhere.csv") is not None
+    assert FileRegistry(str(temp_dir)).get_file_by_path(
+        "exp_001", "exp_001/added_elsewhere.csv")["filename"] == "added_elsewhere.csv"
+
+
+async def test_deferred_flush_writes_after_delay(temp_dir):
+    """Changes made on the event loop are written once, after the flush delay."""
+    registry = FileRegistry(str(temp_dir), flush_delay=0.05)
+    (temp_dir / "exp_001").mkdir()
+    registry_path = registry.get_registry_path("exp_001")
+
+    registry.add_file("exp_001", "a.csv", "exp_001/a.csv")
+    registry.add_file("exp_001", "b.csv", "exp_001/b.csv")
+    assert not registry_path.exists()
+
+    await asyncio.sleep(0.2)
+    saved = json.loads(registry_path.read_text())
+    assert sorted(saved["files"]) == ["a.csv", "b.csv"]
+
+
+async def test_deferred_flush_skips_deleted_experiment(temp_dir, caplog):
+    """A folder deleted before the deferred write is not recreated; the drop is logged."""
+    registry = FileRegistry(str(temp_dir), flush_delay=0.05)
+    (temp_dir / "exp_002").mkdir()
+
+    registry.add_file("exp_002", "a.csv", "exp_002/a.csv")
+    shutil.rmtree(temp_dir / "exp_002")
+    with caplog.at_level(logging.WARNING, logger="src.api.file_registry"):
+        await asyncio.sleep(0.2)
+
+    assert not (temp_dir / "exp_002").exists()
+    assert "Dropping pending registry changes (a.csv)" in caplog.text
+    assert registry.get_file("exp_002", "a.csv") is None
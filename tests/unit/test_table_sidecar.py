@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit tests for columnar table sidecars.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.components.data_stats import DataStatsCache
+from src.components.table_sidecar import TableSidecar
+
+
+def _frame(rows=1_000):
+    return pd.DataFrame({
+        "well": [f"A{i % 12}" for i in range(rows)],
+        "cycle": np.arange(rows),
+        "signal": np.linspace(0, 1, rows),
+        "passed": np.arange(rows) % 3 == 0,
+    })
+
+
+def test_round_trip_is_memory_mapped(temp_dir):
+    """Columns come back with their values and types, backed by the sidecar files."""
+    df = _frame()
+    path = temp_dir / "plate.csv"
+    df.to_csv(path, index=False)
+
+    sidecar = TableSidecar(str(path), chunk_rows=128)
+    assert not sidecar.is_fresh()
+    sidecar.build()
+    assert sidecar.is_fresh()
+    assert (temp_dir / ".labacc" / "tables" / "plate.csv" / "manifest.json").exists()
+
+    loaded = sidecar.load()
+    pd.testing.assert_frame_equal(loaded.drop(columns="well"), df.drop(columns="well"))
+    assert list(loaded["well"].astype(str)) == list(df["well"])
+
+    values = loaded["signal"].to_numpy()
+    while not isinstance(values, np.memmap) and values.base is not None:
+        values = values.base
+    assert isinstance(values, np.memmap)
+
+    # Copy-on-write: changing the frame leaves the sidecar untouched
+    loaded.loc[0, "signal"] = 99.0
+    assert sidecar.load()["signal"].iloc[0] == 0.0
+
+
+def test_concurrent_builds_leave_one_valid_sidecar(temp_dir):
+    """Builds and first-access builds of one file racing in threads all succeed and agree."""
+    df = _frame(5_000)
+    path = temp_dir / "plate.csv"
+    df.to_csv(path, index=False)
+
+    def build(i):
+        sidecar = TableSidecar(str(path), chunk_rows=500)
+        return sidecar.build() if i % 2 else sidecar.ensure()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        manifests = list(pool.map(build, range(12)))
+
+    assert all(m["tables"][0]["rows"] == 5_000 for m in manifests)
+    assert TableSidecar(str(path)).load()["cycle"].sum() == df["cycle"].sum()
+    versions = list((temp_dir / ".labacc" / "tables" / "plate.csv").glob("v-*"))
+    assert len(versions) == 1
+
+
+def test_later_chunks_widen_column_kinds(temp_dir):
+    """Missing values in an int column and text in a numeric column widen the stored kind."""
+    path = temp_dir / "reader.csv"
+    path.write_text("count,value\n1,1\n2,2\n3,3\n,4\n5,overflow\n")
+
+    loaded = TableSidecar(str(path), chunk_rows=2).build() and TableSidecar(str(path)).load()
+    assert loaded["count"].dtype == np.float64
+    assert np.isnan(loaded["count"].iloc[3]) and loaded["count"].iloc[4] == 5.0
+    assert list(loaded["value"].astype(str)) == ["1", "2", "3", "4", "overflow"]
+
+
+def test_source_change_invalidates(temp_dir):
+    """Rewriting the source makes the sidecar stale until rebuilt."""
+    path = temp_dir / "plate.csv"
+    _frame(10).to_csv(path, index=False)
+    sidecar = TableSidecar(str(path))
+    sidecar.build()
+
+    _frame(20).to_csv(path, index=False)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert not sidecar.is_fresh()
+    sidecar.build()
+    assert len(sidecar.load()) == 20
+
+
+def test_excel_sheets_become_tables(temp_dir):
+    """Every sheet of a workbook is stored and can be loaded by name."""
+    path = temp_dir / "runs.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        _frame(30).to_excel(writer, sheet_name="raw", index=False)
+        pd.DataFrame({"run": [1, 2], "when": pd.to_datetime(["2025-01-01", "2025-01-02"])}).to_excel(
+            writer, sheet_name="runs", index=False)
+
+    sidecar = TableSidecar(str(path))
+    sidecar.build()
+    assert sidecar.sheets() == ["raw", "runs"]
+    runs = sidecar.load("runs")
+    assert runs["when"].dtype == "datetime64[ns]"
+    assert runs["when"].iloc[1] == pd.Timestamp("2025-01-02")
+
+
+def test_stats_use_sidecar(temp_dir):
+    """Statistics computed from the sidecar match those from the text."""
+    path = temp_dir / "plate.csv"
+    _frame().to_csv(path, index=False)
+    from_text = DataStatsCache(str(temp_dir / "a")).get_stats(str(path))
+
+    TableSidecar(str(path)).build()
+    from_sidecar = DataStatsCache(str(temp_dir / "b")).get_stats(str(path))
+    assert from_sidecar["rows"] == from_text["rows"]
+    assert from_sidecar["numeric"]["signal"]["mean"] == from_text["numeric"]["signal"]["mean"]
+    assert from_sidecar["numeric"]["cycle"]["max"] == 999
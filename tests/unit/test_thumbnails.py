@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for file browser thumbnails.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api import file_routes
+from src.api.upload_jobs import run_thumbnail_job
+from src.components.thumbnails import ThumbnailCache
+
+
+def _image(path: Path, size=(1200, 800), value=120):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(np.full((size[1], size[0], 3), value, dtype=np.uint8)).save(path)
+
+
+def _touch_later(path: Path):
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+async def test_thumbnail_is_cached_until_image_changes(temp_dir):
+    """One render per image version; outdated thumbnails are removed."""
+    image = temp_dir / "exp_001" / "gel.png"
+    _image(image)
+    cache = ThumbnailCache(str(temp_dir), size=128)
+
+    first = await cache.ensure(image)
+    assert first.parent == temp_dir / ".labacc" / "thumbs"
+    with Image.open(first) as thumb:
+        assert thumb.format == "JPEG" and thumb.size == (128, 85)
+    rendered_at = first.stat().st_mtime_ns
+    assert await cache.ensure(image) == first
+    assert first.stat().st_mtime_ns == rendered_at
+
+    _image(image, value=30)
+    _touch_later(image)
+    second = await cache.ensure(image)
+    assert second != first
+    assert list((temp_dir / ".labacc" / "thumbs").glob("*.jpg")) == [second]
+
+
+async def test_concurrent_requests_share_one_render(temp_dir, monkeypatch):
+    """A burst of requests for one image renders it once."""
+    image = temp_dir / "scan.tif"
+    Image.fromarray(np.arange(600 * 400, dtype=np.uint16).reshape(400, 600)).save(image)
+    cache = ThumbnailCache(str(temp_dir))
+
+    renders = []
+    original = cache.generate
+    monkeypatch.setattr(cache, "generate", lambda source: renders.append(source) or original(source))
+
+    paths = await asyncio.gather(*(cache.ensure(image) for _ in range(8)))
+    assert len(set(paths)) == 1 and len(renders) == 1
+    with Image.open(paths[0]) as thumb:
+        assert thumb.mode == "L" and thumb.size == (256, 171)
+
+
+async def test_thumbnail_job_under_symlinked_root(temp_dir):
+    """The upload job reports the thumbnail path even when the project root is a symlink."""
+    _image(temp_dir / "real" / "exp_001" / "gel.png")
+    (temp_dir / "link").symlink_to(temp_dir / "real")
+
+    result = await run_thumbnail_job({"payload": {
+        "file_path": str(temp_dir / "link" / "exp_001" / "gel.png"),
+        "project_root": str(temp_dir / "link"),
+    }})
+    assert result["thumbnail"].startswith(".labacc/thumbs/")
+    assert (temp_dir / "link" / result["thumbnail"]).exists()
+
+
+def test_thumbnail_route_revalidates_with_etag(temp_dir):
+    """The endpoint serves a JPEG with validators and answers 304 when unchanged."""
+    _image(temp_dir / "exp_001" / "plot.png")
+    (temp_dir / "exp_001" / "notes.md").write_text("notes")
+
+    app = FastAPI()
+    app.include_router(file_routes.router)
+    app.dependency_overrides[file_routes.get_project_root] = lambda: str(temp_dir)
+    client = TestClient(app)
+
+    response = client.get("/api/files/thumbnail/exp_001/plot.png")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    assert client.get("/api/files/thumbnail/exp_001/plot.png",
+                      headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/files/thumbnail/exp_001/plot.png",
+                      headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get("/api/files/thumbnail/exp_001/plot.png",
+                      headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}).status_code == 304
+    assert client.get("/api/files/thumbnail/exp_001/plot.png",
+                      headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+    assert client.get("/api/files/thumbnail/exp_001/plot.png",
+                      headers={"If-Modified-Since": "yesterday"}).status_code == 200
+    assert client.get("/api/files/thumbnail/exp_001/plot.png",
+                      headers={"If-None-Match": '"stale"'}).status_code == 200
+    assert client.get("/api/files/thumbnail/exp_001/notes.md").status_code == 400
+    assert client.get("/api/files/thumbnail/exp_001/missing.png").status_code == 404
+
+    listing = client.get("/api/files/list", params={"path": "exp_001"}).json()
+    urls = {f["name"]: f["thumbnail_url"] for f in listing["files"]}
+    assert urls == {"notes.md": None, "plot.png": "/api/files/thumbnail/exp_001/plot.png"}
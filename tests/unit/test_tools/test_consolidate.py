@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Unit tests for search result consolidation before summarization.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.tools.deep_research.consolidate import SearchConsolidator, normalize_url
+
+PROTOCOL = (
+    "Betaine at 1 M and DMSO at 5% reduce secondary structure in GC-rich PCR templates. [...] "
+    "Subscribe to our newsletter for weekly protocols and lab tips. [...] "
+    "Raising the denaturation temperature to 98 C helps melt GC-rich templates during PCR."
+)
+
+
+def test_urls_deduplicated_across_queries():
+    """A page returned for several queries is only passed to the first one."""
+    consolidator = SearchConsolidator()
+    shared = {"title": "GC-rich PCR", "url": "https://www.example.org/gc-pcr/?utm_source=x", "content": PROTOCOL}
+
+    first, _ = consolidator.consolidate("GC-rich PCR betaine", [shared])
+    second, saved = consolidator.consolidate(
+        "touchdown PCR", [dict(shared, url="https://example.org/gc-pcr")]
+    )
+
+    assert [r["url"] for r in first] == [shared["url"]]
+    assert second == []
+    assert saved > 0
+    assert consolidator.stats()["duplicate_results"] == 1
+    assert normalize_url("https://www.Example.org/a/?ref=tw&id=2") == "example.org/a?id=2"
+
+
+def test_boilerplate_dropped_and_budget_enforced():
+    """Boilerplate chunks are removed and the most relevant chunks fit the budget."""
+    consolidator = SearchConsolidator(max_chars_per_query=100)
+    results, saved = consolidator.consolidate(
+        "betaine DMSO GC-rich", [{"title": "t", "url": "https://a.org", "content": PROTOCOL}]
+    )
+
+    content = results[0]["content"]
+    assert "newsletter" not in content
+    assert content.startswith("Betaine at 1 M")
+    assert "98 C" not in content
+    assert saved > 0
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Unit tests for running the async deep research graph.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config.config import config
+from src.tools.deep_research import api
+from src.tools.deep_research.replay import load_fixture, replay_backend
+from src.tools.deep_research.report_store import ReportStore
+from src.tools.deep_research.result_cache import ResearchResultCache
+
+FIXTURE = Path(__file__).parent.parent.parent / "benchmarks" / "fixtures" / "deep_research_replay.json"
+
+
+class FakeGraph:
+    """Stands in for the compiled graph and records overlapping runs."""
+
+    def __init__(self, stop_reason=None):
+        self.stop_reason = stop_reason
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def ainvoke(self, state):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        topic = state["messages"][0].content
+        return {"messages": [AIMessage(content=f"report on {topic}")], "saved_path": None,
+                "stop_reason": self.stop_reason}
+
+
+def _fake_graph(monkeypatch, temp_dir, stop_reason=None):
+    graph = FakeGraph(stop_reason)
+    monkeypatch.setattr(api, "deep_research_graph", graph)
+    cache = ResearchResultCache(str(temp_dir / "research_cache"), freshness_seconds=3600)
+    monkeypatch.setattr(api, "get_result_cache", lambda: cache)
+    return graph
+
+
+def test_concurrent_runs_are_capped(monkeypatch, temp_dir):
+    """No more than max_concurrent_runs research runs execute at once."""
+    graph = _fake_graph(monkeypatch, temp_dir)
+    monkeypatch.setitem(config._config.setdefault("deep_research", {}), "max_concurrent_runs", 2)
+
+    async def run_all():
+        return await asyncio.gather(*(api.arun_deep_research(f"topic {i}") for i in range(6)))
+
+    results = asyncio.run(run_all())
+
+    assert graph.peak == 2
+    assert [r["final_text"] for r in results] == [f"report on topic {i}" for i in range(6)]
+
+
+def test_identical_requests_share_one_run(monkeypatch, temp_dir):
+    """Concurrent identical requests coalesce; later ones are served from cache."""
+    graph = _fake_graph(monkeypatch, temp_dir)
+
+    async def run_all():
+        return await asyncio.gather(
+            api.arun_deep_research("PCR optimization for GC-rich templates?"),
+            api.arun_deep_research("  pcr optimization for GC-rich   templates"),
+        )
+
+    results = asyncio.run(run_all())
+    assert graph.calls == 1
+    assert sorted(r["cache"] for r in results) == ["coalesced", "miss"]
+    assert results[0]["final_text"] == results[1]["final_text"]
+
+    again = api.run_deep_research("PCR optimization for GC-rich templates")
+    assert again["cache"] == "hit"
+    assert again["final_text"] == results[0]["final_text"]
+    assert graph.calls == 1
+
+    # Different research settings are a different report
+    assert api.run_deep_research("PCR optimization for GC-rich templates", max_research_loops=1)["cache"] == "miss"
+    assert graph.calls == 2
+
+
+def test_budget_clock_starts_when_slot_is_free(monkeypatch, temp_dir):
+    """Time spent queued for a research slot does not count against the time budget."""
+    from src.tools.deep_research import ResearchBudget
+
+    graph = _fake_graph(monkeypatch, temp_dir)
+    monkeypatch.setattr(api, "get_result_cache", lambda: None)
+    monkeypatch.setitem(config._config.setdefault("deep_research", {}), "max_concurrent_runs", 1)
+    started = {}
+    real_ainvoke = graph.ainvoke
+
+    async def recording_ainvoke(state):
+        started[state["messages"][0].content] = state["research_budget"]["started_at"]
+        await asyncio.sleep(0.1)
+        return await real_ainvoke(state)
+
+    monkeypatch.setattr(graph, "ainvoke", recording_ainvoke)
+
+    async def run_both():
+        return await asyncio.gather(*(api.arun_deep_research(t, budget=ResearchBudget(max_seconds=60))
+                                      for t in ("first", "second")))
+
+    asyncio.run(run_both())
+    assert abs(started["second"] - started["first"]) >= 0.1
+
+
+def test_budget_stopped_reports_are_not_cached(monkeypatch, temp_dir):
+    """A report cut short by a budget limit is re-run instead of served from the cache."""
+    graph = _fake_graph(monkeypatch, temp_dir, stop_reason="token_budget")
+
+    first = api.run_deep_research("qPCR primer efficiency")
+    again = api.run_deep_research("qPCR primer efficiency")
+    assert first["stop_reason"] == "token_budget"
+    assert again["cache"] == "miss"
+    assert graph.calls == 2
+
+
+def test_failed_run_releases_consolidator(monkeypatch, temp_dir):
+    """A run that fails before finalizing still drops its search result consolidator."""
+    from src.tools.deep_research import consolidate
+
+    seen = []
+
+    class FailingGraph:
+        async def ainvoke(self, state):
+            seen.append(state["research_id"])
+            consolidate.get_consolidator(state["research_id"])
+            raise ConnectionError("search provider down")
+
+    monkeypatch.setattr(api, "deep_research_graph", FailingGraph())
+    monkeypatch.setattr(api, "get_result_cache", lambda: None)
+
+    with pytest.raises(ConnectionError):
+        api.run_deep_research("Flow cytometry compensation")
+    assert seen and seen[0] not in consolidate._consolidators
+
+
+def test_graph_nodes_are_async():
+    """Nodes must not block the event loop with synchronous LLM or search calls."""
+    from src.tools.deep_research import graph
+
+    for node in (graph.generate_query, graph.web_research, graph.reflection, graph.finalize_answer):
+        assert asyncio.iscoroutinefunction(node)
+
+
+def test_graph_runs_offline_with_replay(temp_dir):
+    """The real graph runs end to end on recorded responses, honouring per-run loops."""
+    from src.tools.deep_research.graph import deep_research_graph
+
+    state = {
+        "messages": [HumanMessage(content="PCR optimization for GC-rich templates")],
+        "initial_search_query_count": 2,
+        "max_research_loops": 2,
+        "verbose": False,
+        "output_dir": str(temp_dir),
+    }
+    with replay_backend(load_fixture(FIXTURE), fan_out=2) as backend:
+        result = asyncio.run(deep_research_graph.ainvoke(state))
+
+    # Two initial queries, then two follow-ups after the first reflection
+    assert backend.stats.searches == 4
+    assert backend.stats.llm_calls == {"query_writer": 1, "small": 4, "triage": 3}
+    assert Path(result["saved_path"]).read_text().startswith("# GC-rich PCR optimization")
+    # Sources shared by the parallel queries are summarized only once
+    assert result["tokens_saved"] > 0
+
+
+def _replay_run(temp_dir, loops, budget=None):
+    from src.tools.deep_research.graph import deep_research_graph
+
+    state = {
+        "messages": [HumanMessage(content="PCR optimization for GC-rich templates")],
+        "initial_search_query_count": 2,
+        "max_research_loops": loops,
+        "verbose": False,
+        "output_dir": str(temp_dir),
+    }
+    if budget is not None:
+        state["research_budget"] = budget.start()
+    with replay_backend(load_fixture(FIXTURE), fan_out=2) as backend:
+        return asyncio.run(deep_research_graph.ainvoke(state)), backend
+
+
+def test_search_budget_stops_early(temp_dir):
+    """Follow-ups are trimmed to the search budget and the run stops when it is spent."""
+    from src.tools.deep_research import ResearchBudget
+
+    result, backend = _replay_run(temp_dir, loops=5, budget=ResearchBudget(max_searches=3))
+
+    assert backend.stats.searches == 3
+    assert result["searches_used"] == 3
+    assert result["stop_reason"] == "search_budget"
+    assert result["tokens_used"] > 0
+    # The second reflection is skipped; the report is still written
+    assert backend.stats.llm_calls["triage"] == 2
+    assert Path(result["saved_path"]).exists()
+
+
+def test_repeated_follow_ups_are_pruned(temp_dir):
+    """Follow-ups duplicating earlier searches end the loop instead of searching again."""
+    from src.tools.deep_research.budget import dedupe_queries
+
+    assert dedupe_queries(
+        ["GC-rich PCR betaine", "betaine GC-rich PCR", "touchdown PCR annealing"],
+        ["PCR GC-rich betaine"],
+    ) == ["touchdown PCR annealing"]
+
+    result, backend = _replay_run(temp_dir, loops=5)
+    assert result["stop_reason"] == "no_new_queries"
+    assert backend.stats.searches == 4
+
+
+def test_reports_stored_in_project_and_reused(monkeypatch, temp_dir):
+    """Reports land in the project's research store and answer repeats without a run."""
+    graph = _fake_graph(monkeypatch, temp_dir)
+    monkeypatch.setattr(api, "get_result_cache", lambda: None)
+    project = temp_dir / "project"
+
+    first = api.run_deep_research("Western blot transfer efficiency", project_root=str(project))
+    assert first["cache"] == "miss"
+    assert Path(first["saved_path"]).parent == project / ".labacc" / "research"
+    assert Path(first["saved_path"]).read_text() == "report on Western blot transfer efficiency"
+
+    again = api.run_deep_research("western blot transfer efficiency?", project_root=str(project))
+    assert again["cache"] == "project"
+    assert again["saved_path"] == first["saved_path"]
+    assert graph.calls == 1
+
+    # A different question gets its own report instead of overwriting
+    api.run_deep_research("Western blot blocking buffer", project_root=str(project))
+    store = ReportStore(str(project))
+    related = store.find_related("blot transfer efficiency PVDF")
+    assert [m["query"] for m in related] == ["Western blot transfer efficiency"]
+    assert len(list((project / ".labacc" / "research").glob("*.md"))) == 2
+
+
+def test_budget_stopped_project_report_is_redone(monkeypatch, temp_dir):
+    """A stored report cut short by a budget is replaced by a new run, not reused."""
+    graph = _fake_graph(monkeypatch, temp_dir, stop_reason="time_budget")
+    monkeypatch.setattr(api, "get_result_cache", lambda: None)
+    project = temp_dir / "project"
+
+    first = api.run_deep_research("Cell viability assay choice", project_root=str(project))
+    graph.stop_reason = "sufficient"
+    second = api.run_deep_research("Cell viability assay choice", project_root=str(project))
+    third = api.run_deep_research("Cell viability assay choice", project_root=str(project))
+
+    assert second["cache"] == "miss" and second["saved_path"] == first["saved_path"]
+    assert third["cache"] == "project" and third["stop_reason"] == "sufficient"
+    assert graph.calls == 2
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bounded, TTL-aware search result cache.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.tools.deep_research.search_cache import SearchCache
+
+
+def test_hits_from_memory_and_disk(temp_dir):
+    """A second worker sharing the directory reads entries written by the first."""
+    calls = []
+    cache = SearchCache(str(temp_dir), memory_entries=8)
+
+    @cache
+    def search(query, count=10):
+        calls.append(query)
+        return [{"url": f"https://example.org/{query}", "count": count}]
+
+    assert search("pcr gc-rich", 3) == search("pcr gc-rich", 3)
+    assert calls == ["pcr gc-rich"]
+    assert cache.stats()["memory_hits"] == 1
+
+    other_worker = SearchCache(str(temp_dir))
+    assert other_worker.get("pcr gc-rich", 3)[0]["count"] == 3
+    assert other_worker.stats()["disk_hits"] == 1
+
+    # Stored as plain JSON, not pickle
+    entry = json.loads(next(temp_dir.glob("*.json")).read_text())
+    assert entry["query"] == "pcr gc-rich"
+
+
+def test_ttl_expiry(temp_dir):
+    """Expired entries count as misses and are removed."""
+    cache = SearchCache(str(temp_dir), ttl_seconds=60)
+    cache.set("western blot", 5, ["a"])
+
+    path = next(temp_dir.glob("*.json"))
+    entry = json.loads(path.read_text())
+    entry["expires_at"] = time.time() - 1
+    path.write_text(json.dumps(entry))
+
+    fresh = SearchCache(str(temp_dir), ttl_seconds=60)
+    assert fresh.get("western blot", 5) is None
+    assert fresh.stats()["expired"] == 1
+    assert not path.exists()
+
+
+def test_lru_eviction_on_disk(temp_dir):
+    """Past max_entries, the least recently used entries are evicted."""
+    cache = SearchCache(str(temp_dir), max_entries=3, memory_entries=1)
+    for i in range(3):
+        cache.set(f"q{i}", 5, [i])
+        os.utime(cache._entry_path(cache.make_key(f"q{i}", 5)), (1000 + i, 1000 + i))
+
+    # Touch q0 from disk so q1 becomes the least recently used
+    SearchCache(str(temp_dir)).get("q0", 5)
+    cache.set("q3", 5, [3])
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["disk_entries"] == 3
+    assert cache.get("q1", 5) is None
+    assert cache.get("q0", 5) == [0]
+
+
+def test_concurrent_writers_and_async_wrapper(temp_dir):
+    """Parallel writes never leave partial files; the async wrapper shares entries."""
+    cache = SearchCache(str(temp_dir))
+    payload = [{"content": "x" * 2000}] * 20
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache.set("same query", 5, payload), range(40)))
+
+    assert not list(temp_dir.glob("*.tmp"))
+    assert SearchCache(str(temp_dir)).get("same query", 5) == payload
+
+    @cache
+    async def asearch(query, count=10):
+        raise AssertionError("should be served from cache")
+
+    assert asyncio.run(asearch("same query", 5)) == payload
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the project vector index.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent dirs to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.memory.vector_index import VectorIndex, embed
+
+
+def _project(temp_dir):
+    experiments = temp_dir / "experiments"
+    readmes = {
+        "exp_001_pcr": "# PCR\n\nAnnealing at 52C produced primer dimers.\nRaised annealing temperature to 58C.",
+        "exp_002_western": "# Western blot\n\nHigh background on the membrane.\nBlocking with 5% milk fixed it.",
+        "exp_003_culture": "# Cell culture\n\nHEK293 cells contaminated with mycoplasma.\nDiscarded the flask.",
+    }
+    for name, text in readmes.items():
+        (experiments / name).mkdir(parents=True)
+        (experiments / name / "README.md").write_text(text)
+    return VectorIndex(str(temp_dir), dim=2048, chunk_lines=4)
+
+
+def test_embedding_is_normalized_and_deterministic():
+    """Embeddings have unit length and don't depend on the process."""
+    a = embed("primer dimers at low annealing temperature", 512)
+    assert np.isclose(np.linalg.norm(a), 1.0)
+    assert np.array_equal(a, embed("primer dimers at low annealing temperature", 512))
+    assert not embed("", 512).any()
+
+
+def test_search_ranks_relevant_experiment_first(temp_dir):
+    """Top-k retrieval finds the experiment that discusses the query."""
+    index = _project(temp_dir)
+    index.refresh()
+
+    assert index.search("primer dimers annealing")[0]["path"] == "experiments/exp_001_pcr/README.md"
+    assert index.search("membrane background blocking")[0]["path"].startswith("experiments/exp_002")
+    assert index.search("mycoplasma", k=1)[0]["start_line"] == 1
+    assert index.search("weather in paris") == []
+
+
+def test_refresh_is_incremental_and_persisted(temp_dir):
+    """Only changed files are re-embedded; the index survives a reload."""
+    index = _project(temp_dir)
+    assert index.refresh()["indexed"] == 3
+    assert index.refresh() == {"indexed": 0, "removed": 0, "unchanged": 3}
+
+    readme = temp_dir / "experiments" / "exp_003_culture" / "README.md"
+    readme.write_text("# Cell culture\n\nSwitched to CHO cells with serum-free medium.")
+    stat = readme.stat()
+    os.utime(readme, (stat.st_atime, stat.st_mtime + 5))
+    (temp_dir / "experiments" / "exp_002_western" / "README.md").unlink()
+
+    assert index.refresh() == {"indexed": 1, "removed": 1, "unchanged": 1}
+
+    reloaded = VectorIndex(str(temp_dir), dim=2048, chunk_lines=4)
+    assert reloaded.stats() == {"files": 2, "chunks": 2}
+    assert reloaded.search("serum-free CHO")[0]["path"].startswith("experiments/exp_003")
+    assert reloaded.search("blocking milk") == []
+    assert reloaded.refresh()["indexed"] == 0
+
+
+def test_dimension_change_rebuilds(temp_dir):
+    """An index built with another dimension is rebuilt rather than misread."""
+    _project(temp_dir).refresh()
+    index = VectorIndex(str(temp_dir), dim=256, chunk_lines=4)
+    assert index.refresh()["indexed"] == 3